@@ -1,8 +1,11 @@
 """
 DataVeritas - A Streamlit dashboard app
 """
-import io
+import atexit
 import json
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -36,6 +39,54 @@ def _clear_state(prefixes):
         if any(k.startswith(p) for p in prefixes):
             st.session_state.pop(k, None)
 
+@st.cache_resource
+def _get_connection_pool():
+    """Connection pool shared across reruns and sessions; idle connections are closed at exit."""
+    from db_connector import ConnectionPool
+    pool = ConnectionPool()
+    atexit.register(pool.close_all)
+    return pool
+
+@st.cache_resource
+def _get_schema_cache(ttl=900):
+    """Table column lists shared across recon runs and sessions."""
+    from db_connector import SchemaCache
+    return SchemaCache(ttl=ttl)
+
+@st.cache_resource
+def _get_recon_state(path):
+    """Recon state store (bucket results, watermarks, mismatch keys) shared across sessions."""
+    from recon_state import ReconStateStore
+    return ReconStateStore(path)
+
+@st.cache_resource
+def _get_workbook_cache():
+    """Parsed-workbook cache shared across reruns and sessions (config "workbook_cache" section)."""
+    from workbook_cache import cache_from_config
+    config_path = Path(__file__).parent / "config.json"
+    try:
+        config = json.loads(config_path.read_text(encoding="utf-8")) if config_path.exists() else {}
+    except (OSError, ValueError):
+        config = {}
+    return cache_from_config(config)
+
+def _load_orc_workbook(key, source, filename):
+    """
+    Open a workbook (path or bytes) for the Orchestrator. Only sheet names are read here; sheets are
+    parsed when selected or executed and kept in the shared cache.
+    """
+    from workbook_loader import open_workbook
+    wb = open_workbook(source, key, _get_workbook_cache())
+    old = st.session_state.get("orc_excel_data")
+    if hasattr(old, "close"):
+        old.close()
+    st.session_state["orc_excel_data"] = wb
+    st.session_state["orc_excel_key"] = key
+    st.session_state["orc_excel_filename"] = filename
+    st.session_state.pop("orc_execute_clicked", None)
+    st.session_state.pop("orc_case_results", None)
+    st.session_state.pop("orc_excel_error", None)
+
 # Custom styling
 st.markdown("""
 <style>
@@ -173,105 +224,192 @@ if "page" not in st.session_state:
     st.session_state["page"] = "Orchestrator"
 
 
-def _run_recon_single(source_db, source_table, target_db, target_table, config):
-    """Run source/target comparison for one row. Returns result dict or error string."""
-    from db_connector import connect_db, get_table_columns, fetch_table_data
-    src_conn, err = connect_db(source_db, config)
-    if err:
-        return {"error": f"Source DB: {err}"}
-    tgt_conn, err = connect_db(target_db, config)
-    if err:
-        try:
-            src_conn.close()
-        except Exception:
-            pass
-        return {"error": f"Target DB: {err}"}
+@st.cache_resource
+def _get_job_runner():
+    """Background job runner shared across reruns and sessions (config "jobs" section)."""
+    from jobs import runner_from_config
+    config_path = Path(__file__).parent / "config.json"
     try:
-        src_cols, err = get_table_columns(src_conn, source_db, source_table)
-        if err:
-            return {"error": f"Source table columns: {err}"}
-        tgt_cols, err = get_table_columns(tgt_conn, target_db, target_table)
+        config = json.loads(config_path.read_text(encoding="utf-8")) if config_path.exists() else {}
+    except (OSError, ValueError):
+        config = {}
+    return runner_from_config(config, Path(__file__).parent)
+
+@st.cache_resource
+def _get_dmc_history():
+    """DMC run history store shared across reruns and sessions (config "dmc" section)."""
+    from dmc_history import store_from_config
+    config_path = Path(__file__).parent / "config.json"
+    try:
+        config = json.loads(config_path.read_text(encoding="utf-8")) if config_path.exists() else {}
+    except (OSError, ValueError):
+        config = {}
+    return store_from_config(config, Path(__file__).parent)
+
+def _dmc_history():
+    """The DMC history store, or None if it cannot be opened (error kept in dmc_history_error)."""
+    try:
+        return _get_dmc_history()
+    except Exception as e:
+        st.session_state["dmc_history_error"] = f"DMC history store: {e}"
+        return None
+
+def _apply_job(prefix):
+    """Copy a finished job's session_state updates into this session, once per job."""
+    job_id = st.session_state.get(f"{prefix}job_id")
+    if not job_id or st.session_state.get(f"{prefix}job_applied") == job_id:
+        return
+    runner = _get_job_runner()
+    job = runner.get(job_id)
+    if job is None:
+        st.session_state.pop(f"{prefix}job_id", None)
+    elif job["status"] == "done":
+        st.session_state.update(runner.result(job_id) or {})
+        st.session_state[f"{prefix}job_applied"] = job_id
+
+def _job_panel(prefix, kind):
+    """Progress and Cancel for this session's current job, plus recent jobs of the page (any session)."""
+    from jobs import ACTIVE
+    runner = _get_job_runner()
+    _apply_job(prefix)
+
+    def job_status():
+        job_id = st.session_state.get(f"{prefix}job_id")
+        job = runner.get(job_id) if job_id else None
+        if job is None:
+            return
+        if job["status"] in ACTIVE:
+            default = "Queued..." if job["status"] == "queued" else "Running..."
+            st.progress(job["progress"], text=job["message"] or default)
+            if st.button("Cancel", key=f"{prefix}job_cancel", use_container_width=True):
+                runner.cancel(job_id)
+        elif job["status"] == "done" and st.session_state.get(f"{prefix}job_applied") != job_id:
+            st.rerun()
+        elif job["status"] == "failed":
+            st.error(f"Job failed: {job['error']}")
+        elif job["status"] in ("cancelled", "interrupted"):
+            st.warning(f"Job {job['status']}." + (f" {job['error']}" if job["error"] else ""))
+
+    job_id = st.session_state.get(f"{prefix}job_id")
+    job = runner.get(job_id) if job_id else None
+    fragment = getattr(st, "fragment", None)
+    if job is not None and job["status"] in ACTIVE:
+        if fragment is not None:
+            fragment(run_every=2)(job_status)()
+        else:
+            job_status()
+            st.button("Refresh", key=f"{prefix}job_refresh", use_container_width=True)
+    else:
+        job_status()
+    jobs = runner.recent(kind, limit=10)
+    if jobs:
+        with st.expander("Recent runs", expanded=False):
+            for j in jobs:
+                st.caption(f"{j['created_at'].replace('T', ' ')} · {j['label']} · {j['status']}")
+            finished = [j for j in jobs if j["status"] == "done"]
+            if finished:
+                labels = {j["job_id"]: f"{j['created_at'].replace('T', ' ')} · {j['label']}" for j in finished}
+                pick = st.selectbox("Finished run", list(labels), format_func=labels.get, key=f"{prefix}job_pick")
+                if st.button("Open results", key=f"{prefix}job_open", use_container_width=True):
+                    st.session_state[f"{prefix}job_id"] = pick
+                    st.session_state.pop(f"{prefix}job_applied", None)
+                    st.rerun()
+
+def _prefetch_recon_columns(tasks, config, pool, schema_cache):
+    """Read column lists for every table in the workbook with one catalog query per database."""
+    from db_connector import prefetch_table_columns
+    tables_by_db = {}
+    for _, source_db, source_table, target_db, target_table in tasks:
+        tables_by_db.setdefault(source_db, set()).add(source_table)
+        tables_by_db.setdefault(target_db, set()).add(target_table)
+    for db_type, tables in tables_by_db.items():
+        conn, err = pool.acquire(db_type, config)
         if err:
-            return {"error": f"Target table columns: {err}"}
-        tgt_lower = {c.lower(): c for c in tgt_cols}
-        matching = []
-        not_in_target = []
-        for c in src_cols:
-            if c.lower() in tgt_lower:
-                matching.append(tgt_lower[c.lower()])
-            else:
-                not_in_target.append(c)
-        src_df, tgt_df = pd.DataFrame(), pd.DataFrame()
-        mismatch_head = pd.DataFrame()
-        joined_head = pd.DataFrame()
-        join_cols_used = []
-        if matching:
-            matching_src_cols = [c for c in src_cols if c.lower() in tgt_lower]
-            src_df, err = fetch_table_data(src_conn, source_db, source_table, matching_src_cols, limit=None)
-            if err:
-                return {"error": f"Fetch source data: {err}"}
-            src_df = src_df if src_df is not None else pd.DataFrame()
-            tgt_df, err = fetch_table_data(tgt_conn, target_db, target_table, matching, limit=None)
-            if err:
-                return {"error": f"Fetch target data: {err}"}
-            tgt_df = tgt_df if tgt_df is not None else pd.DataFrame()
-            if not src_df.empty or not tgt_df.empty:
-                join_cols = st.session_state.get("recon_join_cols", [])
-                if join_cols:
-                    join_cols_used = [c for c in join_cols if c in src_df.columns and c in tgt_df.columns]
-                if not join_cols_used:
-                    join_cols_used = [c for c in matching if c in src_df.columns and c in tgt_df.columns][:3]
-                if join_cols_used:
-                    combined = src_df.merge(
-                        tgt_df,
-                        on=join_cols_used,
-                        how="outer",
-                        suffixes=("_source", "_target"),
-                    )
-                else:
-                    src_df = src_df.reset_index(drop=True)
-                    tgt_df = tgt_df.reset_index(drop=True)
-                    combined = src_df.merge(
-                        tgt_df,
-                        left_index=True,
-                        right_index=True,
-                        how="outer",
-                        suffixes=("_source", "_target"),
-                    )
-                diff_mask = pd.Series(False, index=combined.index)
-                compare_cols = [c for c in matching if c not in join_cols_used]
-                for col in compare_cols:
-                    src_col = f"{col}_source"
-                    tgt_col = f"{col}_target"
-                    if src_col in combined.columns and tgt_col in combined.columns:
-                        s = combined[src_col]
-                        t = combined[tgt_col]
-                        col_diff = ~(s.eq(t) | (s.isna() & t.isna()))
-                        diff_mask = diff_mask | col_diff
-                mismatch_head = combined[diff_mask].head(10)
-                joined_head = combined.head(10)
-        return {
-            "source_db": source_db, "source_table": source_table,
-            "target_db": target_db, "target_table": target_table,
-            "matching_columns": matching, "columns_not_in_target": not_in_target,
-            "source_df": src_df.head(10), "target_df": tgt_df.head(10),
-            "mismatch_df": mismatch_head,
-            "joined_df": joined_head,
-            "join_cols_used": join_cols_used,
-        }
-    finally:
+            continue  # the rows report the connection error themselves
         try:
-            src_conn.close()
-        except Exception:
-            pass
+            prefetch_table_columns(conn, db_type, tables, schema_cache, config)
+        finally:
+            pool.release(conn)
+
+
+def _run_recon_rows(tasks, config, options, max_workers, pool, schema_cache, job):
+    """
+    Run recon rows concurrently inside a background job. tasks are (sno, source_db, source_table,
+    target_db, target_table). Per-database caps come from config "recon.max_concurrent_per_database"
+    (never more than half the pool size, since a row can hold two connections to one database).
+    Returns results in task order; a failing row only records its own error. Cancelling the job drops
+    rows not yet started.
+    """
+    from recon_runner import run_recon_single
+    recon_cfg = config.get("recon", {})
+    per_db_limit = max(pool.max_size // 2, 1)
+    caps = recon_cfg.get("max_concurrent_per_database", {})
+    db_names = {t[1] for t in tasks} | {t[3] for t in tasks}
+    sems = {db: threading.BoundedSemaphore(max(min(int(caps.get(db, per_db_limit)), per_db_limit), 1)) for db in db_names}
+
+    def run_row(sno, source_db, source_table, target_db, target_table):
+        if not source_table or not target_table:
+            return {"sno": sno, "error": "Missing source or target table name"}
+        held = [sems[db] for db in sorted({source_db, target_db})]
+        for sem in held:
+            sem.acquire()
         try:
-            tgt_conn.close()
-        except Exception:
-            pass
+            r = run_recon_single(source_db, source_table, target_db, target_table, config, pool, options, schema_cache)
+        except Exception as e:
+            r = {"error": str(e)}
+        finally:
+            for sem in reversed(held):
+                sem.release()
+        r["sno"] = sno
+        return r
+
+    if len(tasks) > 1:
+        _prefetch_recon_columns(tasks, config, pool, schema_cache)
+
+    if max_workers > 1:
+        # Rows already run in parallel; extra bucket connections per row could exhaust the pool.
+        options = {**options, "bucket_workers": 1}
+
+    results = [None] * len(tasks)
+    job.progress(0.0, f"Running {len(tasks)} recon rows...")
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futures = {executor.submit(run_row, *task): i for i, task in enumerate(tasks)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = {"sno": tasks[i][0], "error": str(e)}
+            job.progress(done / len(tasks), f"Completed {done} of {len(tasks)} recon rows")
+            if job.cancelled:
+                for f in futures:
+                    f.cancel()
+                break
+    job.check_cancelled()
+    return results
+
+
+def _recon_options():
+    """Recon settings from the sidebar, passed explicitly to worker threads."""
+    return {
+        "join_cols": st.session_state.get("recon_join_cols", []),
+        "compare_mode": st.session_state.get("recon_compare_mode", "Full"),
+        "tolerance": float(st.session_state.get("recon_tolerance", 0.0)),
+        "trim_strings": st.session_state.get("recon_trim_strings", False),
+        "buckets": int(st.session_state.get("recon_buckets", 64)),
+        "bucket_strategy": st.session_state.get("recon_bucket_strategy", "Hash"),
+        "bucket_workers": int(st.session_state.get("recon_bucket_workers", 4)),
+        "bucket_checkpoints": st.session_state.setdefault("recon_bucket_checkpoints", {}),
+        "watermark_column": st.session_state.get("recon_watermark_col", "").strip(),
+        "out_of_core": st.session_state.get("recon_out_of_core", False),
+    }
 
 
 def _run_recon():
-    """Run source/target comparison. If Excel uploaded, run for each row; else run for manual entry."""
+    """
+    Start a background job comparing source/target tables: each row of the uploaded Excel, else the
+    manual entry. The job's result is applied to recon_results / recon_error when it finishes.
+    """
     st.session_state.pop("recon_error", None)
     st.session_state.pop("recon_results", None)
     st.session_state.pop("recon_source_df", None)
@@ -287,6 +425,20 @@ def _run_recon():
     except Exception as e:
         st.session_state["recon_error"] = f"Invalid config: {e}"
         return
+    options = _recon_options()
+    ooc_cfg = config.get("recon", {}).get("out_of_core", {})
+    options["memory_limit"] = ooc_cfg.get("memory_limit", "2GB")
+    options["spill_dir"] = str(Path(ooc_cfg["spill_dir"]).expanduser()) if ooc_cfg.get("spill_dir") else None
+    options["dtype_backend"] = config.get("recon", {}).get("dtype_backend")
+    state_path = str(Path(__file__).parent / config.get("recon", {}).get("state_path", "recon_state.db"))
+    try:
+        store = _get_recon_state(state_path)
+        options["state_store"] = store
+        options["bucket_checkpoints"] = store.bucket_checkpoints(config)
+    except Exception as e:
+        if options["compare_mode"] == "Incremental":
+            st.session_state["recon_error"] = f"Recon state store ({state_path}): {e}"
+            return
     recon_df = st.session_state.get("recon_excel_df")
     if recon_df is not None and not recon_df.empty:
         col_map = {str(c).strip().lower().replace(" ", "_"): c for c in recon_df.columns}
@@ -298,20 +450,15 @@ def _run_recon():
         if not all([sno_col, src_db_col, src_tbl_col, tgt_db_col, tgt_tbl_col]):
             st.session_state["recon_error"] = "Excel missing columns: SNO, Source_database, source_table_nm, target_database, target_table_nm"
             return
-        results = []
+        tasks = []
         for idx, row in recon_df.iterrows():
             sno = int(row[sno_col]) if pd.notna(row[sno_col]) else idx + 1
             source_db = str(row[src_db_col]).strip() if pd.notna(row[src_db_col]) else "Netezza"
             source_table = str(row[src_tbl_col]).strip() if pd.notna(row[src_tbl_col]) else ""
             target_db = str(row[tgt_db_col]).strip() if pd.notna(row[tgt_db_col]) else "Netezza"
             target_table = str(row[tgt_tbl_col]).strip() if pd.notna(row[tgt_tbl_col]) else ""
-            if not source_table or not target_table:
-                results.append({"sno": sno, "error": "Missing source or target table name"})
-                continue
-            r = _run_recon_single(source_db, source_table, target_db, target_table, config)
-            r["sno"] = sno
-            results.append(r)
-        st.session_state["recon_results"] = results
+            tasks.append((sno, source_db, source_table, target_db, target_table))
+        label = f"{len(tasks)} recon rows ({options['compare_mode']})"
     else:
         source_db = st.session_state.get("recon_source_db", "Netezza")
         source_table = st.session_state.get("recon_source_table", "").strip()
@@ -320,142 +467,160 @@ def _run_recon():
         if not source_table or not target_table:
             st.session_state["recon_error"] = "Enter both source and target table names."
             return
-        r = _run_recon_single(source_db, source_table, target_db, target_table, config)
-        if "error" in r:
-            st.session_state["recon_error"] = r["error"]
-        else:
-            r["sno"] = 1
-            st.session_state["recon_results"] = [r]
+        tasks = None
+        label = f"{source_table} -> {target_table} ({options['compare_mode']})"
+    pool = _get_connection_pool()
+    schema_cache = _get_schema_cache(config.get("recon", {}).get("schema_cache_ttl_seconds", 900))
+    max_workers = int(st.session_state.get("recon_workers", config.get("recon", {}).get("max_workers", 4)))
 
+    def work(job):
+        if tasks is not None:
+            return {"recon_results": _run_recon_rows(tasks, config, options, max_workers, pool, schema_cache, job)}
+        from recon_runner import run_recon_single
+        job.progress(0.0, f"Comparing {source_table} -> {target_table}...")
+        r = run_recon_single(source_db, source_table, target_db, target_table, config, pool, options, schema_cache)
+        if "error" in r:
+            return {"recon_error": r["error"]}
+        r["sno"] = 1
+        return {"recon_results": [r]}
 
-def _get_dmc_config_key(db_type):
-    """Map database type to config key for db_connector."""
-    m = {"Netezza": "netezza", "Snowflake": "snowflake", "SQL Server": "sql_server",
-         "PostgreSQL": "postgresql", "MySQL": "mysql", "Oracle": "oracle"}
-    return m.get(db_type, db_type.lower().replace(" ", "_"))
+    st.session_state["recon_job_id"] = _get_job_runner().submit("Recon", label, work)
 
 
-def _find_dmc_col(df, patterns):
-    """Find column matching any of the patterns (case-insensitive)."""
-    cols_lower = {str(c).strip().lower(): c for c in df.columns}
-    for p in patterns:
-        pk = p.lower().replace(" ", "_")
-        if pk in cols_lower:
-            return cols_lower[pk]
-        for c in df.columns:
-            if pk in str(c).lower().replace(" ", "_"):
-                return c
-    return None
+def _dmc_final_df(results):
+    """Grouping / tablename / count rows (plus estimated, for fast counts) of every hop that returned counts."""
+    all_rows = []
+    for hop_name, r in results.items():
+        if r.get("df") is not None and not r["df"].empty:
+            df_part = r["df"].copy()
+            if "tablename" in df_part.columns and "count" in df_part.columns:
+                all_rows.append(df_part[[c for c in ("Grouping", "tablename", "count", "estimated") if c in df_part.columns]])
+            elif "Grouping" in df_part.columns:
+                all_rows.append(df_part)
+    return pd.concat(all_rows, ignore_index=True) if all_rows else pd.DataFrame(columns=["Grouping", "tablename", "count"])
 
 
 def _run_dmc():
-    """Build UNION ALL count queries grouped by Hop Name from uploaded DMC Excel."""
+    """
+    Build UNION ALL count queries grouped by Hop Name from uploaded DMC Excel and start a background
+    job running them; its result is applied to dmc_results / dmc_final_df when it finishes.
+    """
     st.session_state.pop("dmc_error", None)
     st.session_state.pop("dmc_queries", None)
     st.session_state.pop("dmc_results", None)
     st.session_state.pop("dmc_final_df", None)
+    st.session_state.pop("dmc_run_id", None)
     df = st.session_state.get("dmc_excel_df")
     if df is None or df.empty:
         st.session_state["dmc_error"] = "Upload an Excel file first."
         return
-    hop_col = _find_dmc_col(df, ["Hop Name", "HopName", "Hop"])
-    tbl_col = _find_dmc_col(df, ["Table Name", "TableName", "Table"])
-    schema_col = _find_dmc_col(df, ["Schema Name", "SchemaName", "Schema"])
-    filter_col = _find_dmc_col(df, ["Filter Col 1", "Filter Col1", "Filter_Col_1"])
-    filter_val_col = _find_dmc_col(df, ["Filter Col 1 Val", "Filter Col1 Val", "Filter_Col_1_Val"])
-    group_col = _find_dmc_col(df, ["Grouping", "Group", "Category", "Group Name", "GroupName"])
-    if not all([hop_col, tbl_col, schema_col]):
-        st.session_state["dmc_error"] = "Excel must have columns: Hop Name, Table Name, Schema Name"
+    from dmc_runner import build_dmc_queries, dmc_tables
+    queries, table_to_grouping, err = build_dmc_queries(df)
+    if err:
+        st.session_state["dmc_error"] = err
         return
-
-    def _quote_sql_val(val):
-        """Quote value for SQL: numeric unquoted, else single-quoted with escape."""
-        if pd.isna(val) or val == "":
-            return None
-        s = str(val).strip()
-        try:
-            float(s)
-            return s
-        except (ValueError, TypeError):
-            return "'" + s.replace("'", "''") + "'"
-
-    queries = {}
-    table_to_grouping = {}
-    for hop_name, grp in df.groupby(hop_col):
-        hop_val = str(hop_name).strip() if pd.notna(hop_name) else "Unknown"
-        parts = []
-        for _, row in grp.iterrows():
-            schema = str(row[schema_col]).strip() if pd.notna(row[schema_col]) else ""
-            table = str(row[tbl_col]).strip() if pd.notna(row[tbl_col]) else ""
-            if group_col:
-                grouping = str(row[group_col]).strip() if pd.notna(row[group_col]) else ""
-                if table and grouping:
-                    table_to_grouping[(hop_val, table)] = grouping
-            if schema and table:
-                full_name = f'"{schema}"."{table}"'
-                base = f"SELECT '{table}' AS tablename, COUNT(*) FROM {full_name}"
-                if filter_col and filter_val_col:
-                    fcol = str(row[filter_col]).strip() if pd.notna(row[filter_col]) else ""
-                    fval = _quote_sql_val(row[filter_val_col])
-                    if fcol and fval is not None:
-                        base += f' WHERE "{fcol}" = {fval}'
-                parts.append(base)
-        if parts:
-            queries[hop_val] = "\nUNION ALL\n".join(parts)
     st.session_state["dmc_queries"] = queries
+    tables = dmc_tables(df)[0]
+    fast_counts = st.session_state.get("dmc_fast_counts", False)
+    max_stats_age_days = st.session_state.get("dmc_stats_max_age", 0) or None
+    batch_size = st.session_state.get("dmc_batch_size", 50)
+    parallel_batches = st.session_state.get("dmc_parallel_batches", 4)
 
     hop_config = st.session_state.get("dmc_hop_config", {})
-    results = {}
-    if hop_config:
-        from db_connector import connect_db, run_query
-        for hop_name, sql in queries.items():
-            cfg = hop_config.get(hop_name)
-            if not cfg:
-                results[hop_name] = {"sql": sql, "df": None, "error": f"No database config for '{hop_name}'"}
-                continue
-            db_type = cfg.get("database_type", "Netezza")
-            db_config = {"databases": {db_type.lower().replace(" ", "_"): cfg}}
-            conn, err = connect_db(db_type, {"databases": {_get_dmc_config_key(db_type): cfg}})
-            if err:
-                results[hop_name] = {"sql": sql, "df": None, "error": err}
-                continue
-            try:
-                qdf = run_query(conn, db_type, sql)
-                if qdf is not None and not qdf.empty:
-                    tbl_col_name = next((c for c in qdf.columns if "table" in str(c).lower()), qdf.columns[0])
-                    cnt_col_name = next((c for c in qdf.columns if c != tbl_col_name), qdf.columns[1] if len(qdf.columns) > 1 else None)
-                    qdf = qdf.copy()
-                    qdf = qdf.rename(columns={tbl_col_name: "tablename"})
-                    if cnt_col_name and cnt_col_name in qdf.columns:
-                        qdf = qdf.rename(columns={cnt_col_name: "count"})
-                    elif len(qdf.columns) >= 2:
-                        qdf = qdf.rename(columns={qdf.columns[1]: "count"})
-                    qdf["Grouping"] = qdf["tablename"].apply(lambda t: table_to_grouping.get((hop_name, str(t).strip()), "Other"))
-                    cols = ["Grouping", "tablename"] + (["count"] if "count" in qdf.columns else [])
-                    qdf = qdf[[c for c in cols if c in qdf.columns]]
-                results[hop_name] = {"sql": sql, "df": qdf, "error": None}
-            except Exception as e:
-                results[hop_name] = {"sql": sql, "df": None, "error": str(e)}
-            finally:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-    else:
+    if not hop_config:
+        results = {}
         for hop_name, sql in queries.items():
             results[hop_name] = {"sql": sql, "df": None, "error": "Upload config (dmc_config) to execute queries."}
+        st.session_state["dmc_results"] = results
+        st.session_state["dmc_final_df"] = _dmc_final_df(results)
+        return
+    pool = _get_connection_pool()
+    default_timeout = st.session_state.get("dmc_hop_timeout", 600)
+    history = _dmc_history()
+    label = f"{len(queries)} hops" + (" (fast counts)" if fast_counts else "")
+    upload = st.session_state.get("dmc_upload")
+    if upload is not None:
+        label = f"{upload.name} - {label}"
 
-    all_rows = []
-    for hop_name, r in results.items():
-        if r.get("df") is not None and not r["df"].empty:
-            df_part = r["df"].copy()
-            if "tablename" in df_part.columns and "count" in df_part.columns:
-                all_rows.append(df_part[["Grouping", "tablename", "count"]])
-            elif "Grouping" in df_part.columns:
-                all_rows.append(df_part)
-    dmc_final = pd.concat(all_rows, ignore_index=True) if all_rows else pd.DataFrame(columns=["Grouping", "tablename", "count"])
-    st.session_state["dmc_results"] = results
-    st.session_state["dmc_final_df"] = dmc_final
+    def work(job):
+        from dmc_runner import run_hops
+        finished = []
+
+        def _on_hop_done(hop_name, r):
+            finished.append(hop_name)
+            if r.get("error"):
+                note = f"✗ {hop_name}: {r['error']}"
+            else:
+                note = f"✓ {hop_name}: {len(r['df']) if r.get('df') is not None else 0} tables counted"
+                if r.get("table_errors"):
+                    note += f", {len(r['table_errors'])} failed"
+            job.progress(len(finished) / len(queries), note)
+
+        job.progress(0.0, f"Running {len(queries)} hops...")
+        results = run_hops(
+            pool, queries, hop_config, table_to_grouping,
+            default_timeout=default_timeout, on_result=_on_hop_done, cancelled=lambda: job.cancelled,
+            tables=tables, fast_counts=fast_counts, max_stats_age_days=max_stats_age_days,
+            batch_size=batch_size, parallel_batches=parallel_batches,
+        )
+        job.check_cancelled()
+        out = {"dmc_results": results, "dmc_final_df": _dmc_final_df(results)}
+        if history is not None:
+            out["dmc_run_id"] = history.record_run(results, label)
+        return out
+
+    st.session_state["dmc_job_id"] = _get_job_runner().submit("DMC", label, work)
+
+
+def _run_orchestrator():
+    """
+    Start a background job executing the selected sheets' test cases; the outcomes are applied to
+    orc_case_results for rendering when it finishes.
+    """
+    st.session_state.pop("orc_case_results", None)
+    st.session_state.pop("orc_execute_clicked", None)
+    df_all = st.session_state.get("orc_excel_data")
+    connected = st.session_state.get("orc_db_connected")
+    config = st.session_state.get("orc_config")
+    if df_all is None or not connected or not config:
+        st.session_state["orc_execute_clicked"] = True
+        return
+    if isinstance(df_all, Mapping):
+        sel = st.session_state.get("orc_selected_sheet", list(df_all.keys())[0])
+        sheets = list(df_all.items()) if sel == "ALL" else [(sel, df_all[sel])]
+    else:
+        sheets = [("Sheet", df_all)]
+    db_type = st.session_state.get("orchestrator_database", "Netezza")
+    conn_id = st.session_state.get("orc_conn_id")
+    proceed = st.session_state.get("orc_proceed_on_row_count_fail", True)
+    max_workers = st.session_state.get("orc_workers", 4)
+    server_side = st.session_state.get("orc_server_side_eval", True)
+    pool = _get_connection_pool()
+    total = max(sum(len(df) for _, df in sheets), 1)
+
+    def work(job):
+        from orc_runner import run_sheets_parallel
+        finished = []
+
+        def _on_case_done(sheet_name, test_case, outcome):
+            finished.append(test_case)
+            if outcome["error"]:
+                note = f"✗ {sheet_name} · Test Case {test_case}: {outcome['error']}"
+            else:
+                note = f"✓ {sheet_name} · Test Case {test_case}: {outcome['row_count']} rows"
+            job.progress(len(finished) / total, note)
+
+        job.progress(0.0, "Executing test cases...")
+        outcomes = run_sheets_parallel(
+            pool, db_type, config, sheets, conn_id, proceed,
+            max_workers=max_workers, on_outcome=_on_case_done, server_side=server_side,
+            cancelled=lambda: job.cancelled,
+        )
+        job.check_cancelled()
+        return {"orc_case_results": outcomes, "orc_execute_clicked": True}
+
+    label = f"{len(sheets)} sheet(s) of {st.session_state.get('orc_excel_filename', 'workbook')}"
+    st.session_state["orc_job_id"] = _get_job_runner().submit("Orchestrator", label, work)
 
 
 def _render_stat_card(label, value, icon):
@@ -553,21 +718,24 @@ with st.sidebar:
                     st.session_state["orc_db_error"] = "Upload config first."
                 else:
                     try:
-                        from db_connector import connect_db
-                        conn, err = connect_db(orchestrator_database, st.session_state["orc_config"])
+                        from db_connector import ConnectionPool
+                        pool = _get_connection_pool()
+                        conn, err = pool.acquire(orchestrator_database, st.session_state["orc_config"])
                         if err:
                             st.session_state["orc_db_error"] = err
-                            st.session_state["orc_db_conn"] = None
+                            st.session_state["orc_db_connected"] = False
                         else:
-                            st.session_state["orc_db_conn"] = conn
+                            pool.release(conn)  # the checked connection is reused by the test case runs
+                            st.session_state["orc_db_connected"] = True
+                            st.session_state["orc_conn_id"] = ConnectionPool.pool_key(orchestrator_database, st.session_state["orc_config"])
                             st.session_state.pop("orc_db_error", None)
                             st.success("Connected")
                     except Exception as e:
                         st.session_state["orc_db_error"] = str(e)
-                        st.session_state["orc_db_conn"] = None
+                        st.session_state["orc_db_connected"] = False
             if "orc_db_error" in st.session_state:
                 st.error(st.session_state["orc_db_error"])
-            elif "orc_db_conn" in st.session_state and st.session_state["orc_db_conn"]:
+            elif st.session_state.get("orc_db_connected"):
                 st.caption("Connected")
 
         st.toggle(
@@ -577,6 +745,21 @@ with st.sidebar:
             help="If off, stop processing remaining test cases after a row count validation fails.",
         )
 
+        st.toggle(
+            "Server-side evaluation",
+            value=True,
+            key="orc_server_side_eval",
+            help="Fetch only a 5-row preview and COUNT(*) of each test-case query instead of every result row.",
+        )
+        st.number_input(
+            "Parallel connections",
+            min_value=1,
+            max_value=8,
+            value=4,
+            key="orc_workers",
+            help="Test cases run concurrently on pooled connections to the selected database.",
+        )
+
         with st.expander("Source", expanded=False):
             orchestrator_source = st.selectbox(
                 "Source",
@@ -639,10 +822,8 @@ with st.sidebar:
                             site = Site(site_url, version=Version.v2016, authcookie=authcookie)
                             folder = site.Folder(library)
                             file_bytes = folder.get_file(sp_file_path)
-                            st.session_state["orc_excel_data"] = pd.read_excel(io.BytesIO(file_bytes), sheet_name=None)
-                            st.session_state["orc_excel_filename"] = Path(sp_file_path).stem
-                            st.session_state.pop("orc_execute_clicked", None)
-                            st.session_state.pop("orc_excel_error", None)
+                            from workbook_cache import content_key
+                            _load_orc_workbook(content_key(file_bytes), file_bytes, Path(sp_file_path).stem)
                         except Exception as e:
                             st.session_state["orc_excel_error"] = str(e)
                     elif sp_submitted:
@@ -652,26 +833,26 @@ with st.sidebar:
                 uploaded = st.file_uploader("File", type=["xlsx", "xls"], key="orc_upload", label_visibility="collapsed")
                 if uploaded:
                     try:
-                        st.session_state["orc_excel_data"] = pd.read_excel(uploaded, sheet_name=None)
-                        st.session_state["orc_excel_filename"] = Path(uploaded.name).stem
-                        st.session_state.pop("orc_execute_clicked", None)
-                        st.session_state.pop("orc_excel_error", None)
+                        from workbook_cache import content_key
+                        file_bytes = uploaded.getvalue()
+                        key = content_key(file_bytes)
+                        # The uploader keeps its file across reruns: only a different file resets the results.
+                        if st.session_state.get("orc_excel_key") != key or "orc_excel_data" not in st.session_state:
+                            _load_orc_workbook(key, file_bytes, Path(uploaded.name).stem)
                     except Exception as e:
                         st.session_state["orc_excel_error"] = str(e)
 
             if source == "Network Folder" and load_clicked and selected_file:
                 try:
-                    st.session_state["orc_excel_data"] = pd.read_excel(selected_file, sheet_name=None)
-                    st.session_state["orc_excel_filename"] = Path(selected_file).stem
-                    st.session_state.pop("orc_execute_clicked", None)
-                    st.session_state.pop("orc_excel_error", None)
+                    from workbook_cache import path_key
+                    _load_orc_workbook(path_key(selected_file), selected_file, Path(selected_file).stem)
                 except Exception as e:
                     st.session_state["orc_excel_error"] = str(e)
 
             if "orc_excel_data" in st.session_state:
                 df_all = st.session_state["orc_excel_data"]
                 sheet_options = []
-                if isinstance(df_all, dict):
+                if isinstance(df_all, Mapping):
                     sheet_list = list(df_all.keys())
                     sheet_options = (["ALL"] + sheet_list) if len(sheet_list) > 1 else sheet_list
                     default_index = 1 if len(sheet_options) > 1 else 0
@@ -684,8 +865,9 @@ with st.sidebar:
                     )
                 st.markdown("---")
                 if st.button("Execute", key="orc_execute_tests", type="primary", use_container_width=True):
-                    st.session_state["orc_execute_clicked"] = True
+                    _run_orchestrator()
                     st.rerun()
+                _job_panel("orc_", "Orchestrator")
         components.html(
             '''<button onclick="try{window.top.print()}catch(e){window.print()}" style="padding:0.4rem 0.8rem;background:#87cefa;color:#000000;
             border:1px solid #6fbfe6;border-radius:6px;cursor:pointer;font-weight:400;font-size:0.85rem;width:100%;">Download PDF</button>''',
@@ -705,11 +887,74 @@ with st.sidebar:
             key="recon_join_cols_input",
             help="Leave blank to auto-use first 3 matching columns.",
         )
+        st.radio(
+            "Compare",
+            ["Full", "Hash", "Profile", "Bucketed", "Incremental", "Merge"],
+            key="recon_compare_mode",
+            horizontal=True,
+            help="Hash: compute row hashes in each database and fetch full rows only for keys whose hashes differ. "
+            "Profile: compare per-column aggregates (counts, distinct, NULLs, min/max, sums) without fetching rows. "
+            "Bucketed: checksum key buckets in each database and fetch and compare only buckets that differ. "
+            "Incremental: compare only rows past the last run's watermark plus keys that mismatched last time. "
+            "Merge: read both tables ordered by the join key and compare them in one streaming pass with bounded memory.",
+        )
+        if st.session_state.get("recon_compare_mode", "Full") == "Full":
+            from recon_ooc import DUCKDB_AVAILABLE
+            st.toggle(
+                "Out-of-core join (DuckDB)",
+                value=False,
+                key="recon_out_of_core",
+                disabled=not DUCKDB_AVAILABLE,
+                help="Stream both tables to local Parquet files and join them in DuckDB, spilling to disk beyond recon.out_of_core.memory_limit. "
+                + ("" if DUCKDB_AVAILABLE else "Needs duckdb: pip install duckdb"),
+            )
+        if st.session_state.get("recon_compare_mode") == "Incremental":
+            st.text_input(
+                "Watermark column",
+                key="recon_watermark_col",
+                placeholder="updated_at",
+                help="Column that grows when a row changes (timestamp or load id), present in both tables.",
+            )
+        if st.session_state.get("recon_compare_mode") == "Bucketed":
+            st.radio(
+                "Buckets by",
+                ["Hash", "Range"],
+                key="recon_bucket_strategy",
+                horizontal=True,
+                help="Hash: MD5 of the join key modulo the bucket count. Range: even ranges of the first join column (numeric or date).",
+            )
+            st.number_input("Buckets", min_value=1, max_value=4096, value=64, step=1, key="recon_buckets")
+            st.number_input(
+                "Parallel buckets",
+                min_value=1,
+                max_value=8,
+                value=4,
+                step=1,
+                key="recon_bucket_workers",
+                help="Buckets fetched and compared at once (single-table runs). An interrupted run resumes from finished buckets.",
+            )
+        st.number_input(
+            "Numeric tolerance",
+            min_value=0.0,
+            value=0.0,
+            format="%g",
+            key="recon_tolerance",
+            help="Numeric values within this absolute difference count as matching.",
+        )
+        st.toggle("Trim strings", value=False, key="recon_trim_strings", help="Ignore leading/trailing whitespace when comparing text.")
         if join_cols_input:
             st.session_state["recon_join_cols"] = [c.strip() for c in join_cols_input.split(",") if c.strip()]
         else:
             st.session_state["recon_join_cols"] = []
         if recon_mode == "Upload Excel":
+            st.number_input(
+                "Parallel rows",
+                min_value=1,
+                max_value=32,
+                value=4,
+                key="recon_workers",
+                help="Recon rows run concurrently; per-database limits come from config 'recon.max_concurrent_per_database'.",
+            )
             template_path = Path(__file__).parent / "recon_template.xlsx"
             if template_path.exists():
                 with open(template_path, "rb") as f:
@@ -742,6 +987,7 @@ with st.sidebar:
         execute_clicked = st.button("Execute", key="recon_execute", type="primary", use_container_width=True)
         if execute_clicked:
             _run_recon()
+        _job_panel("recon_", "Recon")
         if "recon_error" in st.session_state:
             st.error(st.session_state["recon_error"])
         components.html(
@@ -800,9 +1046,52 @@ with st.sidebar:
                     st.error(f"Invalid file: {e}")
             else:
                 st.session_state.pop("dmc_excel_df", None)
+        st.number_input(
+            "Hop timeout (seconds)",
+            min_value=10,
+            value=600,
+            step=30,
+            key="dmc_hop_timeout",
+            help="Per-hop limit for hops without 'timeout_seconds' in dmc_config. Hops run concurrently.",
+        )
+        st.number_input(
+            "Tables per statement",
+            min_value=1,
+            value=50,
+            step=10,
+            key="dmc_batch_size",
+            help="Each hop's counts are split into UNION ALL statements of this many tables (dmc_config 'batch_size' overrides). "
+                 "A failing statement is split and retried until the error is narrowed to single tables.",
+        )
+        st.number_input(
+            "Parallel statements per hop",
+            min_value=1,
+            max_value=16,
+            value=4,
+            step=1,
+            key="dmc_parallel_batches",
+            help="Statements of one hop run at once on pooled connections (dmc_config 'parallel_batches' overrides).",
+        )
+        dmc_fast = st.toggle(
+            "Fast counts (catalog statistics)",
+            key="dmc_fast_counts",
+            help="Read row counts from each database's table statistics instead of COUNT(*). Tables with a filter, "
+                 "an 'Exact Count' flag, or missing/stale statistics are still counted exactly.",
+        )
+        if dmc_fast:
+            st.number_input(
+                "Max statistics age (days)",
+                min_value=0,
+                value=0,
+                step=1,
+                key="dmc_stats_max_age",
+                help="Count tables exactly when their statistics are older than this. 0 accepts any age. "
+                     "Netezza and MySQL keep no statistics time, so any limit counts their tables exactly.",
+            )
         dmc_execute_clicked = st.button("Execute", key="dmc_execute", type="primary", use_container_width=True)
         if dmc_execute_clicked:
             _run_dmc()
+        _job_panel("dmc_", "DMC")
         if "dmc_error" in st.session_state:
             st.error(st.session_state["dmc_error"])
         components.html(
@@ -872,7 +1161,7 @@ elif page == "Orchestrator":
     with col_data:
         if "orc_excel_data" in st.session_state:
             df_all = st.session_state["orc_excel_data"]
-            if isinstance(df_all, dict):
+            if isinstance(df_all, Mapping):
                 sel = st.session_state.get("orc_selected_sheet", list(df_all.keys())[0])
                 sheets_to_show = list(df_all.items()) if sel == "ALL" else [(sel, df_all[sel])]
             else:
@@ -892,132 +1181,57 @@ elif page == "Orchestrator":
                 if st.session_state.get("orc_execute_clicked"):
                     st.markdown('<p style="color: #0066cc; font-size: 1.5rem; font-weight: 600; margin: 0.5rem 0;">Execution of the Test Cases is Started......</p>', unsafe_allow_html=True)
                 if not df.empty and st.session_state.get("orc_execute_clicked"):
-                    def find_col(df, names):
-                        cols_lower = {str(c).strip().lower(): c for c in df.columns}
-                        for n in names:
-                            nlo = n.lower().replace(" ", "_")
-                            if nlo in cols_lower:
-                                return cols_lower[nlo]
-                            for c in df.columns:
-                                if nlo in str(c).lower().replace(" ", "_"):
-                                    return c
-                        return None
-
-                    col_sno = find_col(df, ["S_No", "SNo", "Test Case", "TestCase"])
-                    col_val = find_col(df, ["Validation_Type", "Validation Type", "ValidationType"])
-                    col_cols = find_col(df, ["Columns", "Column"])
-                    col_sql = find_col(df, ["SQL Query", "SQLQuery", "SQL", "Query"])
-                    col_res = find_col(df, ["Results", "Result"])
-                    col_hop = find_col(df, ["Hop", "Hop Name", "HopName", "Hop Value", "Hop_Value"])
-                    col_skip_reg = find_col(df, ["Skip_Regression_Testing", "Skip Regression Testing", "SkipRegressionTesting"])
-                    if col_skip_reg is None:
-                        for c in df.columns:
-                            if "skip" in str(c).lower() and "regression" in str(c).lower():
-                                col_skip_reg = c
-                                break
-
-                    conn = st.session_state.get("orc_db_conn")
-                    db_type = st.session_state.get("orchestrator_database", "Netezza")
+                    from orc_runner import resolve_columns, cell, case_sql, validation_type, status_messages, case_key, case_status
+
+                    cols = resolve_columns(df)
+                    col_res = cols["res"]
+                    col_skip_reg = cols["skip_reg"]
+                    connected = st.session_state.get("orc_db_connected")
+                    conn_id = st.session_state.get("orc_conn_id")
+                    outcomes = st.session_state.get("orc_case_results", {})
                     for idx, row in df.iterrows():
                         validation_executed = False
-                        v = lambda r, c: r.get(c, "-") if c is not None else "-"
-                        st.markdown(f"**Test Case:** {v(row, col_sno)}")
-                        st.markdown(f"**Validation Type:** {v(row, col_val)}")
-                        st.markdown(f"**Columns:** {v(row, col_cols)}")
-                        sql_val = v(row, col_sql)
-                        validation_type_raw = str(v(row, col_val))
-                        validation_type = " ".join(validation_type_raw.strip().lower().split())
+                        st.markdown(f"**Test Case:** {cell(row, cols['sno'])}")
+                        st.markdown(f"**Validation Type:** {cell(row, cols['val'])}")
+                        st.markdown(f"**Columns:** {cell(row, cols['cols'])}")
+                        vtype = validation_type(row, cols)
                         computed_status = None
-                        hop_val = str(v(row, col_hop)).strip() if col_hop is not None else ""
-                        if hop_val and hop_val.lower() not in ("-", "nan", "none"):
-                            hop_label = f"Hop {hop_val}"
-                        else:
-                            hop_label = "Hop"
-                        not_matching_msg = f"Failed ✗, Data is not matching in {hop_label}"
-                        matching_msg = f"Success ✓, Data is matching in {hop_label}"
+                        matching_msg, not_matching_msg = status_messages(row, cols)
                         skipped_msg = "Skipped, Validation is skipped."
                         st.markdown("**SQL Query:**")
-                        if sql_val and str(sql_val).strip() not in ("-", "nan", ""):
-                            sql_str = str(sql_val).strip()
+                        sql_str = case_sql(row, cols)
+                        if sql_str is not None:
                             st.code(sql_str, language="sql")
-                            if conn:
-                                try:
-                                    from db_connector import run_query
-                                    qdf = run_query(conn, db_type, sql_str)
-                                    validation_executed = True
-                                    if qdf is not None and not qdf.empty:
-                                        display_df = qdf.head(5)
-                                        st.markdown("**Query Results:**")
-                                        st.dataframe(display_df, use_container_width=True, hide_index=True)
-                                        if len(qdf) > 5:
-                                            st.caption(f"Showing first 5 of {len(qdf)} rows")
-                                        if validation_type in (
-                                            "direct map",
-                                            "business logic",
-                                            "default values",
-                                            "dnp",
-                                            "etl fields",
-                                        ):
-                                            if len(qdf) > 1:
-                                                computed_status = not_matching_msg
-                                            else:
-                                                computed_status = matching_msg
-                                        elif validation_type in ("count", "row count"):
-                                            if len(qdf) == 1:
-                                                computed_status = not_matching_msg
-                                            elif len(qdf) >= 2:
-                                                if qdf.shape[1] >= 2:
-                                                    first_val = qdf.iloc[0, 1]
-                                                    second_val = qdf.iloc[1, 1]
-                                                    if pd.isna(first_val) or pd.isna(second_val):
-                                                        computed_status = not_matching_msg
-                                                    elif str(first_val).strip() == str(second_val).strip():
-                                                        computed_status = matching_msg
-                                                    else:
-                                                        computed_status = not_matching_msg
-                                                else:
-                                                    st.warning("Count validation expects at least 2 columns.")
-                                    elif validation_type in ("dnp", "etl fields", "direct map"):
-                                        if len(qdf) > 1:
-                                            computed_status = not_matching_msg
-                                    elif validation_type == "etl":
-                                        if len(qdf) < 6:
-                                            computed_status = matching_msg
-                                    elif validation_type in ("business logic", "business_logic", "businesslogic"):
-                                        if qdf is None or qdf.empty:
-                                            computed_status = matching_msg
-                                        else:
-                                            computed_status = not_matching_msg
-                                    elif validation_type in ("default values", "default"):
-                                        if len(qdf) == 1:
-                                            computed_status = matching_msg
-                                    elif qdf is not None:
-                                        if validation_type in ("dnp", "etl fields", "direct map"):
-                                            computed_status = matching_msg
-                                            st.caption(matching_msg)
-                                        elif validation_type == "etl":
-                                            computed_status = matching_msg
-                                            st.caption(matching_msg)
-                                        elif validation_type in ("business logic", "business_logic", "businesslogic"):
-                                            computed_status = matching_msg
-                                            st.caption(matching_msg)
-                                        else:
-                                            st.caption("Query returned no rows.")
-                                except Exception as ex:
-                                    st.error(f"Query error: {ex}")
+                            outcome = outcomes.get(case_key(sheet_name, sql_str, conn_id))
+                            if outcome is None:
+                                st.caption("Connect to database to execute query." if not connected else "Not executed yet. Click Execute to run the test cases.")
+                            elif outcome["error"]:
+                                st.error(f"Query error: {outcome['error']}")
                             else:
-                                st.caption("Connect to database to execute query.")
+                                validation_executed = True
+                                row_count = outcome["row_count"]
+                                if row_count > 0:
+                                    st.markdown("**Query Results:**")
+                                    st.dataframe(outcome["preview"], use_container_width=True, hide_index=True)
+                                    if row_count > 5:
+                                        st.caption(f"Showing first 5 of {row_count} rows")
+                                computed_status, notes = case_status(vtype, outcome, matching_msg, not_matching_msg)
+                                for level, note in notes:
+                                    if level == "warning":
+                                        st.warning(note)
+                                    else:
+                                        st.caption(note)
                         else:
                             st.markdown("-")
                         row_skipped = False
                         if col_skip_reg is not None:
-                            row_skipped = str(v(row, col_skip_reg)).strip().upper() == "Y"
+                            row_skipped = str(cell(row, col_skip_reg)).strip().upper() == "Y"
                         if row_skipped:
                             res_val = skipped_msg
-                        elif not conn and not validation_executed:
+                        elif not connected and not validation_executed:
                             res_val = "Connect to database to run validation"
                         else:
-                            res_val = computed_status or str(v(row, col_res)).strip()
+                            res_val = computed_status or str(cell(row, col_res)).strip()
                         res_lower = res_val.lower()
                         if res_lower.startswith("success"):
                             cnt_success += 1
@@ -1035,7 +1249,7 @@ elif page == "Orchestrator":
                         st.markdown("---")
 
                         if (
-                            validation_type in ("count", "row count")
+                            vtype in ("count", "row count")
                             and computed_status == not_matching_msg
                             and not st.session_state.get("orc_proceed_on_row_count_fail", True)
                         ):
@@ -1069,7 +1283,7 @@ elif page == "Orchestrator":
     # Removed the right-side "Run query" panel.
 
 elif page == "DMC":
-    render_dmc()
+    render_dmc(_dmc_history())
 
 elif page == "Read me":
     st.title("Read me")
@@ -1,8 +1,33 @@
 """
 Database connection utilities - reads credentials from config and connects.
 """
+import hashlib
+import json
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from numbers import Number
+from urllib.parse import quote
+
+import numpy as np
 import pandas as pd
 
+from sql_params import CURSORS, Binds, Statement, padded, paramstyle, sql_literal
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Rows per chunk for streaming fetches; bounds peak memory independently of table size.
+DEFAULT_CHUNKSIZE = 50000
+
+# Keys per statement when fetching rows by key.
+KEY_BATCH_SIZE = 500
+
 
 def _get_config_key(db_type):
     """Map UI database name to config key."""
@@ -46,16 +71,407 @@ def connect_db(db_type, config):
         return None, str(e)
 
 
+def _ping(conn, db_type):
+    """Return True if the connection answers a trivial query."""
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT 1 FROM DUAL" if db_type == "Oracle" else "SELECT 1")
+            cur.fetchall()
+        finally:
+            cur.close()
+        return True
+    except Exception:
+        return False
+
+
+def _close_quietly(conn):
+    CURSORS.forget(conn)
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of open connections keyed by database type and a hash of its config section.
+    Idle connections are health-checked before reuse and closed after idle_timeout seconds;
+    at most max_size connections (idle + in use) are kept per key.
+    """
+
+    def __init__(self, max_size=8, idle_timeout=600, health_check_after=60, acquire_timeout=120):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        self._cond = threading.Condition()
+        self._idle = {}    # key -> [(conn, last_used), ...]
+        self._in_use = {}  # key -> count
+        self._owner = {}   # id(conn) -> (key, db_type)
+
+    @staticmethod
+    def pool_key(db_type, config):
+        """Key for db_type and its 'databases' config section."""
+        db_config = config.get("databases", {}).get(_get_config_key(db_type), {})
+        digest = hashlib.sha256(json.dumps(db_config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return f"{db_type}:{digest}"
+
+    def acquire(self, db_type, config):
+        """Get a pooled or new connection. Returns (conn, error_msg), like connect_db()."""
+        key = self.pool_key(db_type, config)
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._cond:
+            self._evict_idle()
+            while True:
+                idle = self._idle.get(key, [])
+                if idle:
+                    conn, last_used = idle.pop()
+                    self._in_use[key] = self._in_use.get(key, 0) + 1
+                    break
+                if self._in_use.get(key, 0) < self.max_size:
+                    conn, last_used = None, None
+                    self._in_use[key] = self._in_use.get(key, 0) + 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None, f"Timed out waiting for a {db_type} connection (pool max_size={self.max_size})."
+                self._cond.wait(remaining)
+        if conn is not None and time.monotonic() - last_used > self.health_check_after and not _ping(conn, db_type):
+            _close_quietly(conn)
+            conn = None
+        if conn is None:
+            conn, err = connect_db(db_type, config)
+            if err:
+                self._free_slot(key)
+                return None, err
+        with self._cond:
+            self._owner[id(conn)] = (key, db_type)
+        return conn, None
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool; discard=True closes it instead."""
+        if conn is None:
+            return
+        with self._cond:
+            key, _ = self._owner.pop(id(conn), (None, None))
+        if key is None:
+            _close_quietly(conn)
+            return
+        if not discard:
+            try:
+                conn.rollback()  # end any open transaction before the next borrower
+            except Exception:
+                discard = True
+        if discard:
+            _close_quietly(conn)
+            self._free_slot(key)
+            return
+        with self._cond:
+            self._in_use[key] = max(self._in_use.get(key, 1) - 1, 0)
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close_all(self):
+        """Close every idle connection (registered at exit by the app)."""
+        with self._cond:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                _close_quietly(conn)
+
+    def _free_slot(self, key):
+        with self._cond:
+            self._in_use[key] = max(self._in_use.get(key, 1) - 1, 0)
+            self._cond.notify()
+
+    def _evict_idle(self):
+        """Close idle connections unused for idle_timeout seconds. Caller holds the lock."""
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, conns in self._idle.items():
+            stale = [c for c, t in conns if t < cutoff]
+            if stale:
+                self._idle[key] = [(c, t) for c, t in conns if t >= cutoff]
+                for conn in stale:
+                    _close_quietly(conn)
+
+
+def _prepare(conn, db_type, query):
+    """(sql, params) for cursor.execute: a Statement rendered in the driver's paramstyle, plain SQL as is."""
+    if isinstance(query, Statement):
+        return query.render("dollar" if db_type == "PostgreSQL" and _is_adbc(conn) else paramstyle(conn, db_type))
+    return query, None
+
+
 def run_query(conn, db_type, query):
-    """Run a query and return DataFrame. conn from connect_db()."""
+    """Run a query (SQL text or Statement) and return DataFrame. conn from connect_db()."""
     if conn is None:
         return None
     try:
-        return pd.read_sql(query, conn)
+        sql, params = _prepare(conn, db_type, query)
+        return pd.read_sql(sql, conn, params=params)
     except Exception as e:
         raise e
 
 
+def _is_adbc(conn):
+    """True for ADBC DB-API connections (adbc_driver_*), which have no server-side cursor options."""
+    return type(conn).__module__.startswith("adbc_driver")
+
+
+def _stream_cursor(conn, db_type, chunksize):
+    """Open a cursor that streams from the server where the driver supports it."""
+    if db_type == "PostgreSQL" and not _is_adbc(conn):
+        # psycopg2 named cursors are server-side; rows arrive itersize at a time.
+        cur = conn.cursor(name=f"dv_stream_{uuid.uuid4().hex}")
+        cur.itersize = chunksize
+        return cur
+    if db_type == "MySQL":
+        try:
+            import pymysql.cursors
+            return conn.cursor(pymysql.cursors.SSCursor)
+        except ImportError:
+            pass
+    cur = conn.cursor()
+    try:
+        # Oracle allocates arraysize rows up front, so cap its fetch buffer.
+        cur.arraysize = min(chunksize, 10000) if db_type == "Oracle" else chunksize
+    except Exception:
+        pass
+    return cur
+
+
+def _split_frame(df, chunksize):
+    """Yield df in slices of at most chunksize rows."""
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize].reset_index(drop=True)
+
+
+def _columns(cur):
+    return [d[0] for d in cur.description or []]
+
+
+def _frame_chunks(cur, db_type, chunksize):
+    """DataFrame chunks of an executed cursor: Snowflake fetch_pandas_batches, else fetchmany()."""
+    if db_type == "Snowflake":
+        try:
+            batches = cur.fetch_pandas_batches()
+        except Exception:
+            batches = None  # pandas extra not installed or non-Arrow result; fall back to fetchmany
+        if batches is not None:
+            for batch in batches:
+                yield from _split_frame(batch, chunksize)
+            return
+    while True:
+        rows = cur.fetchmany(chunksize)
+        if not rows:
+            return
+        yield pd.DataFrame.from_records([tuple(r) for r in rows], columns=_columns(cur))
+
+
+def _arrow_column(values):
+    """pyarrow array of one fetched column; values Arrow cannot type together (mixed types) become strings."""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None else str(v) for v in values], pa.string())
+
+
+def _arrow_block(rows, columns):
+    """pyarrow Table of a fetchmany() block, converted column by column rather than row by row."""
+    return pa.table([_arrow_column(list(col)) for col in zip(*rows)], names=columns)
+
+
+def _native_arrow(cur, db_type):
+    """Iterator of Arrow record batches or tables straight from the driver, or None if it has none."""
+    if hasattr(cur, "fetch_record_batch"):  # ADBC and DuckDB cursors
+        try:
+            return iter(cur.fetch_record_batch())
+        except Exception:
+            return None
+    if db_type == "Snowflake":
+        try:
+            return iter(cur.fetch_arrow_batches())
+        except Exception:
+            return None  # non-Arrow result format; fall back to fetchmany
+    return None
+
+
+def _arrow_chunks(cur, db_type, chunksize):
+    """
+    pyarrow Tables of at most chunksize rows from an executed cursor: the driver's own Arrow batches
+    where it has them, else fetchmany() blocks converted per column. Column types found in later
+    blocks are promoted with the earlier ones (null to int, int to double), and the promoted schema
+    is kept for the blocks after that.
+    """
+    native = _native_arrow(cur, db_type)
+    if native is not None:
+        for batch in native:
+            table = batch if isinstance(batch, pa.Table) else pa.Table.from_batches([batch])
+            for start in range(0, table.num_rows, chunksize):
+                yield table.slice(start, chunksize)
+        return
+    schema = None
+    while True:
+        rows = cur.fetchmany(chunksize)
+        if not rows:
+            return
+        table = _arrow_block(rows, _columns(cur))
+        if schema is not None and table.schema != schema:
+            try:
+                schema = pa.unify_schemas([schema, table.schema], promote_options="permissive")
+                table = table.cast(schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                pass
+        schema = table.schema if schema is None else schema
+        yield table
+
+
+def _empty_arrow(columns):
+    return pa.table({c: pa.array([], pa.null()) for c in columns})
+
+
+def _arrow_frame(table):
+    """DataFrame of a pyarrow Table with ArrowDtype columns, as pandas dtype_backend="pyarrow" produces."""
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _iter_chunks(conn, db_type, query, chunksize, on_cursor, arrow):
+    """Execute query and yield its chunks (pyarrow Tables when arrow, else DataFrames); at least one, empty for no rows."""
+    sql, params = _prepare(conn, db_type, query)
+    reuse = params is not None and db_type not in ("PostgreSQL", "MySQL")
+    cur = (CURSORS.checkout(conn, sql) if reuse else None) or _stream_cursor(conn, db_type, chunksize)
+    if on_cursor is not None:
+        on_cursor(cur)
+    finished = False
+    try:
+        if params is None:
+            cur.execute(sql)
+        else:
+            cur.execute(sql, params)
+        yielded = False
+        for chunk in (_arrow_chunks if arrow else _frame_chunks)(cur, db_type, chunksize):
+            yielded = True
+            yield chunk
+        if not yielded:
+            yield _empty_arrow(_columns(cur)) if arrow else pd.DataFrame(columns=_columns(cur))
+        finished = True
+    finally:
+        if reuse and finished:
+            CURSORS.checkin(conn, sql, cur)
+        else:
+            try:
+                cur.close()
+            except Exception:
+                pass
+
+
+def _use_arrow(dtype_backend):
+    return dtype_backend == "pyarrow" and PYARROW_AVAILABLE
+
+
+def iter_query(conn, db_type, query, chunksize=DEFAULT_CHUNKSIZE, on_cursor=None, dtype_backend=None):
+    """
+    Run a query (SQL text or Statement) and yield DataFrame chunks of at most chunksize rows. conn
+    from connect_db(). Uses server-side cursors where the driver supports them (psycopg2 named cursors,
+    Snowflake fetch_pandas_batches, pymysql SSCursor), else fetchmany(). Yields one empty frame for an
+    empty result. A Statement with bind values reuses the cursor that last ran it on conn where the
+    cursor is not a server-side one. on_cursor, if given, is called with the open cursor before
+    execution so callers can cancel it. dtype_backend="pyarrow" (with pyarrow installed) yields
+    ArrowDtype columns built from the driver's Arrow batches (ADBC, DuckDB, Snowflake
+    fetch_arrow_batches) or from fetchmany() blocks converted per column.
+    """
+    if conn is None:
+        return
+    arrow = _use_arrow(dtype_backend)
+    for chunk in _iter_chunks(conn, db_type, query, chunksize, on_cursor, arrow):
+        yield _arrow_frame(chunk) if arrow else chunk
+
+
+def read_query_chunked(conn, db_type, query, chunksize=DEFAULT_CHUNKSIZE, on_cursor=None, dtype_backend=None):
+    """
+    Run a query (SQL text or Statement) through iter_query and concatenate the chunks into one
+    DataFrame. With dtype_backend="pyarrow" the chunks are concatenated as Arrow tables and converted once.
+    """
+    if conn is None:
+        return None
+    if _use_arrow(dtype_backend):
+        tables = list(_iter_chunks(conn, db_type, query, chunksize, on_cursor, True))
+        return _arrow_frame(pa.concat_tables(tables, promote_options="permissive") if len(tables) > 1 else tables[0])
+    chunks = list(iter_query(conn, db_type, query, chunksize, on_cursor))
+    if not chunks:
+        return None
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def cancel_query(conn, cursor=None):
+    """Best-effort cancel of a running statement from another thread. Returns True if a cancel was sent."""
+    for target in (cursor, conn):
+        for name in ("cancel", "adbc_cancel"):
+            cancel = getattr(target, name, None) if target is not None else None
+            if callable(cancel):
+                try:
+                    cancel()
+                    return True
+                except Exception:
+                    continue
+    return False
+
+
+def summarize_query(conn, db_type, query, preview_rows=5, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream a query keeping only the first preview_rows rows. Returns (preview_df, total_row_count)."""
+    preview = None
+    total = 0
+    for chunk in iter_query(conn, db_type, query, chunksize):
+        if preview is None:
+            preview = chunk.head(preview_rows)
+        elif len(preview) < preview_rows:
+            preview = pd.concat([preview, chunk.head(preview_rows - len(preview))], ignore_index=True)
+        total += len(chunk)
+    return preview, total
+
+
+def _subquery(query):
+    """User SQL as a derived table; newlines keep a trailing '--' comment from swallowing the wrapper."""
+    return f"(\n{query.strip().rstrip(';').strip()}\n) dv_q"
+
+
+def preview_query(conn, db_type, query, rows=5):
+    """First rows of a query, limited inside the database. Returns a DataFrame."""
+    if db_type == "SQL Server":
+        q = f"SELECT TOP {int(rows)} * FROM {_subquery(query)}"
+    elif db_type == "Oracle":
+        q = f"SELECT * FROM {_subquery(query)} WHERE ROWNUM <= {int(rows)}"
+    else:
+        q = f"SELECT * FROM {_subquery(query)} LIMIT {int(rows)}"
+    return pd.read_sql(q, conn)
+
+
+def count_query_rows(conn, db_type, query):
+    """Row count of a query, computed inside the database."""
+    df = pd.read_sql(f"SELECT COUNT(*) AS row_count FROM {_subquery(query)}", conn)
+    return int(df.iloc[0, 0])
+
+
+def summarize_query_server_side(conn, db_type, query, preview_rows=5):
+    """
+    Like summarize_query, but only the preview rows and a COUNT(*) leave the database; the count
+    query runs only when the preview is full. Falls back to streaming when the SQL cannot be wrapped
+    as a subquery (e.g. a CTE on SQL Server). Returns (preview_df, total_row_count).
+    """
+    try:
+        preview = preview_query(conn, db_type, query, preview_rows)
+        if len(preview) < preview_rows:
+            return preview, len(preview)
+        return preview, count_query_rows(conn, db_type, query)
+    except Exception:
+        try:
+            conn.rollback()  # PostgreSQL aborts the transaction on error
+        except Exception:
+            pass
+        return summarize_query(conn, db_type, query, preview_rows)
+
+
 def _quote_table(db_type, table_name):
     """Quote table name for the given database type. Handles schema.table format."""
     if "." in table_name:
@@ -68,8 +484,55 @@ def _quote_table(db_type, table_name):
     return f'"{table_name}"'
 
 
-def get_table_columns(conn, db_type, table_name):
-    """Get list of column names for a table. Returns (columns, error_msg)."""
+class SchemaCache:
+    """
+    Table column lists keyed by (database, connection config, table) with a TTL, shared across
+    recon rows and sessions so column discovery is not a round trip per table per run.
+    """
+
+    def __init__(self, ttl=900):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(db_type, config, table_name):
+        return (ConnectionPool.pool_key(db_type, config or {}), table_name.strip())
+
+    def get(self, db_type, config, table_name):
+        """Cached column list, or None when missing or expired."""
+        key = self._key(db_type, config, table_name)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            if time.monotonic() - hit[1] > self.ttl:
+                del self._entries[key]
+                return None
+            return list(hit[0])
+
+    def put(self, db_type, config, table_name, columns):
+        with self._lock:
+            self._entries[self._key(db_type, config, table_name)] = (list(columns), time.monotonic())
+
+    def invalidate(self, db_type, config, table_name):
+        with self._lock:
+            self._entries.pop(self._key(db_type, config, table_name), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_table_columns(conn, db_type, table_name, schema_cache=None, config=None):
+    """
+    Get list of column names for a table. Returns (columns, error_msg).
+    With schema_cache (and the config the connection came from), cached columns skip the probe query.
+    """
+    if schema_cache is not None:
+        cached = schema_cache.get(db_type, config, table_name)
+        if cached is not None:
+            return cached, None
     if conn is None:
         return [], "No connection"
     try:
@@ -81,11 +544,155 @@ def get_table_columns(conn, db_type, table_name):
         else:
             q = f"SELECT * FROM {quoted} LIMIT 0"
         df = pd.read_sql(q, conn)
+        if schema_cache is not None:
+            schema_cache.put(db_type, config, table_name, df.columns)
         return list(df.columns), None
     except Exception as e:
         return [], str(e)
 
 
+# Catalog view, schema / table / column / position columns and current-schema expression per database.
+_COLUMN_CATALOG = {
+    "Netezza": ("_V_RELATION_COLUMN", "SCHEMA", "NAME", "ATTNAME", "ATTNUM", "CURRENT_SCHEMA"),
+    "Oracle": ("ALL_TAB_COLUMNS", "OWNER", "TABLE_NAME", "COLUMN_NAME", "COLUMN_ID", "SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA')"),
+    "SQL Server": ("INFORMATION_SCHEMA.COLUMNS", "TABLE_SCHEMA", "TABLE_NAME", "COLUMN_NAME", "ORDINAL_POSITION", "SCHEMA_NAME()"),
+    "MySQL": ("INFORMATION_SCHEMA.COLUMNS", "TABLE_SCHEMA", "TABLE_NAME", "COLUMN_NAME", "ORDINAL_POSITION", "DATABASE()"),
+    "PostgreSQL": ("information_schema.columns", "table_schema", "table_name", "column_name", "ordinal_position", "current_schema()"),
+    "Snowflake": ("INFORMATION_SCHEMA.COLUMNS", "TABLE_SCHEMA", "TABLE_NAME", "COLUMN_NAME", "ORDINAL_POSITION", "CURRENT_SCHEMA()"),
+}
+
+
+def _column_catalog_sql(db_type, table_names):
+    """One catalog Statement for the column lists of table_names ("table" or "schema.table"), names bound."""
+    view, schema_col, table_col, column_col, pos_col, current = _COLUMN_CATALOG[db_type]
+    unqualified = sorted({t for t in table_names if "." not in t})
+    qualified = sorted({tuple(t.split(".", 1)) for t in table_names if "." in t})
+    binds = Binds()
+    conds = []
+    if unqualified:
+        conds.append(f"({schema_col} = {current} AND {table_col} IN ({', '.join(binds.add(t) for t in padded(unqualified))}))")
+    conds.extend(f"({schema_col} = {binds.add(s)} AND {table_col} = {binds.add(t)})" for s, t in padded(qualified))
+    return binds.statement(
+        f"SELECT {schema_col}, {table_col}, {column_col} FROM {view}\n"
+        f"WHERE {' OR '.join(conds)}\nORDER BY {schema_col}, {table_col}, {pos_col}"
+    )
+
+
+def prefetch_table_columns(conn, db_type, table_names, schema_cache, config=None, batch_size=200):
+    """
+    Fill schema_cache for many tables with one catalog query per batch_size tables (information_schema,
+    ALL_TAB_COLUMNS or _v_relation_column) instead of a probe per table. Best effort: tables the
+    catalog does not return, and every table on a query error, fall back to get_table_columns.
+    Returns the number of tables cached.
+    """
+    names = sorted({t.strip() for t in table_names if t and t.strip()})
+    names = [t for t in names if schema_cache.get(db_type, config, t) is None]
+    if conn is None or not names or db_type not in _COLUMN_CATALOG:
+        return 0
+    cached = 0
+    for i in range(0, len(names), batch_size):
+        batch = names[i:i + batch_size]
+        try:
+            df = run_query(conn, db_type, _column_catalog_sql(db_type, batch))
+        except Exception:
+            try:
+                conn.rollback()  # PostgreSQL aborts the transaction on error
+            except Exception:
+                pass
+            continue
+        found = {}
+        for schema, table, column in df.itertuples(index=False, name=None):
+            found.setdefault((str(schema).strip(), str(table).strip()), []).append(str(column).strip())
+        by_table = {}
+        for (schema, table), cols in found.items():
+            by_table.setdefault(table, []).append(cols)
+            by_table[f"{schema}.{table}"] = [cols]
+        for t in batch:
+            matches = by_table.get(t, [])
+            if len(matches) == 1:
+                schema_cache.put(db_type, config, t, matches[0])
+                cached += 1
+    return cached
+
+
+# Row count, statistics time and a stale flag per table from each database's catalog statistics.
+_ROW_COUNT_CATALOG = {
+    "Netezza": (
+        "SELECT SCHEMA, TABLENAME, RELTUPLES, NULL, 0 FROM _V_TABLE WHERE OBJTYPE = 'TABLE' AND ({cond})",
+        "SCHEMA", "TABLENAME", True,
+    ),
+    "Oracle": (
+        "SELECT OWNER, TABLE_NAME, NUM_ROWS, LAST_ANALYZED, CASE WHEN STALE_STATS = 'YES' THEN 1 ELSE 0 END "
+        "FROM ALL_TAB_STATISTICS WHERE OBJECT_TYPE = 'TABLE' AND ({cond})",
+        "OWNER", "TABLE_NAME", True,
+    ),
+    "Snowflake": (
+        "SELECT TABLE_SCHEMA, TABLE_NAME, ROW_COUNT, NULL, 0 FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE' AND ({cond})",
+        "TABLE_SCHEMA", "TABLE_NAME", False,
+    ),
+    "SQL Server": (
+        "SELECT s.name, t.name, SUM(p.rows), MAX(STATS_DATE(p.object_id, p.index_id)), 0 FROM sys.tables t JOIN sys.schemas s ON s.schema_id = t.schema_id "
+        "JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1) WHERE ({cond}) GROUP BY s.name, t.name",
+        "s.name", "t.name", True,
+    ),
+    "PostgreSQL": (
+        "SELECT n.nspname, c.relname, c.reltuples, GREATEST(st.last_analyze, st.last_autoanalyze), "
+        # Never analyzed: reltuples is -1 (PostgreSQL 14+) or 0 (earlier versions).
+        "CASE WHEN c.reltuples < 0 OR (c.reltuples = 0 AND st.last_analyze IS NULL AND st.last_autoanalyze IS NULL) "
+        "THEN 1 ELSE 0 END FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "LEFT JOIN pg_stat_all_tables st ON st.relid = c.oid WHERE c.relkind IN ('r', 'p') AND ({cond})",
+        "n.nspname", "c.relname", True,
+    ),
+    "MySQL": (
+        "SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_ROWS, NULL, 0 FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE' AND ({cond})",
+        "TABLE_SCHEMA", "TABLE_NAME", True,
+    ),
+}
+
+
+def fetch_catalog_row_counts(conn, db_type, tables, max_age_days=None, batch_size=200):
+    """
+    Row counts of (schema, table) pairs from catalog statistics, one query per batch_size tables:
+    Netezza _v_table.reltuples, Oracle ALL_TAB_STATISTICS.NUM_ROWS, Snowflake TABLES.ROW_COUNT,
+    SQL Server sys.partitions, PostgreSQL pg_class.reltuples, MySQL TABLES.TABLE_ROWS. Tables without
+    statistics, flagged stale, or analyzed more than max_age_days ago are left out so callers count
+    them exactly; with max_age_days, estimates without a statistics time (Netezza, MySQL) are left out
+    too, while Snowflake's exact counts are always kept. Returns ({(schema, table): (count, estimated)}, error_msg); estimated is False where
+    the catalog count is exact (Snowflake).
+    """
+    if conn is None:
+        return {}, "No connection"
+    if db_type not in _ROW_COUNT_CATALOG:
+        return {}, f"No catalog statistics for {db_type}"
+    template, schema_col, table_col, estimated = _ROW_COUNT_CATALOG[db_type]
+    wanted = sorted(set(tables))
+    cutoff = pd.Timestamp.now() - pd.Timedelta(days=max_age_days) if max_age_days else None
+    counts = {}
+    for i in range(0, len(wanted), batch_size):
+        batch = wanted[i:i + batch_size]
+        binds = Binds()
+        cond = " OR ".join(f"({schema_col} = {binds.add(s)} AND {table_col} = {binds.add(t)})" for s, t in padded(batch))
+        try:
+            rows = run_query(conn, db_type, binds.statement(template.format(cond=cond))).itertuples(index=False, name=None)
+        except Exception as e:
+            try:
+                conn.rollback()  # PostgreSQL aborts the transaction on error
+            except Exception:
+                pass
+            return counts, str(e)
+        for schema, table, n, stats_time, stale in rows:
+            if n is None or pd.isna(n) or n < 0 or stale:
+                continue
+            if cutoff is not None and estimated:
+                if stats_time is None or pd.isna(stats_time):
+                    continue
+                analyzed = pd.Timestamp(stats_time)
+                if (analyzed.tz_convert(None) if analyzed.tzinfo else analyzed) < cutoff:
+                    continue
+            counts[(str(schema).strip(), str(table).strip())] = (int(n), estimated)
+    return counts, None
+
+
 def _quote_col(db_type, col):
     """Quote column name for the given database type."""
     if db_type == "SQL Server":
@@ -93,29 +700,460 @@ def _quote_col(db_type, col):
     return f'"{col}"'
 
 
-def fetch_table_data(conn, db_type, table_name, columns, limit=100):
-    """Fetch data for specified columns from table. Returns (DataFrame, error_msg)."""
+def fetch_table_data(conn, db_type, table_name, columns, limit=100, where=None, order_by=None, dtype_backend=None):
+    """
+    Fetch data for specified columns from table, optionally filtered by the SQL predicate where and
+    sorted by the order_by columns. dtype_backend="pyarrow" returns ArrowDtype columns (see
+    iter_query). Returns (DataFrame, error_msg).
+    """
     if conn is None:
         return None, "No connection"
     if not columns:
         return pd.DataFrame(), None
+    try:
+        sql = _select_sql(db_type, table_name, columns, limit, where, order_by)
+        return read_query_chunked(conn, db_type, sql, dtype_backend=dtype_backend), None
+    except Exception as e:
+        return None, str(e)
+
+
+def iter_table_data(conn, db_type, table_name, columns, chunksize=DEFAULT_CHUNKSIZE, where=None, order_by=None, dtype_backend=None):
+    """Yield DataFrame chunks of the specified columns of a table (see fetch_table_data). Raises on query errors."""
+    if conn is None or not columns:
+        return
+    sql = _select_sql(db_type, table_name, columns, where=where, order_by=order_by)
+    yield from iter_query(conn, db_type, sql, chunksize, dtype_backend=dtype_backend)
+
+
+def _select_sql(db_type, table_name, columns, limit=None, where=None, order_by=None):
+    """SELECT Statement of columns from table, optionally filtered, ordered and limited to limit rows (bound)."""
+    quoted = _quote_table(db_type, table_name)
+    col_list = ", ".join(_quote_col(db_type, c) for c in columns)
+    order = f" ORDER BY {', '.join(_quote_col(db_type, c) for c in order_by)}" if order_by else ""
+    binds = Binds()
+    if limit is None:
+        return binds.statement(f"SELECT {col_list} FROM {quoted}" + (f" WHERE {where}" if where else "") + order)
+    # Netezza keeps a literal LIMIT; its drivers do not all accept a bind there.
+    n = str(int(limit)) if db_type == "Netezza" else binds.add(int(limit))
+    if db_type == "SQL Server":
+        return binds.statement(f"SELECT TOP ({n}) {col_list} FROM {quoted}" + (f" WHERE {where}" if where else "") + order)
+    if db_type == "Oracle":
+        if order:
+            inner = f"SELECT {col_list} FROM {quoted}" + (f" WHERE {where}" if where else "") + order
+            return binds.statement(f"SELECT * FROM ({inner}) WHERE ROWNUM <= {n}")
+        return binds.statement(f"SELECT {col_list} FROM {quoted} WHERE " + (f"({where}) AND " if where else "") + f"ROWNUM <= {n}")
+    return binds.statement(f"SELECT {col_list} FROM {quoted}" + (f" WHERE {where}" if where else "") + f"{order} LIMIT {n}")
+
+
+def null_key_filter(db_type, key_columns, null=True):
+    """SQL predicate: any key column is NULL (null=True) or all key columns are set (null=False)."""
+    if null:
+        return "(" + " OR ".join(f"{_quote_col(db_type, c)} IS NULL" for c in key_columns) + ")"
+    return "(" + " AND ".join(f"{_quote_col(db_type, c)} IS NOT NULL" for c in key_columns) + ")"
+
+
+_NUMERIC_SAMPLE_KINDS = ("integer", "floating", "decimal", "mixed-integer-float")
+_DATETIME_SAMPLE_KINDS = ("datetime", "datetime64", "date")
+
+
+def column_kinds(conn, db_type, table_name, columns, sample_rows=1000):
+    """
+    Hash kind of each column from a sample of rows: "numeric", "datetime", "text", or None when the
+    sample holds only NULLs. Returns ({column: kind}, error_msg).
+    """
+    df, err = fetch_table_data(conn, db_type, table_name, columns, limit=sample_rows)
+    if err:
+        return None, err
+    kinds = {}
+    for i, col in enumerate(columns):
+        s = df.iloc[:, i]
+        if pd.api.types.is_bool_dtype(s):
+            kinds[col] = "text"
+        elif pd.api.types.is_numeric_dtype(s):
+            kinds[col] = "numeric" if s.notna().any() else None
+        elif pd.api.types.is_datetime64_any_dtype(s):
+            kinds[col] = "datetime" if s.notna().any() else None
+        else:
+            inferred = pd.api.types.infer_dtype(s, skipna=True)
+            if inferred == "empty":
+                kinds[col] = None
+            elif inferred in _NUMERIC_SAMPLE_KINDS:
+                kinds[col] = "numeric"
+            elif inferred in _DATETIME_SAMPLE_KINDS:
+                kinds[col] = "datetime"
+            else:
+                kinds[col] = "text"
+    return kinds, None
+
+
+def _int_text(db_type, expr):
+    """Text form of an integral numeric expression."""
+    if db_type == "Oracle":
+        return f"TO_CHAR(CAST({expr} AS NUMBER(38)))"
+    if db_type == "MySQL":
+        return f"CAST(CAST({expr} AS SIGNED) AS CHAR)"
+    text_type = {"PostgreSQL": "TEXT", "Snowflake": "VARCHAR"}.get(db_type, "VARCHAR(20)")
+    return f"CAST(CAST({expr} AS BIGINT) AS {text_type})"
+
+
+def _hash_text(db_type, col, kind=None):
+    """
+    Text form of a column for hashing, '~' for NULL. Numeric and datetime columns get one form on every
+    database and column type, so INTEGER 1, DOUBLE 1.0 and NUMBER(10,2) 1.00 hash alike: numbers as
+    integer part '.' millionths (integer parts beyond BIGINT fail outside Oracle), timestamps and dates
+    as YYYY-MM-DD HH:MM:SS. Other columns are cast to the database's text type.
+    """
+    q = _quote_col(db_type, col)
+    if kind == "numeric":
+        frac = f"ROUND(({q} - FLOOR({q})) * 1000000{', 0' if db_type == 'SQL Server' else ''})"
+        whole, frac = _int_text(db_type, f"FLOOR({q})"), _int_text(db_type, frac)
+        if db_type == "SQL Server":
+            text = f"{whole} + '.' + {frac}"
+        elif db_type == "MySQL":
+            text = f"CONCAT({whole}, '.', {frac})"
+        else:
+            text = f"{whole} || '.' || {frac}"
+    elif kind == "datetime":
+        if db_type == "SQL Server":
+            text = f"CONVERT(VARCHAR(19), CAST({q} AS DATETIME2), 120)"
+        elif db_type == "MySQL":
+            text = f"DATE_FORMAT({q}, '%Y-%m-%d %H:%i:%s')"
+        else:
+            text = f"TO_CHAR({q}, 'YYYY-MM-DD HH24:MI:SS')"
+    elif db_type == "SQL Server":
+        text = f"CAST({q} AS VARCHAR(4000))"
+    elif db_type == "Oracle":
+        text = f"TO_CHAR({q})"
+    elif db_type == "MySQL":
+        text = f"CAST({q} AS CHAR)"
+    else:
+        text = f"CAST({q} AS {({'PostgreSQL': 'TEXT', 'Snowflake': 'VARCHAR'}).get(db_type, 'VARCHAR(4000)')})"
+    return f"CASE WHEN {q} IS NULL THEN '~' ELSE {text} END"
+
+
+def _row_hash_expr(db_type, columns, kinds=None):
+    """
+    MD5 (hex) of the text form of columns (see _hash_text; kinds maps columns to column_kinds values),
+    '|'-separated, for the given database type.
+    """
+    parts = [_hash_text(db_type, c, (kinds or {}).get(c)) for c in columns]
+    if db_type == "SQL Server":
+        joined = ", '|', ".join(parts) if len(parts) > 1 else f"{parts[0]}, ''"
+        return f"LOWER(CONVERT(VARCHAR(32), HASHBYTES('MD5', CONCAT({joined})), 2))"
+    if db_type == "Oracle":
+        joined = " || '|' || ".join(parts)
+        return f"LOWER(RAWTOHEX(STANDARD_HASH({joined}, 'MD5')))"
+    if db_type == "MySQL":
+        return f"MD5(CONCAT_WS('|', {', '.join(parts)}))"
+    joined = " || '|' || ".join(parts)
+    if db_type == "Netezza":
+        # hash()/rawtohex() come from the Netezza SQL Extensions Toolkit; algorithm 0 is MD5.
+        return f"LOWER(RAWTOHEX(HASH({joined}, 0)))"
+    return f"MD5({joined})"
+
+
+def fetch_row_hashes(conn, db_type, table_name, key_columns, hash_columns, kinds=None):
+    """
+    Fetch key columns plus an in-database MD5 of hash_columns as 'row_hash'. kinds (from column_kinds,
+    matched across both tables) puts numbers and timestamps in one text form before hashing.
+    Returns (DataFrame, error_msg).
+    """
+    if conn is None:
+        return None, "No connection"
+    if not key_columns or not hash_columns:
+        return None, "Key and hash columns are required"
+    try:
+        quoted = _quote_table(db_type, table_name)
+        key_list = ", ".join(_quote_col(db_type, c) for c in key_columns)
+        hash_alias = _quote_col(db_type, "row_hash")
+        q = f"SELECT {key_list}, {_row_hash_expr(db_type, hash_columns, kinds)} AS {hash_alias} FROM {quoted}"
+        df = read_query_chunked(conn, db_type, q)
+        return df, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _key_filter(db_type, key_columns, keys, binds, pad_to=None):
+    """
+    WHERE condition matching any of the key tuples, values added to binds. Keys containing NULLs are
+    skipped; returns None if none remain. The key list is padded (see sql_params.padded, at most
+    pad_to keys) so batches share a few statement texts.
+    """
+    key_quoted = [_quote_col(db_type, c) for c in key_columns]
+    rows = [key for key in keys if all(sql_literal(v) is not None for v in key)]
+    if not rows:
+        return None
+    rows = padded(rows, pad_to)
+    if len(key_quoted) == 1:
+        return f"{key_quoted[0]} IN ({', '.join(binds.add(r[0]) for r in rows)})"
+    return " OR ".join(
+        "(" + " AND ".join(f"{k} = {binds.add(v)}" for k, v in zip(key_quoted, r)) + ")" for r in rows
+    )
+
+
+def fetch_rows_by_keys(conn, db_type, table_name, columns, key_columns, keys, batch_size=KEY_BATCH_SIZE):
+    """
+    Fetch columns for rows whose key_columns match the given key tuples, in batches with the key
+    values bound. Returns (DataFrame, error_msg).
+    """
+    if conn is None:
+        return None, "No connection"
+    if not columns or not keys:
+        return pd.DataFrame(columns=columns), None
+    # SQL Server takes at most 2100 bind parameters per statement.
+    batch_size = max(min(batch_size, 2000 // max(len(key_columns), 1)), 1)
     try:
         quoted = _quote_table(db_type, table_name)
         col_list = ", ".join(_quote_col(db_type, c) for c in columns)
-        if limit is None:
-            q = f"SELECT {col_list} FROM {quoted}"
-        elif db_type == "SQL Server":
-            q = f"SELECT TOP {limit} {col_list} FROM {quoted}"
-        elif db_type == "Oracle":
-            q = f"SELECT {col_list} FROM {quoted} WHERE ROWNUM <= {limit}"
+        frames = []
+        for start in range(0, len(keys), batch_size):
+            binds = Binds()
+            where = _key_filter(db_type, key_columns, keys[start:start + batch_size], binds, pad_to=batch_size)
+            if where:
+                frames.append(run_query(conn, db_type, binds.statement(f"SELECT {col_list} FROM {quoted} WHERE {where}")))
+        if not frames:
+            return pd.DataFrame(columns=columns), None
+        return pd.concat(frames, ignore_index=True), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _hex8_to_int(db_type, hex_expr):
+    """Integer value (0 .. 2^32-1) of the first 8 hex digits of an MD5 hex string, for the given database type."""
+    h8 = f"SUBSTR({hex_expr}, 1, 8)"
+    if db_type == "SQL Server":
+        return f"CONVERT(BIGINT, CONVERT(VARBINARY(4), SUBSTRING({hex_expr}, 1, 8), 2))"
+    if db_type == "Oracle":
+        return f"TO_NUMBER({h8}, 'xxxxxxxx')"
+    if db_type == "MySQL":
+        return f"CAST(CONV(SUBSTRING({hex_expr}, 1, 8), 16, 10) AS UNSIGNED)"
+    if db_type == "PostgreSQL":
+        return f"('x' || {h8})::bit(32)::bigint"
+    if db_type == "Snowflake":
+        return f"TO_NUMBER({h8}, 'XXXXXXXX')"
+    # Netezza has no built-in hex-to-integer cast: sum the digit values.
+    digits = [f"(STRPOS('0123456789abcdef', SUBSTR({hex_expr}, {i + 1}, 1)) - 1) * {16 ** (7 - i)}" for i in range(8)]
+    return "(" + " + ".join(digits) + ")"
+
+
+def _range_literal(db_type, val):
+    """SQL literal for a range-bucket boundary (number or timestamp)."""
+    if isinstance(val, (datetime, date)):
+        ts = pd.Timestamp(val).strftime("%Y-%m-%d %H:%M:%S")
+        return f"'{ts.replace(' ', 'T')}'" if db_type == "SQL Server" else f"TIMESTAMP '{ts}'"
+    return sql_literal(val)
+
+
+def _mod(db_type, expr, n):
+    return f"(({expr}) % {n})" if db_type == "SQL Server" else f"MOD({expr}, {n})"
+
+
+def bucket_expr(db_type, key_columns, buckets, bounds=None, kinds=None):
+    """
+    Bucket number (0 .. buckets-1) of a row. Without bounds: each key column is reduced modulo buckets
+    (numeric columns by their absolute integer part, others by the MD5 of their hash text, see
+    _hash_text) and the parts are summed modulo buckets, so INTEGER 1 and DOUBLE 1.0 share a bucket.
+    kinds (from column_kinds) must agree on both sides for the databases to put a key in the same bucket.
+    With bounds (sorted cut points on the first key column, from key_range_bounds): range buckets
+    0 .. len(bounds).
+    """
+    if bounds is not None:
+        k = _quote_col(db_type, key_columns[0])
+        whens = " ".join(f"WHEN {k} < {_range_literal(db_type, b)} THEN {i}" for i, b in enumerate(bounds))
+        return f"CASE {whens} ELSE {len(bounds)} END" if bounds else "0"
+    n = int(buckets)
+    parts = []
+    for c in key_columns:
+        if (kinds or {}).get(c) == "numeric":
+            q = _quote_col(db_type, c)
+            whole = f"FLOOR({q})" if db_type == "Oracle" else f"CAST(FLOOR({q}) AS BIGINT)"
+            parts.append(_mod(db_type, f"COALESCE(ABS({whole}), 0)", n))
         else:
-            q = f"SELECT {col_list} FROM {quoted} LIMIT {limit}"
+            parts.append(_mod(db_type, _hex8_to_int(db_type, _row_hash_expr(db_type, [c], kinds)), n))
+    return parts[0] if len(parts) == 1 else _mod(db_type, " + ".join(parts), n)
+
+
+def key_range_bounds(conn, db_type, table_name, key_column, buckets):
+    """
+    buckets-1 evenly spaced cut points between MIN and MAX of a numeric or date key. Returns
+    (bounds, error_msg); fewer cut points come back when the key range is narrow.
+    """
+    try:
+        k = _quote_col(db_type, key_column)
+        df = pd.read_sql(f"SELECT MIN({k}) AS lo, MAX({k}) AS hi FROM {_quote_table(db_type, table_name)}", conn)
+        lo, hi = df.iat[0, 0], df.iat[0, 1]
+        if pd.isna(lo) or pd.isna(hi):
+            return [], None
+        if isinstance(lo, (datetime, date, np.datetime64)):
+            lo, hi = pd.Timestamp(lo), pd.Timestamp(hi)
+            step = (hi - lo) / buckets
+            return sorted({(lo + step * i).floor("s") for i in range(1, buckets)} - {lo}), None
+        if isinstance(lo, bool) or not isinstance(lo, (Number, Decimal)):
+            return None, f"Range buckets need a numeric or date key; {key_column} is {type(lo).__name__}"
+        lo, hi = float(lo), float(hi)
+        step = (hi - lo) / buckets
+        cuts = [lo + step * i for i in range(1, buckets)]
+        if isinstance(df.iat[0, 0], (int, np.integer)):
+            cuts = [int(np.ceil(c)) for c in cuts]
+        return sorted(set(c for c in cuts if lo < c <= hi)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def fetch_bucket_checksums(conn, db_type, table_name, key_columns, hash_columns, bucket_sql, kinds=None):
+    """
+    Per-bucket row count and checksum (sum of the first 32 bits of each row's MD5, hashed as in
+    fetch_row_hashes) computed in the database. bucket_sql comes from bucket_expr. Returns
+    (DataFrame bucket/row_count/checksum, error_msg).
+    """
+    if conn is None:
+        return None, "No connection"
+    try:
+        quoted = _quote_table(db_type, table_name)
+        checksum = _hex8_to_int(db_type, "dv_rh")
+        q = (
+            f"SELECT dv_bucket, COUNT(*) AS row_count, SUM({checksum}) AS checksum FROM (\n"
+            f"  SELECT {bucket_sql} AS dv_bucket, {_row_hash_expr(db_type, hash_columns, kinds)} AS dv_rh FROM {quoted}\n"
+            f") dv_q GROUP BY dv_bucket"
+        )
         df = pd.read_sql(q, conn)
+        df.columns = ["bucket", "row_count", "checksum"]
+        df["bucket"] = df["bucket"].astype("int64")
+        df["row_count"] = df["row_count"].astype("int64")
+        df["checksum"] = df["checksum"].map(lambda v: None if pd.isna(v) else int(v))
         return df, None
     except Exception as e:
         return None, str(e)
 
 
+def fetch_bucket_rows(conn, db_type, table_name, columns, bucket_sql, bucket):
+    """Fetch columns of the rows in one bucket. Returns (DataFrame, error_msg)."""
+    if conn is None:
+        return None, "No connection"
+    try:
+        col_list = ", ".join(_quote_col(db_type, c) for c in columns)
+        binds = Binds()
+        q = f"SELECT {col_list} FROM {_quote_table(db_type, table_name)} WHERE {bucket_sql} = {binds.add(int(bucket))}"
+        return read_query_chunked(conn, db_type, binds.statement(q)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def column_max(conn, db_type, table_name, column):
+    """MAX(column) of a table, or None for an empty table."""
+    k = _quote_col(db_type, column)
+    df = pd.read_sql(f"SELECT MAX({k}) AS hi FROM {_quote_table(db_type, table_name)}", conn)
+    v = df.iat[0, 0]
+    if pd.isna(v):
+        return None
+    return v.item() if isinstance(v, np.generic) and not isinstance(v, np.datetime64) else v
+
+
+def count_table_rows(conn, db_type, table_name):
+    """COUNT(*) of a table."""
+    df = pd.read_sql(f"SELECT COUNT(*) AS row_count FROM {_quote_table(db_type, table_name)}", conn)
+    return int(df.iat[0, 0])
+
+
+def fetch_keys_since(conn, db_type, table_name, key_columns, watermark_column, value):
+    """Distinct key tuples of rows whose watermark_column is greater than value. Returns (keys, error_msg)."""
+    if conn is None:
+        return None, "No connection"
+    try:
+        key_list = ", ".join(_quote_col(db_type, c) for c in key_columns)
+        binds = Binds()
+        q = (
+            f"SELECT DISTINCT {key_list} FROM {_quote_table(db_type, table_name)} "
+            f"WHERE {_quote_col(db_type, watermark_column)} > {binds.add(value)}"
+        )
+        df = read_query_chunked(conn, db_type, binds.statement(q))
+        return list(df.itertuples(index=False, name=None)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _length_fn(db_type):
+    return {"SQL Server": "LEN", "MySQL": "CHAR_LENGTH"}.get(db_type, "LENGTH")
+
+
+def _profile_kind(val):
+    """numeric / string / None (dates, booleans, all-NULL) from a column's MIN value."""
+    if val is None or isinstance(val, bool):
+        return None
+    try:
+        if pd.isna(val):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if isinstance(val, (Number, Decimal)):
+        return "numeric"
+    if isinstance(val, str):
+        return "string"
+    return None
+
+
+def _run_aggregates(conn, db_type, quoted_table, exprs):
+    """One SELECT of aggregate expressions; returns their values in order."""
+    select = ",\n  ".join(f"{e} AS a{i}" for i, e in enumerate(exprs))
+    df = pd.read_sql(f"SELECT\n  {select}\nFROM {quoted_table}", conn)
+    if df.empty:
+        return [None] * len(exprs)
+    vals = []
+    for col in range(df.shape[1]):
+        # Per column, not df.iloc[0], so one float aggregate does not turn every count into a float.
+        v = df.iat[0, col]
+        if isinstance(v, np.datetime64):
+            v = pd.Timestamp(v)
+        elif isinstance(v, np.generic):
+            v = v.item()
+        vals.append(None if pd.isna(v) else v)
+    return vals
+
+
+def profile_table(conn, db_type, table_name, columns, batch_size=200):
+    """
+    Aggregate profile of a table computed in the database: row count and, per column, non-NULL and
+    NULL counts, COUNT(DISTINCT), MIN and MAX; plus SUM for numeric columns and the summed text length
+    for string columns (column kinds come from MIN, so these run as a second query).
+    Returns ({"rows": n, "columns": {col: {stat: value}}}, error_msg).
+    """
+    if conn is None:
+        return None, "No connection"
+    try:
+        quoted = _quote_table(db_type, table_name)
+        rows = None
+        stats = {}
+        for i in range(0, len(columns), batch_size):
+            batch = columns[i:i + batch_size]
+            exprs = ["COUNT(*)"]
+            for c in batch:
+                qc = _quote_col(db_type, c)
+                exprs += [f"COUNT({qc})", f"COUNT(DISTINCT {qc})", f"MIN({qc})", f"MAX({qc})"]
+            vals = _run_aggregates(conn, db_type, quoted, exprs)
+            rows = int(vals[0] or 0)
+            for j, c in enumerate(batch):
+                non_null, distinct, lo, hi = vals[1 + 4 * j: 5 + 4 * j]
+                non_null = int(non_null or 0)
+                stats[c] = {"non_null": non_null, "nulls": rows - non_null, "distinct": int(distinct or 0), "min": lo, "max": hi}
+        extra = []
+        for c in columns:
+            kind = _profile_kind(stats[c]["min"])
+            qc = _quote_col(db_type, c)
+            if kind == "numeric":
+                # SQL Server SUM keeps the column type and overflows on large INT columns.
+                extra.append((c, "sum", f"SUM(CAST({qc} AS FLOAT))" if db_type == "SQL Server" else f"SUM({qc})"))
+            elif kind == "string":
+                extra.append((c, "length_sum", f"SUM({_length_fn(db_type)}({qc}))"))
+        for i in range(0, len(extra), batch_size * 4):
+            batch = extra[i:i + batch_size * 4]
+            vals = _run_aggregates(conn, db_type, quoted, [e for _, _, e in batch])
+            for (c, stat, _), v in zip(batch, vals):
+                stats[c][stat] = v
+        return {"rows": rows or 0, "columns": stats}, None
+    except Exception as e:
+        return None, str(e)
+
+
 def _connect_netezza(cfg):
     try:
         import nzpy
@@ -178,6 +1216,8 @@ def _connect_sqlserver(cfg):
 
 
 def _connect_postgresql(cfg):
+    if cfg.get("adbc"):
+        return _connect_postgresql_adbc(cfg)
     try:
         import psycopg2
     except ImportError:
@@ -193,6 +1233,21 @@ def _connect_postgresql(cfg):
     return conn, None
 
 
+def _connect_postgresql_adbc(cfg):
+    """ADBC connection: results arrive as Arrow record batches instead of row tuples (see iter_query)."""
+    try:
+        import adbc_driver_postgresql.dbapi
+    except ImportError:
+        return None, "Install the ADBC PostgreSQL driver: pip install adbc-driver-postgresql pyarrow"
+    uri = (
+        f"postgresql://{quote(str(cfg.get('username', '')), safe='')}:{quote(str(cfg.get('password', '')), safe='')}"
+        f"@{cfg.get('host')}:{int(cfg.get('port', 5432))}/{quote(str(cfg.get('database', '')), safe='')}"
+    )
+    if cfg.get("sslmode"):
+        uri += f"?sslmode={quote(str(cfg['sslmode']), safe='')}"
+    return adbc_driver_postgresql.dbapi.connect(uri), None
+
+
 def _connect_mysql(cfg):
     try:
         import pymysql
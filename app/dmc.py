@@ -1,42 +1,118 @@
 """
 DMC page - Data Copy Validation
 """
+import pandas as pd
 import streamlit as st
 
 
-def render():
-    """Render the DMC page content."""
+def render(history=None):
+    """Render the DMC page content. With a DmcHistoryStore, results are read from its stored runs."""
     if "dmc_excel_df" in st.session_state:
         st.subheader("Data Copy Validation")
         st.dataframe(st.session_state["dmc_excel_df"], use_container_width=True, hide_index=True)
+    if st.session_state.get("dmc_history_error"):
+        st.warning(st.session_state["dmc_history_error"])
 
-    if "dmc_final_df" in st.session_state:
-        final_df = st.session_state["dmc_final_df"]
-        if not final_df.empty and "Grouping" in final_df.columns:
-            st.markdown("---")
-            st.subheader("Final Results (by Grouping)")
-            display_cols = [c for c in ["tablename", "count"] if c in final_df.columns]
-            groupings = final_df["Grouping"].unique().tolist()
-            cols = st.columns(len(groupings) if groupings else 1)
-            for i, grouping in enumerate(groupings):
-                with cols[i]:
-                    st.markdown(f"**{grouping}**")
-                    grp = final_df[final_df["Grouping"] == grouping]
-                    out = grp[display_cols].copy()
-                    out.columns = ["Table Name", "Count"][:len(display_cols)]
-                    st.dataframe(out, use_container_width=True, hide_index=True)
-            _render_hop_results()
-        else:
-            _render_hop_results()
+    unrecorded = "dmc_results" in st.session_state and "dmc_run_id" not in st.session_state
+    runs = history.runs() if history is not None and not unrecorded else []
+    if runs:
+        _render_history(history, runs)
+    elif "dmc_final_df" in st.session_state:
+        _render_final(st.session_state["dmc_final_df"])
+        _render_hop_results(st.session_state["dmc_results"])
     elif "dmc_results" in st.session_state:
-        _render_hop_results()
+        _render_hop_results(st.session_state["dmc_results"])
 
 
-def _render_hop_results():
+def _run_label(run):
+    return f"#{run['run_id']} · {run['run_at'].replace('T', ' ')} · {run['label']} ({run['tables']} tables)"
+
+
+def _render_history(history, runs):
+    """A stored run (this session's latest by default) with its changes vs earlier runs and across hops."""
+    by_id = {r["run_id"]: r for r in runs}
+    latest = st.session_state.get("dmc_run_id")
+    if latest is not None and st.session_state.get("dmc_history_shown") != latest:
+        st.session_state["dmc_history_shown"] = latest
+        st.session_state["dmc_history_run"] = latest
+    if st.session_state.get("dmc_history_run") not in by_id:
+        st.session_state["dmc_history_run"] = runs[0]["run_id"]
+    st.markdown("---")
+    run_id = st.selectbox("Run", list(by_id), key="dmc_history_run", format_func=lambda i: _run_label(by_id[i]))
+
+    counts = history.run_counts(run_id)
+    final_df = counts.drop(columns=["Hop"] + ([] if counts["estimated"].any() else ["estimated"]))
+    _render_final(final_df)
+    _render_delta_vs_previous(history, run_id, [r for r in runs if r["run_id"] < run_id])
+    _render_delta_across_hops(history, run_id)
+    _render_hop_results(history.hop_results(run_id))
+
+
+def _render_final(final_df):
+    """Counts side by side per Grouping."""
+    if final_df.empty or "Grouping" not in final_df.columns:
+        return
+    st.markdown("---")
+    st.subheader("Final Results (by Grouping)")
+    display_cols = [c for c in ["tablename", "count", "estimated"] if c in final_df.columns]
+    groupings = final_df["Grouping"].unique().tolist()
+    cols = st.columns(len(groupings) if groupings else 1)
+    for i, grouping in enumerate(groupings):
+        with cols[i]:
+            st.markdown(f"**{grouping}**")
+            grp = final_df[final_df["Grouping"] == grouping]
+            out = grp[display_cols].copy()
+            out.columns = ["Table Name", "Count", "Estimated"][:len(display_cols)]
+            st.dataframe(out, use_container_width=True, hide_index=True)
+
+
+def _render_delta_vs_previous(history, run_id, earlier_runs):
+    """Count changes of every table since its previous run, or since a chosen earlier run."""
+    st.markdown("---")
+    st.subheader("Change vs Previous Run")
+    if not earlier_runs:
+        st.info("No earlier run to compare with.")
+        return
+    options = [None] + [r["run_id"] for r in earlier_runs]
+    labels = {r["run_id"]: _run_label(r) for r in earlier_runs}
+    base = st.selectbox(
+        "Compare with", options, key="dmc_history_base",
+        format_func=lambda i: "Previous run of each table" if i is None else labels[i],
+    )
+    delta = history.delta_vs_previous(run_id, base)
+    changed = delta[delta["delta"].fillna(0) != 0]
+    new = delta[delta["previous_count"].isna()]
+    st.caption(f"{len(changed)} of {len(delta)} tables changed, {len(new)} not counted before.")
+    only_changed = st.toggle("Only changed tables", value=True, key="dmc_history_only_changed")
+    out = delta[(delta["delta"].fillna(0) != 0) | delta["previous_count"].isna()] if only_changed else delta
+    out = out.drop(columns=[] if out["estimated"].any() else ["estimated"])
+    st.dataframe(out, use_container_width=True, hide_index=True)
+
+
+def _render_delta_across_hops(history, run_id):
+    """Each Grouping's total count per hop side by side, with its tables per hop on selection."""
+    across = history.delta_across_hops(run_id)
+    if across.empty:
+        return
+    st.markdown("---")
+    st.subheader("Across Hops (by Grouping)")
+    mismatched = across[~across["match"]]
+    st.caption(f"{len(mismatched)} of {len(across)} groupings differ between hops.")
+    only_mismatched = st.toggle("Only groupings that differ", value=True, key="dmc_history_only_mismatched")
+    st.dataframe(mismatched if only_mismatched else across, use_container_width=True, hide_index=True)
+    grouping = st.selectbox("Tables of grouping", across["Grouping"].tolist(), key="dmc_history_grouping")
+    counts = history.run_counts(run_id)
+    detail = counts[counts["Grouping"] == grouping].drop(columns=["Grouping"])
+    st.dataframe(
+        detail.drop(columns=[] if detail["estimated"].any() else ["estimated"]),
+        use_container_width=True, hide_index=True,
+    )
+
+
+def _render_hop_results(results):
     """Display results by Hop Name, side by side."""
     st.markdown("---")
     st.subheader("Query Results (by Hop Name)")
-    results = st.session_state["dmc_results"]
     hop_names = list(results.keys())
     if not hop_names:
         return
@@ -47,6 +123,12 @@ def _render_hop_results():
             st.markdown(f"**{hop_name}**")
             st.markdown("*SQL*")
             st.code(r.get("sql", ""), language="sql")
+            if r.get("table_errors"):
+                st.warning(f"{len(r['table_errors'])} table(s) could not be counted")
+                st.dataframe(
+                    pd.DataFrame(list(r["table_errors"].items()), columns=["Table", "Error"]),
+                    use_container_width=True, hide_index=True,
+                )
             if r.get("error"):
                 st.error(r["error"])
             elif r.get("df") is not None:
@@ -0,0 +1,186 @@
+"""
+DMC history - keeps the row counts of every DMC run in a local SQLite file, so counts can be compared
+with earlier runs and across hops without querying the databases again.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at TEXT NOT NULL,
+    label TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hops (
+    run_id INTEGER NOT NULL,
+    hop TEXT NOT NULL,
+    sql TEXT NOT NULL,
+    error TEXT,
+    table_errors TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (run_id, hop)
+);
+CREATE TABLE IF NOT EXISTS counts (
+    run_id INTEGER NOT NULL,
+    hop TEXT NOT NULL,
+    grouping_name TEXT NOT NULL,
+    tablename TEXT NOT NULL,
+    row_count INTEGER,
+    estimated INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, hop, grouping_name, tablename)
+);
+CREATE INDEX IF NOT EXISTS counts_by_table ON counts (hop, grouping_name, tablename, run_id);
+"""
+_COUNT_COLUMNS = ["Hop", "Grouping", "tablename", "count", "estimated"]
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class DmcHistoryStore:
+    """
+    SQLite file of DMC runs: per run the hops' SQL and errors and one row count per (hop, grouping, table).
+    Lookups by run and by (hop, grouping, table) across runs are indexed. Safe to share across threads and sessions.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _all(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _frame(self, sql, params, columns):
+        return pd.DataFrame(self._all(sql, params), columns=columns)
+
+    def record_run(self, results, label=""):
+        """Store run_hops results ({hop: {"sql", "df", "error", "table_errors"}}) as a new run. Returns its run_id."""
+        rows = []
+        for hop, r in results.items():
+            df = r.get("df")
+            if df is None or df.empty or "count" not in df.columns:
+                continue
+            estimated = df["estimated"] if "estimated" in df.columns else pd.Series(False, index=df.index)
+            for grouping, table, n, est in zip(df.get("Grouping", pd.Series("Other", index=df.index)), df["tablename"], df["count"], estimated):
+                rows.append((hop, str(grouping), str(table).strip(), None if pd.isna(n) else int(n), int(bool(est))))
+        with self._lock:
+            cur = self._conn.execute("INSERT INTO runs (run_at, label) VALUES (?, ?)", (_now(), label))
+            run_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO hops VALUES (?, ?, ?, ?, ?)",
+                [(run_id, hop, r.get("sql", ""), r.get("error"), json.dumps(r.get("table_errors") or {})) for hop, r in results.items()],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO counts VALUES (?, ?, ?, ?, ?, ?)", [(run_id, *row) for row in rows],
+            )
+            self._conn.commit()
+        return run_id
+
+    def runs(self, limit=50):
+        """Latest runs first: dicts with run_id, run_at, label, hops, tables."""
+        rows = self._all(
+            "SELECT r.run_id, r.run_at, r.label, (SELECT COUNT(*) FROM hops h WHERE h.run_id = r.run_id), "
+            "(SELECT COUNT(*) FROM counts c WHERE c.run_id = r.run_id) FROM runs r ORDER BY r.run_id DESC LIMIT ?",
+            (limit,),
+        )
+        return [dict(zip(("run_id", "run_at", "label", "hops", "tables"), r)) for r in rows]
+
+    def run_counts(self, run_id):
+        """Hop / Grouping / tablename / count / estimated rows of one run, in the order they were stored."""
+        df = self._frame(
+            "SELECT hop, grouping_name, tablename, row_count, estimated FROM counts WHERE run_id = ? ORDER BY rowid",
+            (run_id,), _COUNT_COLUMNS,
+        )
+        df["estimated"] = df["estimated"].astype(bool)
+        return df
+
+    def hop_results(self, run_id):
+        """A stored run in the run_hops result shape: {hop: {"sql", "df", "error", "table_errors"}}."""
+        counts = self.run_counts(run_id)
+        results = {}
+        for hop, sql, error, table_errors in self._all(
+            "SELECT hop, sql, error, table_errors FROM hops WHERE run_id = ? ORDER BY rowid", (run_id,),
+        ):
+            part = counts[counts["Hop"] == hop].drop(columns=["Hop"]).reset_index(drop=True)
+            if not part["estimated"].any():
+                part = part.drop(columns=["estimated"])
+            results[hop] = {"sql": sql, "df": None if error else part, "error": error, "table_errors": json.loads(table_errors)}
+        return results
+
+    def delta_vs_previous(self, run_id, base_run_id=None):
+        """
+        Counts of a run next to each table's count in the latest earlier run that counted it under the
+        same hop and grouping (or in base_run_id). Adds previous_count, previous_run_at, delta and
+        pct_change; new tables have no previous count.
+        """
+        if base_run_id is None:
+            prev = (
+                "p.run_id = (SELECT MAX(q.run_id) FROM counts q WHERE q.hop = c.hop AND q.grouping_name = c.grouping_name "
+                "AND q.tablename = c.tablename AND q.run_id < c.run_id AND q.row_count IS NOT NULL)"
+            )
+            params = (run_id,)
+        else:
+            prev, params = "p.run_id = ?", (base_run_id, run_id)
+        df = self._frame(
+            "SELECT c.hop, c.grouping_name, c.tablename, c.row_count, c.estimated, p.row_count, r.run_at "
+            "FROM counts c LEFT JOIN counts p ON p.hop = c.hop AND p.grouping_name = c.grouping_name "
+            f"AND p.tablename = c.tablename AND {prev} "
+            "LEFT JOIN runs r ON r.run_id = p.run_id WHERE c.run_id = ? ORDER BY c.rowid",
+            params, _COUNT_COLUMNS + ["previous_count", "previous_run_at"],
+        )
+        df["estimated"] = df["estimated"].astype(bool)
+        df["delta"] = df["count"] - df["previous_count"]
+        df["pct_change"] = (df["delta"] / df["previous_count"].where(df["previous_count"] != 0) * 100).round(2)
+        return df
+
+    def delta_across_hops(self, run_id):
+        """
+        One row per Grouping listed in at least two hops of a run, with each hop's total over the
+        grouping's tables as a column, spread (max - min) and match (all hops agree). Table names differ
+        from hop to hop, so only Grouping links them. A hop with an uncounted table has no total, and
+        the grouping then has no spread and does not match. run_counts gives the per-table detail.
+        """
+        counts = self.run_counts(run_id)
+        hops = list(dict.fromkeys(counts["Hop"]))
+        by_hop = counts.groupby(["Grouping", "Hop"], sort=False)["count"]
+        totals = by_hop.sum().where(by_hop.count() == by_hop.size())
+        listed = totals.groupby(level="Grouping", sort=False).size()  # hops listing each grouping
+        wide = totals.unstack("Hop").reindex(index=listed.index, columns=hops)
+        wide = wide[listed >= 2]
+        complete = wide.notna().sum(axis=1) == listed[listed >= 2]
+        out = wide.reset_index()
+        out.columns.name = None
+        out["spread"] = (wide.max(axis=1) - wide.min(axis=1)).where(complete).to_numpy()
+        out["match"] = out["spread"] == 0
+        return out
+
+    def purge(self, keep_days=90):
+        """Delete runs older than keep_days."""
+        cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat(timespec="seconds")
+        with self._lock:
+            for table in ("counts", "hops"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_id IN (SELECT run_id FROM runs WHERE run_at < ?)", (cutoff,))
+            self._conn.execute("DELETE FROM runs WHERE run_at < ?", (cutoff,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def store_from_config(config, base_dir):
+    """DmcHistoryStore from a config "dmc" section ({"history_path", "keep_days"}); runs past keep_days are purged on open."""
+    cfg = (config or {}).get("dmc", {})
+    store = DmcHistoryStore(Path(base_dir) / os.path.expanduser(cfg.get("history_path", "dmc_history.db")))
+    store.purge(cfg.get("keep_days", 90))
+    return store
@@ -0,0 +1,354 @@
+"""
+DMC hop execution - runs each hop's count query on its own database, concurrently.
+"""
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from db_connector import cancel_query, fetch_catalog_row_counts, read_query_chunked
+from sql_params import Binds
+
+
+def _get_dmc_config_key(db_type):
+    """Map database type to config key for db_connector."""
+    m = {"Netezza": "netezza", "Snowflake": "snowflake", "SQL Server": "sql_server",
+         "PostgreSQL": "postgresql", "MySQL": "mysql", "Oracle": "oracle"}
+    return m.get(db_type, db_type.lower().replace(" ", "_"))
+
+
+def _find_dmc_col(df, patterns):
+    """Find column matching any of the patterns (case-insensitive)."""
+    cols_lower = {str(c).strip().lower(): c for c in df.columns}
+    for p in patterns:
+        pk = p.lower().replace(" ", "_")
+        if pk in cols_lower:
+            return cols_lower[pk]
+        for c in df.columns:
+            if pk in str(c).lower().replace(" ", "_"):
+                return c
+    return None
+
+
+_TRUE_FLAGS = ("y", "yes", "true", "1", "x")
+
+
+def dmc_tables(df):
+    """
+    Parse the DMC workbook into the tables of each hop.
+    Returns ({hop: [{"schema", "table", "filter", "exact"}]}, table_to_grouping {(hop, table): grouping},
+    error_msg). filter is (column, value) from Filter Col 1 / Filter Col 1 Val (or None), the value a
+    number where it parses as one; exact is set by an optional "Exact Count" column (Y/Yes/True/1/X).
+    """
+    hop_col = _find_dmc_col(df, ["Hop Name", "HopName", "Hop"])
+    tbl_col = _find_dmc_col(df, ["Table Name", "TableName", "Table"])
+    schema_col = _find_dmc_col(df, ["Schema Name", "SchemaName", "Schema"])
+    filter_col = _find_dmc_col(df, ["Filter Col 1", "Filter Col1", "Filter_Col_1"])
+    filter_val_col = _find_dmc_col(df, ["Filter Col 1 Val", "Filter Col1 Val", "Filter_Col_1_Val"])
+    group_col = _find_dmc_col(df, ["Grouping", "Group", "Category", "Group Name", "GroupName"])
+    exact_col = _find_dmc_col(df, ["Exact Count", "ExactCount", "Exact_Count"])
+    if not all([hop_col, tbl_col, schema_col]):
+        return {}, {}, "Excel must have columns: Hop Name, Table Name, Schema Name"
+
+    def _filter_val(val):
+        """Filter value to bind: numeric text as a number, else the stripped text."""
+        if pd.isna(val) or val == "":
+            return None
+        s = str(val).strip()
+        try:
+            f = float(s)
+        except (ValueError, TypeError):
+            return s
+        if not math.isfinite(f):
+            return s
+        return int(s) if s.lstrip("+-").isdigit() else f
+
+    tables = {}
+    table_to_grouping = {}
+    for hop_name, grp in df.groupby(hop_col):
+        hop_val = str(hop_name).strip() if pd.notna(hop_name) else "Unknown"
+        entries = []
+        for _, row in grp.iterrows():
+            schema = str(row[schema_col]).strip() if pd.notna(row[schema_col]) else ""
+            table = str(row[tbl_col]).strip() if pd.notna(row[tbl_col]) else ""
+            if group_col:
+                grouping = str(row[group_col]).strip() if pd.notna(row[group_col]) else ""
+                if table and grouping:
+                    table_to_grouping[(hop_val, table)] = grouping
+            if schema and table:
+                where = None
+                if filter_col and filter_val_col:
+                    fcol = str(row[filter_col]).strip() if pd.notna(row[filter_col]) else ""
+                    fval = _filter_val(row[filter_val_col])
+                    if fcol and fval is not None:
+                        where = (fcol, fval)
+                exact = bool(exact_col) and pd.notna(row[exact_col]) and str(row[exact_col]).strip().lower() in _TRUE_FLAGS
+                entries.append({"schema": schema, "table": table, "filter": where, "exact": exact})
+        if entries:
+            tables[hop_val] = entries
+    return tables, table_to_grouping, None
+
+
+def _count_sql(entries):
+    """UNION ALL of one COUNT(*) per table entry, as a Statement with the filter values bound."""
+    binds = Binds()
+    parts = []
+    for e in entries:
+        base = f"SELECT '{e['table']}' AS tablename, COUNT(*) FROM \"{e['schema']}\".\"{e['table']}\""
+        if e["filter"]:
+            base += f' WHERE "{e["filter"][0]}" = {binds.add(e["filter"][1])}'
+        parts.append(base)
+    return binds.statement("\nUNION ALL\n".join(parts))
+
+
+def build_dmc_queries(df):
+    """
+    Build one UNION ALL count query per Hop Name from the DMC workbook.
+    Returns (queries {hop: sql}, table_to_grouping {(hop, table): grouping}, error_msg).
+    """
+    tables, table_to_grouping, err = dmc_tables(df)
+    if err:
+        return {}, {}, err
+    return {hop: str(_count_sql(entries)) for hop, entries in tables.items()}, table_to_grouping, None
+
+
+def _shape_hop_df(qdf, hop_name, table_to_grouping):
+    """Rename hop query output to Grouping / tablename / count."""
+    if qdf is None or qdf.empty:
+        return qdf
+    tbl_col_name = next((c for c in qdf.columns if "table" in str(c).lower()), qdf.columns[0])
+    cnt_col_name = next((c for c in qdf.columns if c != tbl_col_name), qdf.columns[1] if len(qdf.columns) > 1 else None)
+    qdf = qdf.copy()
+    qdf = qdf.rename(columns={tbl_col_name: "tablename"})
+    if cnt_col_name and cnt_col_name in qdf.columns:
+        qdf = qdf.rename(columns={cnt_col_name: "count"})
+    elif len(qdf.columns) >= 2:
+        qdf = qdf.rename(columns={qdf.columns[1]: "count"})
+    qdf["Grouping"] = qdf["tablename"].apply(lambda t: table_to_grouping.get((hop_name, str(t).strip()), "Other"))
+    cols = ["Grouping", "tablename"] + (["count"] if "count" in qdf.columns else [])
+    return qdf[[c for c in cols if c in qdf.columns]]
+
+
+def _in_table_order(df, entries):
+    """Rows of df ordered like the workbook entries."""
+    order = {}
+    for i, e in enumerate(entries):
+        order.setdefault(e["table"], i)
+    return df.iloc[df["tablename"].map(lambda t: order.get(str(t).strip(), len(order))).argsort(kind="stable")].reset_index(drop=True)
+
+
+def _catalog_counts(conn, db_type, entries, max_age_days):
+    """
+    Row counts of a hop's tables from catalog statistics where possible. Tables with a filter, an Exact
+    Count flag, or missing or stale statistics are left for COUNT(*). Returns (catalog df [tablename,
+    count, estimated], entries still to count, SQL comment line).
+    """
+    candidates = [(e["schema"], e["table"]) for e in entries if not e["filter"] and not e["exact"]]
+    stats, err = fetch_catalog_row_counts(conn, db_type, candidates, max_age_days) if candidates else ({}, None)
+    from_catalog = [e for e in entries if not e["filter"] and not e["exact"] and (e["schema"], e["table"]) in stats]
+    note = f"-- {len(from_catalog)} of {len(entries)} tables counted from catalog statistics"
+    if err:
+        note += f" (catalog query failed: {err})"
+    df = pd.DataFrame({
+        "tablename": [e["table"] for e in from_catalog],
+        "count": [stats[(e["schema"], e["table"])][0] for e in from_catalog],
+        "estimated": [stats[(e["schema"], e["table"])][1] for e in from_catalog],
+    })
+    return df, [e for e in entries if e not in from_catalog], note
+
+
+def _run_statement(pool, db_type, conn_cfg, sql, handle):
+    """
+    Run one count statement on a pooled connection, registered in handle["statements"] so it can be
+    cancelled. Returns (df, error_msg, retryable); connection errors are not retryable.
+    """
+    if handle.get("timed_out"):
+        return None, "Cancelled.", False
+    conn, err = pool.acquire(db_type, conn_cfg)
+    if err:
+        return None, err, False
+    stmt = {"conn": conn}
+    handle["statements"][id(stmt)] = stmt
+    handle.setdefault("started", time.monotonic())
+    failed = False
+    try:
+        return read_query_chunked(conn, db_type, sql, on_cursor=lambda cur: stmt.__setitem__("cursor", cur)), None, True
+    except Exception as e:
+        failed = True
+        return None, str(e), True
+    finally:
+        handle["statements"].pop(id(stmt), None)
+        if failed and not handle.get("timed_out"):
+            try:
+                conn.rollback()  # PostgreSQL aborts the transaction on error
+            except Exception:
+                pass
+        # A timed-out hop's connection may still be mid-statement; do not hand it back out.
+        pool.release(conn, discard=handle.get("timed_out", False))
+
+
+def _cancel_statements(handle):
+    """Mark a hop as stopped and cancel its running statements."""
+    handle["timed_out"] = True
+    for stmt in list(handle["statements"].values()):
+        cancel_query(stmt.get("conn"), stmt.get("cursor"))
+
+
+def _count_batches(pool, db_type, conn_cfg, batches, parallel_batches, handle):
+    """
+    COUNT(*) every batch of table entries, up to parallel_batches statements at once. A batch that
+    fails is split in half and both halves retried, so a bad table ends up failing on its own.
+    Returns (raw count frames, {"schema.table": error_msg}).
+    """
+    frames, table_errors = [], {}
+    executor = ThreadPoolExecutor(max_workers=max(min(parallel_batches, len(batches)), 1))
+    try:
+        futures = {executor.submit(_run_statement, pool, db_type, conn_cfg, _count_sql(b), handle): b for b in batches}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = futures.pop(future)
+                qdf, err, retryable = future.result()
+                if err is None:
+                    if qdf is not None:
+                        frames.append(qdf)
+                elif retryable and len(batch) > 1 and not handle.get("timed_out"):
+                    mid = len(batch) // 2
+                    for half in (batch[:mid], batch[mid:]):
+                        futures[executor.submit(_run_statement, pool, db_type, conn_cfg, _count_sql(half), handle)] = half
+                else:
+                    for e in batch:
+                        table_errors[f"{e['schema']}.{e['table']}"] = err
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return frames, table_errors
+
+
+def _run_hop(
+    pool, hop_name, sql, cfg, table_to_grouping, handle, entries=None, batch_size=None, parallel_batches=1,
+    fast_counts=False, max_stats_age_days=None,
+):
+    """
+    Run one hop's counts on pooled connections. Without entries the hop's single UNION ALL sql is run;
+    with entries (from dmc_tables) they are counted batch_size tables per statement, parallel_batches
+    statements at a time, optionally taking catalog statistics first (fast_counts). handle tracks the
+    running statements for cancellation. The result's table_errors lists tables whose count failed.
+    """
+    db_type = cfg.get("database_type", "Netezza")
+    conn_cfg = {"databases": {_get_dmc_config_key(db_type): cfg}}
+    if entries is None:
+        qdf, err, _ = _run_statement(pool, db_type, conn_cfg, sql, handle)
+        if err:
+            return {"sql": sql, "df": None, "error": err}
+        return {"sql": sql, "df": _shape_hop_df(qdf, hop_name, table_to_grouping), "error": None}
+
+    notes, frames, exact = [], [], entries
+    if fast_counts:
+        conn, err = pool.acquire(db_type, conn_cfg)
+        if err:
+            return {"sql": sql, "df": None, "error": err}
+        try:
+            catalog_df, exact, note = _catalog_counts(conn, db_type, entries, max_stats_age_days)
+        finally:
+            pool.release(conn)
+        notes.append(note)
+        if not catalog_df.empty:
+            frames.append(catalog_df)
+    size = max(int(batch_size or len(exact) or 1), 1)
+    batches = [exact[i:i + size] for i in range(0, len(exact), size)]
+    if len(batches) > 1:
+        notes.append(f"-- {len(exact)} tables in {len(batches)} statements of up to {size} tables")
+    sql = "\n".join(notes + [";\n\n".join(str(_count_sql(b)) for b in batches)]).strip()
+
+    counted, table_errors = _count_batches(pool, db_type, conn_cfg, batches, parallel_batches, handle) if batches else ([], {})
+    if counted:
+        qdf = _shape_hop_df(pd.concat(counted, ignore_index=True), hop_name, table_to_grouping).drop(columns=["Grouping"])
+        frames.append(qdf.assign(estimated=False) if fast_counts else qdf)
+    if not frames:
+        return {"sql": sql, "df": None, "error": "; ".join(sorted(set(table_errors.values()))) or "No data returned.",
+                "table_errors": table_errors}
+    df = _in_table_order(pd.concat(frames, ignore_index=True), entries)
+    df["Grouping"] = df["tablename"].apply(lambda t: table_to_grouping.get((hop_name, str(t).strip()), "Other"))
+    cols = ["Grouping", "tablename", "count"] + (["estimated"] if fast_counts else [])
+    return {"sql": sql, "df": df[cols], "error": None, "table_errors": table_errors}
+
+
+def run_hops(
+    pool, queries, hop_config, table_to_grouping, default_timeout=600, max_workers=8, on_result=None, cancelled=None,
+    tables=None, fast_counts=False, max_stats_age_days=None, batch_size=None, parallel_batches=4,
+):
+    """
+    Run every hop's counts concurrently, each on its own database. A hop's timeout is its config
+    'timeout_seconds' (else default_timeout), counted from when its first statement starts; on timeout
+    its statements are cancelled where the driver allows and the hop is reported as timed out.
+    on_result(hop_name, result) is called as each hop finishes. When cancelled() turns true, running
+    statements are cancelled and unfinished hops are reported as cancelled.
+
+    With tables (from dmc_tables) a hop's tables are counted batch_size per statement (config
+    'batch_size' overrides), up to parallel_batches statements at once (config 'parallel_batches');
+    failed batches are split and retried so errors land on single tables (result 'table_errors').
+    With fast_counts, counts come from catalog statistics where they are usable and results carry an
+    estimated column. Without tables each hop runs its query as is. Returns {hop_name: result} in
+    query order.
+    """
+    results = {}
+    runnable = {}
+    for hop_name, sql in queries.items():
+        cfg = hop_config.get(hop_name)
+        if not cfg:
+            results[hop_name] = {"sql": sql, "df": None, "error": f"No database config for '{hop_name}'"}
+            if on_result:
+                on_result(hop_name, results[hop_name])
+        else:
+            runnable[hop_name] = (sql, cfg)
+    if runnable:
+        executor = ThreadPoolExecutor(max_workers=max(min(max_workers, len(runnable)), 1))
+        handles = {hop_name: {"statements": {}} for hop_name in runnable}
+        futures = {}
+        for hop_name, (sql, cfg) in runnable.items():
+            entries = tables.get(hop_name) if tables else None
+            futures[executor.submit(
+                _run_hop, pool, hop_name, sql, cfg, table_to_grouping, handles[hop_name], entries,
+                cfg.get("batch_size", batch_size), int(cfg.get("parallel_batches", parallel_batches)),
+                fast_counts and entries is not None, max_stats_age_days,
+            )] = hop_name
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    hop_name = futures[future]
+                    if hop_name in results:
+                        continue
+                    try:
+                        results[hop_name] = future.result()
+                    except Exception as e:
+                        results[hop_name] = {"sql": runnable[hop_name][0], "df": None, "error": str(e)}
+                    if on_result:
+                        on_result(hop_name, results[hop_name])
+                now = time.monotonic()
+                stop = cancelled is not None and cancelled()
+                for future in list(pending):
+                    hop_name = futures[future]
+                    handle = handles[hop_name]
+                    if stop:
+                        _cancel_statements(handle)
+                        pending.discard(future)
+                        results[hop_name] = {"sql": runnable[hop_name][0], "df": None, "error": "Cancelled."}
+                        if on_result:
+                            on_result(hop_name, results[hop_name])
+                        continue
+                    timeout = float(runnable[hop_name][1].get("timeout_seconds", default_timeout))
+                    if "started" in handle and now - handle["started"] > timeout:
+                        _cancel_statements(handle)
+                        pending.discard(future)
+                        results[hop_name] = {
+                            "sql": runnable[hop_name][0], "df": None,
+                            "error": f"Timed out after {timeout:g}s; query cancelled.",
+                        }
+                        if on_result:
+                            on_result(hop_name, results[hop_name])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return {hop_name: results[hop_name] for hop_name in queries}
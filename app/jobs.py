@@ -0,0 +1,177 @@
+"""
+Background jobs - runs Recon, DMC and Orchestrator work on a shared thread pool, tracks status and progress
+in a local SQLite file and keeps finished results on disk, so a run survives reruns and browser refreshes.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+"""
+_COLUMNS = ("job_id", "kind", "label", "status", "progress", "message", "error", "created_at", "started_at", "finished_at")
+
+ACTIVE = ("queued", "running")
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function once its job has been cancelled."""
+
+
+class Job:
+    """Handle passed to a job function: report progress and check for cancellation."""
+
+    def __init__(self, runner, job_id, cancel_event):
+        self.job_id = job_id
+        self._runner = runner
+        self._cancel = cancel_event
+
+    def progress(self, fraction, message=""):
+        self._runner._update(self.job_id, progress=max(0.0, min(float(fraction), 1.0)), message=str(message))
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+
+class JobRunner:
+    """
+    Queue of background jobs shared by all sessions. submit(kind, label, fn) runs fn(job) on the pool
+    and pickles its return value to results_dir; status, progress and errors live in a SQLite table.
+    Cancellation is cooperative: fn checks job.cancelled between units of work. Jobs still queued or
+    running when the process stopped are marked interrupted on the next start.
+    """
+
+    def __init__(self, path, results_dir, max_workers=4, keep_days=7):
+        self.path = str(path)
+        self.results_dir = Path(results_dir)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(max_workers=max(int(max_workers), 1), thread_name_prefix="dataveritas-job")
+        self._cancel = {}
+        self._execute(
+            "UPDATE jobs SET status = 'interrupted', finished_at = ?, error = 'The app stopped before the job finished.' "
+            "WHERE status IN ('queued', 'running')",
+            (_now(),),
+        )
+        self.purge(keep_days)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _all(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _update(self, job_id, **fields):
+        sets = ", ".join(f"{k} = ?" for k in fields)
+        self._execute(f"UPDATE jobs SET {sets} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def _result_path(self, job_id):
+        return self.results_dir / f"{job_id}.pkl"
+
+    def submit(self, kind, label, fn):
+        """Queue fn(job) and return the new job id."""
+        job_id = uuid.uuid4().hex[:12]
+        event = threading.Event()
+        self._cancel[job_id] = event
+        self._execute(
+            "INSERT INTO jobs (job_id, kind, label, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+            (job_id, kind, label, _now()),
+        )
+        self._executor.submit(self._run, job_id, fn, event)
+        return job_id
+
+    def _run(self, job_id, fn, event):
+        try:
+            if event.is_set():
+                raise JobCancelled()
+            self._update(job_id, status="running", started_at=_now())
+            result = fn(Job(self, job_id, event))
+            if event.is_set():
+                raise JobCancelled()
+            tmp = self._result_path(job_id).with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._result_path(job_id))
+            self._update(job_id, status="done", progress=1.0, finished_at=_now())
+        except JobCancelled:
+            self._update(job_id, status="cancelled", message="Cancelled", finished_at=_now())
+        except Exception as ex:
+            self._update(job_id, status="failed", error=str(ex), finished_at=_now())
+        finally:
+            self._cancel.pop(job_id, None)
+
+    def cancel(self, job_id):
+        """Ask a queued or running job to stop. Returns False if it is not active in this process."""
+        event = self._cancel.get(job_id)
+        if event is None:
+            return False
+        event.set()
+        self._update(job_id, message="Cancelling...")
+        return True
+
+    def get(self, job_id):
+        """Job row as a dict, or None."""
+        rows = self._all(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,))
+        return dict(zip(_COLUMNS, rows[0])) if rows else None
+
+    def recent(self, kind=None, limit=20):
+        """Latest jobs first, optionally of one kind."""
+        where, params = ("WHERE kind = ? ", (kind,)) if kind else ("", ())
+        rows = self._all(f"SELECT {', '.join(_COLUMNS)} FROM jobs {where}ORDER BY created_at DESC, rowid DESC LIMIT ?", (*params, limit))
+        return [dict(zip(_COLUMNS, r)) for r in rows]
+
+    def result(self, job_id):
+        """Return value of a finished job, or None if it has none on disk."""
+        path = self._result_path(job_id)
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def purge(self, keep_days=7):
+        """Delete jobs (and their results) that finished more than keep_days ago."""
+        cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat(timespec="seconds")
+        old = self._all("SELECT job_id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,))
+        for (job_id,) in old:
+            self._result_path(job_id).unlink(missing_ok=True)
+        self._execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,))
+
+
+def runner_from_config(config, base_dir):
+    """JobRunner from a config "jobs" section ({"path", "results_dir", "max_workers", "keep_days"}); relative paths are under base_dir."""
+    cfg = (config or {}).get("jobs", {})
+    base = Path(base_dir)
+    path = base / os.path.expanduser(cfg.get("path", "jobs.db"))
+    results_dir = base / os.path.expanduser(cfg.get("results_dir", "job_results"))
+    return JobRunner(path, results_dir, max_workers=cfg.get("max_workers", 4), keep_days=cfg.get("keep_days", 7))
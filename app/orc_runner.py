@@ -0,0 +1,235 @@
+"""
+Orchestrator test-case execution - runs test-case SQL once and keeps the outcomes for rendering.
+"""
+import hashlib
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from db_connector import summarize_query, summarize_query_server_side
+
+ROW_COUNT_TYPES = ("count", "row count")
+
+
+def find_col(df, names):
+    """Find column matching any of the names (case-insensitive, spaces as underscores)."""
+    cols_lower = {str(c).strip().lower(): c for c in df.columns}
+    for n in names:
+        nlo = n.lower().replace(" ", "_")
+        if nlo in cols_lower:
+            return cols_lower[nlo]
+        for c in df.columns:
+            if nlo in str(c).lower().replace(" ", "_"):
+                return c
+    return None
+
+
+def resolve_columns(df):
+    """Locate the test-case columns of a sheet. Missing columns map to None."""
+    cols = {
+        "sno": find_col(df, ["S_No", "SNo", "Test Case", "TestCase"]),
+        "val": find_col(df, ["Validation_Type", "Validation Type", "ValidationType"]),
+        "cols": find_col(df, ["Columns", "Column"]),
+        "sql": find_col(df, ["SQL Query", "SQLQuery", "SQL", "Query"]),
+        "res": find_col(df, ["Results", "Result"]),
+        "hop": find_col(df, ["Hop", "Hop Name", "HopName", "Hop Value", "Hop_Value"]),
+        "skip_reg": find_col(df, ["Skip_Regression_Testing", "Skip Regression Testing", "SkipRegressionTesting"]),
+    }
+    if cols["skip_reg"] is None:
+        for c in df.columns:
+            if "skip" in str(c).lower() and "regression" in str(c).lower():
+                cols["skip_reg"] = c
+                break
+    return cols
+
+
+def cell(row, col):
+    """Row value for col, or '-' when the column is missing."""
+    return row.get(col, "-") if col is not None else "-"
+
+
+def case_sql(row, cols):
+    """The test case's SQL text, or None when the row has none."""
+    sql_val = cell(row, cols["sql"])
+    if sql_val and str(sql_val).strip() not in ("-", "nan", ""):
+        return str(sql_val).strip()
+    return None
+
+
+def validation_type(row, cols):
+    """Normalized (lower-case, single-spaced) validation type of a row."""
+    return " ".join(str(cell(row, cols["val"])).strip().lower().split())
+
+
+def status_messages(row, cols):
+    """(matching_msg, not_matching_msg) for a row, naming its hop when present."""
+    hop_val = str(cell(row, cols["hop"])).strip() if cols["hop"] is not None else ""
+    if hop_val and hop_val.lower() not in ("-", "nan", "none"):
+        hop_label = f"Hop {hop_val}"
+    else:
+        hop_label = "Hop"
+    return f"Success ✓, Data is matching in {hop_label}", f"Failed ✗, Data is not matching in {hop_label}"
+
+
+def case_key(sheet_name, sql, conn_id):
+    """Cache key for a test-case outcome: hash of (sheet, SQL, connection)."""
+    raw = "\x1f".join([str(sheet_name), sql, str(conn_id)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def execute_case(conn, db_type, sql, server_side=False):
+    """
+    Run a test-case query. Returns {"preview", "row_count", "error"}; preview holds at most 5 rows.
+    server_side wraps the SQL so only the preview and a COUNT(*) come back instead of every row.
+    """
+    summarize = summarize_query_server_side if server_side else summarize_query
+    try:
+        preview, row_count = summarize(conn, db_type, sql, preview_rows=5)
+        return {"preview": preview, "row_count": row_count, "error": None}
+    except Exception as ex:
+        return {"preview": None, "row_count": 0, "error": str(ex)}
+
+
+def case_status(vtype, outcome, matching_msg, not_matching_msg):
+    """
+    Status of an executed test case from its outcome. Returns (computed_status, notes) where
+    computed_status is None when the validation type does not decide it, and notes are
+    ("caption" | "warning", text) pairs to show under the results.
+    """
+    qdf, row_count = outcome["preview"], outcome["row_count"]
+    computed_status = None
+    notes = []
+    if row_count > 0:
+        if vtype in ("direct map", "business logic", "default values", "dnp", "etl fields"):
+            computed_status = not_matching_msg if row_count > 1 else matching_msg
+        elif vtype in ROW_COUNT_TYPES:
+            if row_count == 1:
+                computed_status = not_matching_msg
+            elif qdf.shape[1] >= 2:
+                first_val = qdf.iloc[0, 1]
+                second_val = qdf.iloc[1, 1]
+                if pd.isna(first_val) or pd.isna(second_val):
+                    computed_status = not_matching_msg
+                elif str(first_val).strip() == str(second_val).strip():
+                    computed_status = matching_msg
+                else:
+                    computed_status = not_matching_msg
+            else:
+                notes.append(("warning", "Count validation expects at least 2 columns."))
+    elif vtype == "etl":
+        computed_status = matching_msg
+    elif vtype in ("business logic", "business_logic", "businesslogic"):
+        computed_status = matching_msg
+    elif vtype not in ("dnp", "etl fields", "direct map", "default values", "default"):
+        notes.append(("caption", "Query returned no rows."))
+    return computed_status, notes
+
+
+def stops_sheet(vtype, outcome, matching_msg, not_matching_msg):
+    """True if this outcome is a failed row-count validation."""
+    if outcome is None or outcome["error"]:
+        return False
+    status, _ = case_status(vtype, outcome, matching_msg, not_matching_msg)
+    return vtype in ROW_COUNT_TYPES and status == not_matching_msg
+
+
+def run_sheet(conn, db_type, sheet_name, df, conn_id, proceed_on_count_fail=True, outcomes=None, on_outcome=None, server_side=False):
+    """
+    Execute a sheet's test cases in order, storing outcomes by case_key in outcomes (returned).
+    Identical SQL within a sheet runs once. Stops after a failed row-count validation unless
+    proceed_on_count_fail. on_outcome(sheet_name, test_case, outcome) is called after each query.
+    """
+    outcomes = {} if outcomes is None else outcomes
+    if df.empty:
+        return outcomes
+    cols = resolve_columns(df)
+    for _, row in df.iterrows():
+        sql = case_sql(row, cols)
+        if sql is None:
+            continue
+        key = case_key(sheet_name, sql, conn_id)
+        if key not in outcomes:
+            outcomes[key] = execute_case(conn, db_type, sql, server_side)
+            if on_outcome:
+                on_outcome(sheet_name, cell(row, cols["sno"]), outcomes[key])
+        matching_msg, not_matching_msg = status_messages(row, cols)
+        if not proceed_on_count_fail and stops_sheet(validation_type(row, cols), outcomes[key], matching_msg, not_matching_msg):
+            break
+    return outcomes
+
+
+def run_sheets_parallel(
+    pool, db_type, config, sheets, conn_id, proceed_on_count_fail=True, max_workers=4, on_outcome=None, server_side=False, cancelled=None,
+):
+    """
+    Execute test cases of several sheets on pooled connections. When proceed_on_count_fail, every
+    distinct (sheet, SQL) runs as its own task; otherwise each sheet runs in order on one connection
+    so a failed row-count validation still stops that sheet. on_outcome(sheet_name, test_case, outcome)
+    is called on the calling thread as results arrive. When cancelled() turns true, tasks not yet
+    started are dropped and running ones finish. Returns outcomes keyed by case_key.
+    """
+    progress = queue.Queue()
+
+    def report(sheet_name, test_case, outcome):
+        progress.put((sheet_name, test_case, outcome))
+
+    def run_case(sheet_name, test_case, sql):
+        conn, err = pool.acquire(db_type, config)
+        if err:
+            outcome = {"preview": None, "row_count": 0, "error": err}
+        else:
+            try:
+                outcome = execute_case(conn, db_type, sql, server_side)
+            finally:
+                pool.release(conn)
+        report(sheet_name, test_case, outcome)
+        return {case_key(sheet_name, sql, conn_id): outcome}
+
+    def run_one_sheet(sheet_name, df):
+        conn, err = pool.acquire(db_type, config)
+        if err:
+            cols = resolve_columns(df)
+            failed = {}
+            for _, row in df.iterrows():
+                sql = case_sql(row, cols)
+                if sql is not None:
+                    outcome = {"preview": None, "row_count": 0, "error": err}
+                    failed[case_key(sheet_name, sql, conn_id)] = outcome
+                    report(sheet_name, cell(row, cols["sno"]), outcome)
+            return failed
+        try:
+            return run_sheet(conn, db_type, sheet_name, df, conn_id, proceed_on_count_fail=False, on_outcome=report, server_side=server_side)
+        finally:
+            pool.release(conn)
+
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(min(max_workers, pool.max_size), 1)) as executor:
+        if proceed_on_count_fail:
+            futures = []
+            for sheet_name, df in sheets:
+                if df.empty:
+                    continue
+                cols = resolve_columns(df)
+                seen = set()
+                for _, row in df.iterrows():
+                    sql = case_sql(row, cols)
+                    if sql is not None and sql not in seen:
+                        seen.add(sql)
+                        futures.append(executor.submit(run_case, sheet_name, cell(row, cols["sno"]), sql))
+        else:
+            futures = [executor.submit(run_one_sheet, sheet_name, df) for sheet_name, df in sheets]
+        pending = set(futures)
+        while pending or not progress.empty():
+            _, pending = wait(pending, timeout=0.2)
+            if cancelled is not None and cancelled():
+                pending = {f for f in pending if not f.cancel()}
+            while not progress.empty():
+                if on_outcome:
+                    on_outcome(*progress.get())
+                else:
+                    progress.get()
+        for future in futures:
+            if not future.cancelled():
+                outcomes.update(future.result())
+    return outcomes
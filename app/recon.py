@@ -41,19 +41,111 @@ def render():
                     st.markdown("---")
                     st.markdown("**Join columns used**")
                     st.markdown(", ".join(join_cols_used))
+                hash_stats = r.get("hash_stats")
+                if hash_stats:
+                    st.markdown("---")
+                    st.markdown("**Hash comparison**")
+                    st.markdown(
+                        f"Source rows hashed: {hash_stats.get('source_rows', 0)} · "
+                        f"Target rows hashed: {hash_stats.get('target_rows', 0)} · "
+                        f"Keys with differing hashes: {hash_stats.get('diff_keys', 0)}"
+                        + (" · Fetched all rows (many keys differ)" if hash_stats.get("full_fetch") else "")
+                    )
+                profile_stats = r.get("profile_stats")
+                if profile_stats:
+                    st.markdown("---")
+                    st.markdown("**Profile comparison**")
+                    st.markdown(
+                        f"Source rows: {profile_stats.get('source_rows', 0)} · "
+                        f"Target rows: {profile_stats.get('target_rows', 0)} · "
+                        f"Columns profiled: {profile_stats.get('columns_profiled', 0)} · "
+                        f"Mismatched statistics: {profile_stats.get('mismatched_stats', 0)}"
+                    )
+                    mismatched_columns = profile_stats.get("mismatched_columns", [])
+                    if mismatched_columns:
+                        st.markdown("**Columns with differing profiles:** " + ", ".join(mismatched_columns))
+                    profile_df = r.get("profile_df")
+                    if profile_df is not None and not profile_df.empty:
+                        only_diff = st.toggle("Show differing statistics only", value=bool(mismatched_columns), key=f"recon_profile_diff_only_{sno}")
+                        st.dataframe(
+                            profile_df.loc[~profile_df["Match"]] if only_diff else profile_df,
+                            use_container_width=True,
+                            hide_index=True,
+                        )
+                bucket_stats = r.get("bucket_stats")
+                if bucket_stats:
+                    st.markdown("---")
+                    st.markdown("**Bucketed comparison**")
+                    st.markdown(
+                        f"{bucket_stats.get('strategy', 'Hash')} buckets: {bucket_stats.get('buckets', 0)} · "
+                        f"Matching checksums: {bucket_stats.get('matching_buckets', 0)} "
+                        f"({bucket_stats.get('rows_in_matching_buckets', 0)} rows) · "
+                        f"Differing: {bucket_stats.get('differing_buckets', 0)} · "
+                        f"Compared now: {bucket_stats.get('compared_buckets', 0)} · "
+                        f"Resumed: {bucket_stats.get('resumed_buckets', 0)}"
+                    )
+                    bucket_errors = bucket_stats.get("errors", [])
+                    if bucket_errors:
+                        st.warning(f"{len(bucket_errors)} bucket(s) failed; run again to retry only those.")
+                        st.markdown("\n".join(f"- {e}" for e in bucket_errors[:10]))
+                incremental_stats = r.get("incremental_stats")
+                if incremental_stats:
+                    st.markdown("---")
+                    st.markdown("**Incremental comparison**")
+                    if incremental_stats.get("full_run"):
+                        st.markdown(f"First run for this table pair: all rows compared. Watermark {incremental_stats.get('watermark_column')} saved at {incremental_stats.get('new_watermark')}.")
+                    else:
+                        st.markdown(
+                            f"{incremental_stats.get('watermark_column')} after {incremental_stats.get('previous_watermark')} · "
+                            f"Changed keys: {incremental_stats.get('changed_keys', 0)} · "
+                            f"Rechecked earlier mismatches: {incremental_stats.get('rechecked_keys', 0)} · "
+                            f"New watermark: {incremental_stats.get('new_watermark')}"
+                        )
+                    st.markdown(
+                        f"Source rows: {incremental_stats.get('source_rows', 0)} · "
+                        f"Target rows: {incremental_stats.get('target_rows', 0)} · "
+                        f"Open mismatched keys: {incremental_stats.get('open_mismatch_keys', 0)}"
+                    )
+                    if incremental_stats.get("source_rows") != incremental_stats.get("target_rows"):
+                        st.warning("Row counts differ: deleted rows are not tracked by the watermark; run a Full or Bucketed compare.")
+                merge_stats = r.get("merge_stats")
+                if merge_stats:
+                    st.markdown("---")
+                    st.markdown("**Sorted-merge comparison**")
+                    st.markdown(
+                        f"Key windows: {merge_stats.get('windows', 0)} · "
+                        f"Rows with NULL keys (compared in memory): {merge_stats.get('null_key_rows', 0)}"
+                    )
                 joined_df = r.get("joined_df")
                 if joined_df is not None and not joined_df.empty:
                     st.markdown("---")
                     st.markdown("**Joined sample (top 10)**")
                     st.dataframe(joined_df, use_container_width=True, hide_index=True)
+                mismatch_stats = r.get("mismatch_stats")
+                if mismatch_stats:
+                    st.markdown("---")
+                    st.markdown(
+                        f"**Rows compared:** {mismatch_stats.get('rows_compared', 0)} · "
+                        f"**Mismatched rows:** {mismatch_stats.get('mismatched_rows', 0)} · "
+                        f"**Only in source:** {mismatch_stats.get('source_only_rows', 0)} · "
+                        f"**Only in target:** {mismatch_stats.get('target_only_rows', 0)}"
+                    )
+                    counts = mismatch_stats.get("mismatch_counts", {})
+                    if counts and any(counts.values()):
+                        st.markdown("**Mismatches by column**")
+                        st.dataframe(
+                            [{"Column": c, "Mismatches": n} for c, n in counts.items() if n],
+                            use_container_width=True,
+                            hide_index=True,
+                        )
                 mismatch_df = r.get("mismatch_df")
                 if mismatch_df is not None and not mismatch_df.empty:
                     st.markdown("---")
-                    st.markdown("**Mismatched rows (top 10)**")
+                    st.markdown(f"**Mismatched rows (random sample of {len(mismatch_df)})**")
                     st.dataframe(mismatch_df, use_container_width=True, hide_index=True)
-                else:
+                elif r.get("compare_mode") != "Profile" and not (mismatch_stats or {}).get("mismatched_rows"):
                     st.markdown("---")
-                    st.markdown("*No mismatches detected (top 10 view).*")
+                    st.markdown("*No mismatches detected.*")
 
                 src_df = r.get("source_df")
                 if src_df is not None and not src_df.empty:
@@ -0,0 +1,385 @@
+"""
+Recon benchmark - times fetch, hash, merge and compare on synthetic source/target tables.
+
+Runs against a local stand-in database so regressions show up without a warehouse:
+  python recon_bench.py --rows 200000 --drift 0.01
+  python recon_bench.py --backend duckdb --rows 1000000 --columns 20
+  python recon_bench.py --backend postgres --dsn "dbname=bench user=postgres host=localhost"
+Reports wall time, peak RSS and rows/sec per stage; --json writes the same numbers to a file.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from db_connector import fetch_row_hashes, fetch_table_data
+from dmc_runner import build_dmc_queries
+from recon_compare import compare_frames
+from recon_runner import run_recon_single
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+SOURCE_TABLE = "bench_source"
+TARGET_TABLE = "bench_target"
+KEY_COLUMN = "id"
+COLUMN_KINDS = ("int", "float", "text", "date")
+
+
+# Fixtures
+
+def make_source(rows, columns, key_cardinality, seed=0):
+    """Synthetic source table: an integer key with key_cardinality distinct values plus columns of mixed kinds."""
+    rng = np.random.default_rng(seed)
+    if key_cardinality >= rows:
+        keys = np.arange(rows, dtype="int64")
+    else:
+        keys = rng.integers(0, key_cardinality, rows, dtype="int64")
+    data = {KEY_COLUMN: keys}
+    for i in range(columns):
+        kind = COLUMN_KINDS[i % len(COLUMN_KINDS)]
+        name = f"{kind}_{i}"
+        if kind == "int":
+            data[name] = rng.integers(0, 1_000_000, rows, dtype="int64")
+        elif kind == "float":
+            data[name] = np.round(rng.random(rows) * 10_000, 2)
+        elif kind == "text":
+            data[name] = pd.Series(rng.integers(0, 50_000, rows)).map("value_{}".format)
+        else:
+            data[name] = (pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2_000, rows), unit="D")).strftime("%Y-%m-%d")
+    return pd.DataFrame(data)
+
+
+def make_target(src, drift, seed=1):
+    """
+    Copy of src with drift applied: a drift fraction of rows gets one changed value, and drift/10
+    of rows each are dropped from / added to the target.
+    """
+    rng = np.random.default_rng(seed)
+    tgt = src.copy()
+    rows = len(tgt)
+    value_cols = [c for c in tgt.columns if c != KEY_COLUMN]
+    changed = rng.choice(rows, int(rows * drift), replace=False) if value_cols else []
+    for n, idx in enumerate(changed):
+        col = value_cols[n % len(value_cols)]
+        val = tgt.at[idx, col]
+        if col.startswith("text"):
+            tgt.at[idx, col] = f"{val}_x"
+        elif col.startswith("date"):
+            tgt.at[idx, col] = "1999-12-31"
+        else:
+            tgt.at[idx, col] = val + 1
+    churn = int(rows * drift / 10)
+    if churn:
+        tgt = tgt.drop(index=rng.choice(rows, churn, replace=False))
+        extra = src.sample(churn, random_state=seed).copy()
+        extra[KEY_COLUMN] = np.arange(rows, rows + churn) + int(src[KEY_COLUMN].max()) + 1
+        tgt = pd.concat([tgt, extra], ignore_index=True)
+    return tgt.reset_index(drop=True)
+
+
+def make_dmc_sheet(tables, hops=4):
+    """Synthetic DMC workbook sheet with tables spread over hops."""
+    return pd.DataFrame({
+        "Hop Name": [f"HOP_{i % hops}" for i in range(tables)],
+        "Schema Name": ["BENCH"] * tables,
+        "Table Name": [f"TABLE_{i}" for i in range(tables)],
+        "Grouping": [f"GROUP_{i % 7}" for i in range(tables)],
+        "Filter Col 1": ["LOAD_DT" if i % 3 == 0 else "" for i in range(tables)],
+        "Filter Col 1 Val": ["2024-01-01" if i % 3 == 0 else "" for i in range(tables)],
+    })
+
+
+# Backends
+
+def _md5(value):
+    return None if value is None else hashlib.md5(str(value).encode("utf-8")).hexdigest()
+
+
+def _sql_type(series):
+    if pd.api.types.is_integer_dtype(series):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(series):
+        return "DOUBLE PRECISION"
+    return "VARCHAR(64)"
+
+
+def open_backend(backend, dsn=None):
+    """Open a stand-in database. Returns (conn, db_type, cleanup); db_type is the dialect the app uses for it."""
+    if backend == "sqlite":
+        path = os.path.join(tempfile.mkdtemp(prefix="dv_bench_"), "bench.db")
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.create_function("MD5", 1, _md5, deterministic=True)
+        conn.create_function("TO_NUMBER", 2, lambda text, fmt: None if text is None else int(text, 16), deterministic=True)
+
+        def cleanup():
+            conn.close()
+            Path(path).unlink(missing_ok=True)
+        # SQLite speaks the generic LIMIT / MD5(... || ...) SQL the app emits for Snowflake.
+        return conn, "Snowflake", cleanup
+    if backend == "duckdb":
+        if not DUCKDB_AVAILABLE:
+            raise SystemExit("duckdb not installed. Run: pip install duckdb")
+        conn = duckdb.connect()
+        # Snowflake's TO_NUMBER(hex, 'XXXXXXXX'), used for bucket numbers and checksums.
+        conn.execute("CREATE MACRO to_number(text, fmt) AS ('0x' || text)::BIGINT")
+        return conn, "Snowflake", conn.close
+    if backend == "postgres":
+        try:
+            import psycopg2
+        except ImportError:
+            raise SystemExit("psycopg2 not installed. Run: pip install psycopg2-binary")
+        conn = psycopg2.connect(dsn or "dbname=postgres user=postgres host=localhost")
+        return conn, "PostgreSQL", conn.close
+    raise SystemExit(f"Unknown backend: {backend}")
+
+
+def load_table(conn, backend, table, df):
+    """(Re)create table from df in the stand-in database."""
+    if backend == "sqlite":
+        df.to_sql(table, conn, if_exists="replace", index=False, chunksize=50_000)
+        conn.commit()
+        return
+    if backend == "duckdb":
+        conn.register("bench_df", df)
+        conn.execute(f'CREATE OR REPLACE TABLE "{table}" AS SELECT * FROM bench_df')
+        conn.unregister("bench_df")
+        return
+    import io
+    cols = ", ".join(f'"{c}" {_sql_type(df[c])}' for c in df.columns)
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False)
+    buf.seek(0)
+    cur = conn.cursor()
+    cur.execute(f'DROP TABLE IF EXISTS "{table}"')
+    cur.execute(f'CREATE TABLE "{table}" ({cols})')
+    cur.copy_expert(f'COPY "{table}" FROM STDIN WITH (FORMAT csv)', buf)
+    cur.execute(f'ANALYZE "{table}"')
+    conn.commit()
+
+
+class _SinglePool:
+    """Pool stand-in for run_recon_single: hands out the one benchmark connection."""
+    max_size = 2
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self, db_type, config):
+        return self.conn, None
+
+    def release(self, conn, discard=False):
+        pass
+
+
+# Measurement
+
+def _rss_bytes():
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss_bytes():
+    """Process-lifetime peak RSS, for platforms without psutil or /proc."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRSS:
+    """Samples RSS on a background thread while a stage runs."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            rss = _rss_bytes()
+            if rss is None:
+                return
+            self.peak = max(self.peak, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = _rss_bytes() or 0
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        rss = _rss_bytes()
+        if rss is None:
+            self.peak = _max_rss_bytes() or 0
+        else:
+            self.peak = max(self.peak, rss)
+        return False
+
+
+def timed(name, rows, fn, repeat=1):
+    """Run fn repeat times; returns (stage result dict, last return value). Wall time is the best run."""
+    best, peak, value = None, 0, None
+    for _ in range(max(repeat, 1)):
+        value = None
+        with PeakRSS() as mem:
+            start = time.perf_counter()
+            value = fn()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        peak = max(peak, mem.peak)
+    return {
+        "stage": name,
+        "rows": rows,
+        "wall_s": round(best, 4),
+        "peak_rss_mb": round(peak / 1024 / 1024, 1),
+        "rows_per_s": int(rows / best) if best else None,
+    }, value
+
+
+# Runner
+
+def _check(result):
+    df, err = result
+    if err:
+        raise RuntimeError(err)
+    return df
+
+
+def run_benchmark(args):
+    """Build fixtures, load them into the backend and time each stage. Returns the report dict."""
+    src = make_source(args.rows, args.columns, args.key_cardinality or args.rows, seed=args.seed)
+    tgt = make_target(src, args.drift, seed=args.seed + 1)
+    conn, db_type, cleanup = open_backend(args.backend, args.dsn)
+    stages = []
+    try:
+        start = time.perf_counter()
+        load_table(conn, args.backend, SOURCE_TABLE, src)
+        load_table(conn, args.backend, TARGET_TABLE, tgt)
+        load_s = time.perf_counter() - start
+        columns = list(src.columns)
+        total = len(src) + len(tgt)
+        del src, tgt
+
+        stage, (src_df, tgt_df) = timed("fetch", total, lambda: (
+            _check(fetch_table_data(conn, db_type, SOURCE_TABLE, columns, limit=None)),
+            _check(fetch_table_data(conn, db_type, TARGET_TABLE, columns, limit=None)),
+        ), args.repeat)
+        stages.append(stage)
+        stage, _ = timed("hash", total, lambda: (
+            _check(fetch_row_hashes(conn, db_type, SOURCE_TABLE, [KEY_COLUMN], columns)),
+            _check(fetch_row_hashes(conn, db_type, TARGET_TABLE, [KEY_COLUMN], columns)),
+        ), args.repeat)
+        stages.append(stage)
+        stage, _ = timed("merge", total, lambda s=src_df, t=tgt_df: s.merge(
+            t, on=[KEY_COLUMN], how="outer", suffixes=("_source", "_target"),
+        ), args.repeat)
+        stages.append(stage)
+        stage, cmp = timed("compare", total, lambda s=src_df, t=tgt_df: compare_frames(
+            s, t, columns, [KEY_COLUMN], tolerance=args.tolerance,
+        ), args.repeat)
+        stage["mismatched_rows"] = cmp["mismatched_rows"]
+        stages.append(stage)
+        del src_df, tgt_df, cmp
+
+        pool = _SinglePool(conn)
+        for mode in ("Full", "Hash", "Profile", "Bucketed", "Merge"):
+            options = {
+                "join_cols": [KEY_COLUMN], "compare_mode": mode, "tolerance": args.tolerance, "trim_strings": False,
+                "buckets": args.buckets, "bucket_strategy": "Range", "bucket_workers": 1,
+            }
+            stage, res = timed(f"recon_{mode.lower()}", total, lambda: run_recon_single(
+                db_type, SOURCE_TABLE, db_type, TARGET_TABLE, {}, pool, options,
+            ), args.repeat)
+            if "error" in res:
+                stage["error"] = res["error"]
+            elif res.get("mismatch_stats"):
+                stage["mismatched_rows"] = res["mismatch_stats"]["mismatched_rows"]
+            stages.append(stage)
+
+        dmc_df = make_dmc_sheet(args.dmc_tables)
+        stage, _ = timed("dmc_build", args.dmc_tables, lambda: build_dmc_queries(dmc_df), args.repeat)
+        stages.append(stage)
+    finally:
+        cleanup()
+    return {
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "backend": args.backend,
+        "dialect": db_type,
+        "params": {
+            "rows": args.rows, "columns": args.columns, "key_cardinality": args.key_cardinality or args.rows,
+            "drift": args.drift, "tolerance": args.tolerance, "repeat": args.repeat, "buckets": args.buckets,
+            "dmc_tables": args.dmc_tables,
+        },
+        "load_s": round(load_s, 3),
+        "stages": stages,
+    }
+
+
+def print_report(report):
+    """Print stage results as a fixed-width table."""
+    p = report["params"]
+    print(f"Backend: {report['backend']} (dialect {report['dialect']}), rows={p['rows']:,}, columns={p['columns']}, "
+          f"keys={p['key_cardinality']:,}, drift={p['drift']}, load {report['load_s']}s")
+    print(f"{'stage':<14} {'rows':>12} {'wall_s':>10} {'peak_rss_mb':>12} {'rows/s':>14} {'mismatched':>11}")
+    for s in report["stages"]:
+        rps = f"{s['rows_per_s']:,}" if s["rows_per_s"] else "-"
+        print(f"{s['stage']:<14} {s['rows']:>12,} {s['wall_s']:>10} {s['peak_rss_mb']:>12} {rps:>14} {s.get('mismatched_rows', ''):>11}")
+        if s.get("error"):
+            print(f"  error: {s['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the recon fetch/merge/compare path on synthetic tables.")
+    parser.add_argument("--backend", choices=["sqlite", "duckdb", "postgres"], default="sqlite")
+    parser.add_argument("--dsn", help="psycopg2 DSN for --backend postgres")
+    parser.add_argument("--rows", type=int, default=100_000, help="Source rows (default 100000)")
+    parser.add_argument("--columns", type=int, default=8, help="Value columns besides the key (default 8)")
+    parser.add_argument("--key-cardinality", type=int, default=0, help="Distinct key values; default = rows (unique keys)")
+    parser.add_argument("--drift", type=float, default=0.01, help="Fraction of target rows that differ (default 0.01)")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Numeric tolerance for compare")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the best wall time is reported")
+    parser.add_argument("--buckets", type=int, default=16, help="Range buckets for the bucketed recon stage (default 16)")
+    parser.add_argument("--dmc-tables", type=int, default=2000, help="Tables in the synthetic DMC sheet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Recon comparison engine - normalizes source/target dtypes once and flags mismatches in one vectorized pass;
+also compares aggregate column profiles.
+"""
+from numbers import Number
+
+import numpy as np
+import pandas as pd
+
+_NUMERIC_KINDS = ("integer", "floating", "decimal", "mixed-integer-float")
+_DATETIME_KINDS = ("datetime", "datetime64", "date")
+_SIDE = "__dv_side__"
+MISMATCH_TOTALS = ("mismatched_rows", "rows_compared", "source_only_rows", "target_only_rows")
+MISMATCH_STATS = ("mismatch_counts",) + MISMATCH_TOTALS
+
+
+def _kind(s):
+    """Comparison kind of a column: numeric, datetime, string, empty (all null) or other."""
+    if pd.api.types.is_bool_dtype(s):
+        return "other"
+    if pd.api.types.is_numeric_dtype(s):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return "datetime"
+    inferred = pd.api.types.infer_dtype(s, skipna=True)
+    if inferred in _NUMERIC_KINDS:
+        return "numeric"
+    if inferred in _DATETIME_KINDS:
+        return "datetime"
+    if inferred == "string":
+        return "string"
+    if inferred == "empty":
+        return "empty"
+    return "other"
+
+
+def _to_kind(s, kind, trim_strings):
+    """Convert a column to the common comparison dtype for kind."""
+    if kind == "numeric":
+        if pd.api.types.is_numeric_dtype(s):
+            return s
+        try:
+            # Decimal/int objects from DBAPI drivers; a direct cast is much cheaper than to_numeric.
+            return s.astype("float64")
+        except (TypeError, ValueError):
+            return pd.to_numeric(s, errors="coerce").astype("float64")
+    if kind == "datetime":
+        out = pd.to_datetime(s, errors="coerce")
+        if getattr(out.dt, "tz", None) is not None:
+            out = out.dt.tz_convert("UTC").dt.tz_localize(None)
+        return out
+    if kind == "string":
+        out = s.astype("string")
+        return out.str.strip() if trim_strings else out
+    return s
+
+
+def normalize_pair(src, tgt, trim_strings=False):
+    """Bring a source/target column pair to one comparable dtype. Mixed kinds compare as strings."""
+    if src.dtype == tgt.dtype and src.dtype != object and not (trim_strings and pd.api.types.is_string_dtype(src)):
+        return src, tgt
+    ks, kt = _kind(src), _kind(tgt)
+    if ks == "empty":
+        ks = kt
+    if kt == "empty":
+        kt = ks
+    if ks != kt or (ks == "other" and src.dtype != tgt.dtype):
+        ks = kt = "string"
+    return _to_kind(src, ks, trim_strings), _to_kind(tgt, kt, trim_strings)
+
+
+def _column_diff(s, t, tolerance):
+    """Boolean numpy array: True where s and t differ (both-null counts as equal)."""
+    if pd.api.types.is_integer_dtype(s) and pd.api.types.is_integer_dtype(t) and not (s.hasnans or t.hasnans):
+        a, b = s.to_numpy(), t.to_numpy()
+        return np.abs(a - b) > tolerance if tolerance else a != b
+    if pd.api.types.is_numeric_dtype(s) and pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(s):
+        a = s.to_numpy(dtype="float64", na_value=np.nan)
+        b = t.to_numpy(dtype="float64", na_value=np.nan)
+        same = a == b
+        if tolerance:
+            with np.errstate(invalid="ignore"):
+                same |= np.abs(a - b) <= tolerance
+        same |= np.isnan(a) & np.isnan(b)
+        return ~same
+    s_na, t_na = s.isna().to_numpy(), t.isna().to_numpy()
+    eq = s.eq(t).fillna(False).to_numpy(dtype=bool)
+    return ~(eq | (s_na & t_na))
+
+
+def compare_frames(
+    src_df, tgt_df, matching, join_cols=None, tolerance=0.0, trim_strings=False, sample_size=10, collect_keys=False, rng=None,
+):
+    """
+    Outer-join source and target on join columns (requested ones present on both sides, else the
+    first 3 matching columns; row position if none) and compare the remaining matching columns.
+    Numeric columns match within tolerance; strings are optionally trimmed. Returns a dict with
+    join_cols_used, mismatch_counts (per column), mismatched_rows, rows_compared, source_only_rows,
+    target_only_rows and bounded samples joined_df / mismatch_df of at most sample_size rows. mismatch_df
+    holds the first mismatched rows, or a uniform random sample of them when rng (numpy Generator) is
+    given. collect_keys adds mismatch_keys, the join-column tuples of every mismatched row.
+    """
+    join_cols_used = []
+    if join_cols:
+        join_cols_used = [c for c in join_cols if c in src_df.columns and c in tgt_df.columns]
+    if not join_cols_used:
+        join_cols_used = [c for c in matching if c in src_df.columns and c in tgt_df.columns][:3]
+    compare_cols = [c for c in matching if c not in join_cols_used and c in src_df.columns and c in tgt_df.columns]
+
+    src_df = src_df.copy(deep=False)
+    tgt_df = tgt_df.copy(deep=False)
+    for col in join_cols_used + compare_cols:
+        src_df[col], tgt_df[col] = normalize_pair(src_df[col], tgt_df[col], trim_strings)
+
+    if join_cols_used:
+        combined = src_df.merge(tgt_df, on=join_cols_used, how="outer", suffixes=("_source", "_target"), indicator=_SIDE)
+    else:
+        combined = src_df.reset_index(drop=True).merge(
+            tgt_df.reset_index(drop=True), left_index=True, right_index=True, how="outer", suffixes=("_source", "_target"),
+            indicator=_SIDE,
+        )
+    del src_df, tgt_df
+    side = combined.pop(_SIDE)
+
+    row_mask = np.zeros(len(combined), dtype=bool)
+    mismatch_counts = {}
+    for col in compare_cols:
+        col_diff = _column_diff(combined[f"{col}_source"], combined[f"{col}_target"], tolerance)
+        mismatch_counts[col] = int(np.count_nonzero(col_diff))
+        row_mask |= col_diff
+    mismatch_idx = np.flatnonzero(row_mask)
+    if rng is not None and len(mismatch_idx) > sample_size:
+        mismatch_idx = np.sort(rng.choice(mismatch_idx, size=sample_size, replace=False))
+    else:
+        mismatch_idx = mismatch_idx[:sample_size]
+    result = {
+        "join_cols_used": join_cols_used,
+        "mismatch_counts": mismatch_counts,
+        "mismatched_rows": int(row_mask.sum()),
+        "rows_compared": len(combined),
+        "source_only_rows": int((side == "left_only").sum()),
+        "target_only_rows": int((side == "right_only").sum()),
+        "joined_df": combined.head(sample_size).copy(),
+        "mismatch_df": combined.iloc[mismatch_idx].copy(),
+    }
+    if collect_keys:
+        result["mismatch_keys"] = (
+            list(combined.loc[row_mask, join_cols_used].itertuples(index=False, name=None)) if join_cols_used else []
+        )
+    del combined
+    return result
+
+
+class MismatchAccumulator:
+    """
+    Exact mismatch totals over any number of compared pieces (buckets, key windows, NULL-key rows)
+    with a uniform random sample of at most sample_size mismatched rows and the first sample_size
+    joined rows. Each piece's frames are released once merged, so memory does not grow with the table.
+    """
+
+    def __init__(self, compare_cols=(), sample_size=10, seed=None):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.join_cols_used = []
+        self.mismatch_counts = dict.fromkeys(compare_cols, 0)
+        self.totals = dict.fromkeys(MISMATCH_TOTALS, 0)
+        self._sample = pd.DataFrame()
+        self._sampled_from = 0
+        self._joined = None
+
+    def compare(self, src_df, tgt_df, matching, join_cols=None, tolerance=0.0, trim_strings=False, **kwargs):
+        """compare_frames one piece with a random mismatch sample and add it. Returns the piece's result."""
+        cmp = compare_frames(
+            src_df, tgt_df, matching, join_cols, tolerance, trim_strings, self.sample_size, rng=self.rng, **kwargs,
+        )
+        self.add(cmp)
+        return cmp
+
+    def add(self, cmp):
+        """
+        Add one compare_frames-style result. Its mismatch_df should be a uniform sample of its mismatched
+        rows; pieces without one (e.g. resumed from a checkpoint) count in the totals only.
+        """
+        if not self.join_cols_used:
+            self.join_cols_used = list(cmp.get("join_cols_used", []))
+        for k in MISMATCH_TOTALS:
+            self.totals[k] += cmp.get(k, 0)
+        for c, n in cmp.get("mismatch_counts", {}).items():
+            self.mismatch_counts[c] = self.mismatch_counts.get(c, 0) + n
+        joined = cmp.get("joined_df")
+        if self._joined is None and joined is not None and not joined.empty:
+            self._joined = joined
+        sample, n = cmp.get("mismatch_df"), cmp.get("mismatched_rows", 0)
+        if sample is None or sample.empty or not n:
+            return
+        # Reservoir merge: how many of the combined sample come from the kept rows follows the hypergeometric law.
+        keep = min(self.sample_size, len(self._sample) + len(sample))
+        old = int(self.rng.hypergeometric(self._sampled_from, n, keep)) if self._sampled_from else 0
+        old = min(max(old, keep - len(sample)), len(self._sample))
+        self._sample = pd.concat(
+            [self._sample.sample(old, random_state=self.rng), sample.sample(keep - old, random_state=self.rng)],
+            ignore_index=True,
+        ) if old else sample.sample(keep, random_state=self.rng).reset_index(drop=True)
+        self._sampled_from += n
+
+    def result(self):
+        """Totals and samples with the compare_frames result keys."""
+        return {
+            "join_cols_used": self.join_cols_used,
+            "mismatch_counts": dict(self.mismatch_counts),
+            **self.totals,
+            "joined_df": self._joined if self._joined is not None else pd.DataFrame(),
+            "mismatch_df": self._sample,
+        }
+
+
+PROFILE_STATS = ("non_null", "nulls", "distinct", "min", "max", "sum", "length_sum")
+
+
+def _profile_value_equal(a, b, stat, tolerance, trim_strings):
+    """Compare one profile statistic. Counts match exactly; MIN/MAX within tolerance; SUM also within 1e-9 relative."""
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, Number) and isinstance(b, Number) and not isinstance(a, bool) and not isinstance(b, bool):
+        fa, fb = float(a), float(b)
+        if stat in ("min", "max"):
+            return abs(fa - fb) <= tolerance
+        if stat == "sum":
+            return abs(fa - fb) <= max(tolerance, 1e-9 * max(abs(fa), abs(fb)))
+        return fa == fb
+    if isinstance(a, str) and isinstance(b, str):
+        return a.strip() == b.strip() if trim_strings else a == b
+    try:
+        return pd.Timestamp(a) == pd.Timestamp(b)
+    except (TypeError, ValueError):
+        return str(a) == str(b)
+
+
+def compare_profiles(src_profile, tgt_profile, column_pairs, tolerance=0.0, trim_strings=False):
+    """
+    Compare two profile_table results. column_pairs maps source column -> target column; rows are
+    reported under the target name. Statistics present on only one side (e.g. SUM where one side is
+    not numeric) are listed with Match False. Returns (profile_df, summary) where profile_df has
+    Column / Statistic / Source / Target / Match and summary counts rows and mismatches.
+    """
+    records = [{
+        "Column": "(table)", "Statistic": "rows",
+        "Source": src_profile["rows"], "Target": tgt_profile["rows"],
+        "Match": src_profile["rows"] == tgt_profile["rows"],
+    }]
+    for src_col, tgt_col in column_pairs.items():
+        s = src_profile["columns"].get(src_col, {})
+        t = tgt_profile["columns"].get(tgt_col, {})
+        for stat in PROFILE_STATS:
+            if stat not in s and stat not in t:
+                continue
+            a, b = s.get(stat), t.get(stat)
+            match = stat in s and stat in t and _profile_value_equal(a, b, stat, tolerance, trim_strings)
+            records.append({"Column": tgt_col, "Statistic": stat, "Source": a, "Target": b, "Match": match})
+    df = pd.DataFrame(records)
+    # Mixed value types per column: show them as text so the table renders consistently.
+    df["Source"] = df["Source"].map(lambda v: "" if v is None else str(v))
+    df["Target"] = df["Target"].map(lambda v: "" if v is None else str(v))
+    mismatched = df.loc[~df["Match"]]
+    summary = {
+        "source_rows": src_profile["rows"],
+        "target_rows": tgt_profile["rows"],
+        "columns_profiled": len(column_pairs),
+        "mismatched_stats": len(mismatched),
+        "mismatched_columns": sorted(set(mismatched["Column"]) - {"(table)"}),
+    }
+    return df, summary
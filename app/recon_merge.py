@@ -0,0 +1,166 @@
+"""
+Sorted-merge recon - streams both tables ordered by the join key and compares them window by window in
+one pass, so memory stays at a few fetch chunks however large the tables are.
+"""
+import numpy as np
+import pandas as pd
+
+from db_connector import fetch_table_data, iter_table_data, null_key_filter
+from recon_compare import MismatchAccumulator, normalize_pair
+
+
+class KeyOrderError(ValueError):
+    """Rows did not arrive in ascending join key order as Python compares them."""
+
+
+def _order_break(df, key_cols):
+    """Index of the first row whose key sorts before the previous row's key, or None."""
+    if len(df) < 2:
+        return None
+    greater = np.zeros(len(df) - 1, dtype=bool)
+    equal = np.ones(len(df) - 1, dtype=bool)
+    for c in key_cols:
+        a, b = df[c].to_numpy()[:-1], df[c].to_numpy()[1:]
+        greater |= equal & (a > b)
+        equal &= a == b
+    pos = np.flatnonzero(greater)
+    return int(pos[0]) + 1 if len(pos) else None
+
+
+def _prefix_len(df, key_cols, key, inclusive=True):
+    """Number of leading rows of key-ordered df whose key is <= key (< key unless inclusive)."""
+    less = np.zeros(len(df), dtype=bool)
+    equal = np.ones(len(df), dtype=bool)
+    for c, v in zip(key_cols, key):
+        col = df[c].to_numpy()
+        less |= equal & (col < v)
+        equal &= col == v
+    return int(np.count_nonzero(less | equal if inclusive else less))
+
+
+def _last_key(df, key_cols):
+    return tuple(df[key_cols].iloc[-1])
+
+
+def merge_windows(src_chunks, tgt_chunks, key_cols, window_rows):
+    """
+    Pair two key-ordered chunk streams into (source, target) windows over the same key range. While a
+    side is still streaming, each window holds every row of both sides below the smallest last key of
+    the open buffers; rows with that key wait for the next chunk, which may hold more of them, so
+    comparing a window on its own sees all rows for its keys whatever the chunk size. Buffers are
+    refilled to window_rows (beyond it while one key fills a whole buffer), keeping memory at about
+    two windows per side. Raises KeyOrderError if either side is not ascending after the key
+    columns are brought to one dtype (database collation or mixed key types).
+    """
+    streams = [iter(src_chunks), iter(tgt_chunks)]
+    bufs = [pd.DataFrame(), pd.DataFrame()]
+    done = [False, False]
+    consumed = [None, None]
+    grow = [False, False]
+    while True:
+        for i in (0, 1):
+            while not done[i] and (len(bufs[i]) < window_rows or grow[i]):
+                chunk = next(streams[i], None)
+                if chunk is None:
+                    done[i] = True
+                elif not chunk.empty:
+                    bufs[i] = chunk.reset_index(drop=True) if bufs[i].empty else pd.concat([bufs[i], chunk], ignore_index=True)
+                    grow[i] = False
+        if bufs[0].empty and bufs[1].empty:
+            return
+        if not bufs[0].empty and not bufs[1].empty:
+            for c in key_cols:
+                bufs[0][c], bufs[1][c] = normalize_pair(bufs[0][c], bufs[1][c])
+        for i, side in enumerate(("Source", "Target")):
+            if bufs[i].empty:
+                continue
+            pos = _order_break(bufs[i], key_cols)
+            first = _last_key(bufs[i].iloc[:1], key_cols)
+            if pos is None and consumed[i] is not None and first < consumed[i]:
+                pos = 0
+            if pos is not None:
+                raise KeyOrderError(
+                    f"{side} rows are not in join key order at key {_last_key(bufs[i].iloc[:pos + 1], key_cols)}: the "
+                    "database sorts these keys differently from a binary sort (collation or mixed key types). "
+                    "Use Full, Hash or Bucketed compare for this table."
+                )
+        open_sides = [i for i in (0, 1) if not done[i]]
+        if open_sides:
+            bound = min(_last_key(bufs[i], key_cols) for i in open_sides)
+            cut = [_prefix_len(b, key_cols, bound, inclusive=False) if not b.empty else 0 for b in bufs]
+            if not any(cut):
+                # Every buffered row has the bound key or later: read on until the key changes or a stream ends.
+                grow = [not done[i] for i in (0, 1)]
+                continue
+        else:
+            cut = [len(bufs[0]), len(bufs[1])]
+        windows = [bufs[i].iloc[:cut[i]] for i in (0, 1)]
+        for i in (0, 1):
+            if cut[i]:
+                consumed[i] = _last_key(windows[i], key_cols)
+            bufs[i] = bufs[i].iloc[cut[i]:].reset_index(drop=True)
+        yield windows[0], windows[1]
+
+
+def compare_tables_sorted(
+    src_conn, source_db, source_table, src_cols, tgt_conn, target_db, target_table, tgt_cols,
+    join_cols=None, tolerance=0.0, trim_strings=False, sample_size=10, chunksize=50000,
+):
+    """
+    One-pass sort-merge compare: both tables are read in chunks with ORDER BY the join columns
+    (requested ones, else the first 3 matching columns) and walked in lockstep, comparing each key
+    window with compare_frames as it arrives. Rows with a NULL key column are fetched and compared
+    separately. src_cols/tgt_cols are position-aligned; results use target names. Returns
+    (result, error_msg); result has the compare_frames keys plus source_head, target_head and
+    merge_stats.
+    """
+    to_tgt = dict(zip(src_cols, tgt_cols))
+    to_src = dict(zip(tgt_cols, src_cols))
+    tgt_lower = {c.lower(): c for c in tgt_cols}
+    join_cols_used = [tgt_lower[c.lower()] for c in (join_cols or []) if c.lower() in tgt_lower] or list(tgt_cols[:3])
+    compare_cols = [c for c in tgt_cols if c not in join_cols_used]
+    src_keys = [to_src[c] for c in join_cols_used]
+    heads = {}
+
+    def stream(side, conn, db_type, table, cols, keys, rename):
+        for chunk in iter_table_data(
+            conn, db_type, table, cols, chunksize, where=null_key_filter(db_type, keys, null=False), order_by=keys,
+        ):
+            chunk = chunk.rename(columns=rename)
+            heads.setdefault(side, chunk.head(10))
+            yield chunk
+
+    acc = MismatchAccumulator(compare_cols, sample_size)
+    windows = null_key_rows = 0
+    try:
+        for src_win, tgt_win in merge_windows(
+            stream("source", src_conn, source_db, source_table, src_cols, src_keys, to_tgt),
+            stream("target", tgt_conn, target_db, target_table, tgt_cols, join_cols_used, {}),
+            join_cols_used, chunksize,
+        ):
+            windows += 1
+            acc.compare(src_win, tgt_win, tgt_cols, join_cols_used, tolerance, trim_strings)
+    except KeyOrderError as ex:
+        return None, str(ex)
+    except Exception as ex:
+        return None, f"Sorted merge: {ex}"
+
+    src_null, err = fetch_table_data(src_conn, source_db, source_table, src_cols, limit=None, where=null_key_filter(source_db, src_keys))
+    if err:
+        return None, f"Fetch source NULL-key rows: {err}"
+    tgt_null, err = fetch_table_data(tgt_conn, target_db, target_table, tgt_cols, limit=None, where=null_key_filter(target_db, join_cols_used))
+    if err:
+        return None, f"Fetch target NULL-key rows: {err}"
+    src_null = src_null.rename(columns=to_tgt)
+    if not src_null.empty or not tgt_null.empty:
+        null_key_rows = len(src_null) + len(tgt_null)
+        acc.compare(src_null, tgt_null, tgt_cols, join_cols_used, tolerance, trim_strings)
+
+    empty = pd.DataFrame(columns=tgt_cols)
+    return {
+        **acc.result(),
+        "join_cols_used": join_cols_used,
+        "source_head": heads.get("source", empty),
+        "target_head": heads.get("target", empty),
+        "merge_stats": {"windows": windows, "null_key_rows": null_key_rows},
+    }, None
@@ -0,0 +1,143 @@
+"""
+Out-of-core recon - streams both tables to local Parquet spill files and runs the outer join and
+mismatch counts in an embedded DuckDB with a memory limit, so table size is bounded by disk, not RAM.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from db_connector import iter_table_data
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+_NUMERIC_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT", "UINTEGER",
+                  "UBIGINT", "FLOAT", "REAL", "DOUBLE", "DECIMAL")
+
+
+def _ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _is_numeric(duck_type):
+    return duck_type.upper().startswith(_NUMERIC_TYPES)
+
+
+def _spill(duck, conn, db_type, table_name, columns, rename, out_dir, chunksize):
+    """Write a table to out_dir as one Parquet file per fetched chunk. Returns (rows, head_df)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows, head = 0, None
+    for i, chunk in enumerate(iter_table_data(conn, db_type, table_name, columns, chunksize)):
+        chunk = chunk.rename(columns=rename)
+        if head is None:
+            head = chunk.head(10)
+        if chunk.empty and i > 0:
+            continue
+        duck.register("dv_chunk", chunk)
+        path = (out_dir / f"part-{i:06d}.parquet").as_posix()
+        duck.execute(f"COPY (SELECT * FROM dv_chunk) TO '{path}' (FORMAT parquet)")
+        duck.unregister("dv_chunk")
+        rows += len(chunk)
+    return rows, head if head is not None else pd.DataFrame(columns=[rename.get(c, c) for c in columns])
+
+
+def _diff_expr(col, types, tolerance, trim_strings):
+    """SQL boolean: source and target values of col differ (both NULL counts as equal)."""
+    s, t = f"s.{_ident(col)}", f"t.{_ident(col)}"
+    st, tt = types["s"][col], types["t"][col]
+    if _is_numeric(st) and _is_numeric(tt):
+        if tolerance:
+            return f"(CASE WHEN {s} IS NULL OR {t} IS NULL THEN {s} IS DISTINCT FROM {t} ELSE abs({s} - {t}) > {float(tolerance)} END)"
+        return f"({s} IS DISTINCT FROM {t})"
+    if st != tt:
+        s, t = f"CAST({s} AS VARCHAR)", f"CAST({t} AS VARCHAR)"
+    if trim_strings and ("VARCHAR" in st.upper() or st != tt):
+        s, t = f"trim({s})", f"trim({t})"
+    return f"({s} IS DISTINCT FROM {t})"
+
+
+def compare_tables_out_of_core(
+    src_conn, source_db, source_table, src_cols, tgt_conn, target_db, target_table, tgt_cols,
+    join_cols=None, tolerance=0.0, trim_strings=False, sample_size=10, spill_dir=None,
+    memory_limit="2GB", chunksize=50000,
+):
+    """
+    Full outer join of source and target on the join columns (requested ones, else the first 3
+    matching columns) computed in DuckDB over Parquet spill files, with the same result keys as
+    recon_compare.compare_frames (mismatch_df a reservoir sample) plus source_head / target_head. src_cols/tgt_cols are position-
+    aligned; results use target names. DuckDB spills to disk beyond memory_limit. Spill files are
+    removed afterwards. Returns (result, error_msg).
+    """
+    if not DUCKDB_AVAILABLE:
+        return None, "Out-of-core recon needs duckdb. Run: pip install duckdb"
+    to_tgt = dict(zip(src_cols, tgt_cols))
+    tgt_lower = {c.lower(): c for c in tgt_cols}
+    join_cols_used = [tgt_lower[c.lower()] for c in (join_cols or []) if c.lower() in tgt_lower] or list(tgt_cols[:3])
+    compare_cols = [c for c in tgt_cols if c not in join_cols_used]
+    work = Path(tempfile.mkdtemp(prefix="dv_recon_", dir=spill_dir))
+    duck = duckdb.connect(str(work / "recon.duckdb"))
+    try:
+        duck.execute(f"SET temp_directory = '{(work / 'tmp').as_posix()}'")
+        if memory_limit:
+            duck.execute(f"SET memory_limit = '{memory_limit}'")
+        try:
+            _, src_head = _spill(duck, src_conn, source_db, source_table, src_cols, to_tgt, work / "source", chunksize)
+        except Exception as ex:
+            return None, f"Fetch source data: {ex}"
+        try:
+            _, tgt_head = _spill(duck, tgt_conn, target_db, target_table, tgt_cols, {}, work / "target", chunksize)
+        except Exception as ex:
+            return None, f"Fetch target data: {ex}"
+        types = {}
+        for alias, sub in (("s", "source"), ("t", "target")):
+            pattern = (work / sub / "*.parquet").as_posix()
+            duck.execute(f"CREATE VIEW {alias} AS SELECT *, TRUE AS dv_in_{alias} FROM read_parquet('{pattern}', union_by_name = true)")
+            types[alias] = {r[0]: r[1] for r in duck.execute(f"DESCRIBE {alias}").fetchall()}
+
+        on = " AND ".join(
+            f"s.{_ident(k)} IS NOT DISTINCT FROM t.{_ident(k)}" if types["s"][k] == types["t"][k]
+            else f"CAST(s.{_ident(k)} AS VARCHAR) IS NOT DISTINCT FROM CAST(t.{_ident(k)} AS VARCHAR)"
+            for k in join_cols_used
+        )
+        diffs = [_diff_expr(c, types, tolerance, trim_strings) for c in compare_cols]
+        flags = ", ".join(f"{d} AS dv_d{i}" for i, d in enumerate(diffs)) or "FALSE AS dv_none"
+        select = ", ".join(
+            [f"COALESCE(s.{_ident(k)}, t.{_ident(k)}) AS {_ident(k)}" for k in join_cols_used]
+            + [f"s.{_ident(c)} AS {_ident(c + '_source')}" for c in compare_cols]
+            + [f"t.{_ident(c)} AS {_ident(c + '_target')}" for c in compare_cols]
+        )
+        any_diff = " OR ".join(f"dv_d{i}" for i in range(len(diffs))) or "FALSE"
+        duck.execute(f"CREATE VIEW dv_joined AS SELECT {select}, dv_in_s, dv_in_t, {flags} FROM s FULL OUTER JOIN t ON {on}")
+
+        counts = ", ".join(f"COUNT(*) FILTER (WHERE dv_d{i})" for i in range(len(diffs)))
+        totals = duck.execute(
+            f"SELECT COUNT(*), COUNT(*) FILTER (WHERE {any_diff}), COUNT(*) FILTER (WHERE dv_in_t IS NULL), "
+            f"COUNT(*) FILTER (WHERE dv_in_s IS NULL){', ' + counts if counts else ''} FROM dv_joined"
+        ).fetchone()
+        out_cols = ", ".join(_ident(c) for c in join_cols_used + [f"{c}_source" for c in compare_cols] + [f"{c}_target" for c in compare_cols])
+        mismatch_df = duck.execute(
+            f"SELECT * FROM (SELECT {out_cols} FROM dv_joined WHERE {any_diff}) USING SAMPLE reservoir({int(sample_size)} ROWS)"
+        ).df()
+        joined_df = duck.execute(f"SELECT {out_cols} FROM dv_joined LIMIT {int(sample_size)}").df()
+        return {
+            "join_cols_used": join_cols_used,
+            "mismatch_counts": {c: int(n) for c, n in zip(compare_cols, totals[4:])},
+            "mismatched_rows": int(totals[1]),
+            "rows_compared": int(totals[0]),
+            "source_only_rows": int(totals[2]),
+            "target_only_rows": int(totals[3]),
+            "joined_df": joined_df,
+            "mismatch_df": mismatch_df,
+            "source_head": src_head,
+            "target_head": tgt_head,
+        }, None
+    except Exception as ex:
+        return None, f"Out-of-core compare: {ex}"
+    finally:
+        duck.close()
+        shutil.rmtree(work, ignore_errors=True)
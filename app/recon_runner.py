@@ -0,0 +1,522 @@
+"""
+Recon row execution - fetches one source/target table pair and compares it, off the Streamlit thread.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from db_connector import (
+    KEY_BATCH_SIZE, bucket_expr, column_kinds, column_max, count_table_rows, fetch_bucket_checksums, fetch_bucket_rows, fetch_keys_since,
+    fetch_row_hashes, fetch_rows_by_keys, fetch_table_data, get_table_columns, key_range_bounds, profile_table,
+)
+from recon_compare import MISMATCH_STATS, MismatchAccumulator, compare_frames, compare_profiles, normalize_pair
+from recon_merge import compare_tables_sorted
+from recon_ooc import compare_tables_out_of_core
+from recon_state import key_json
+
+
+# Hash mode fetches all rows instead of the differing keys once more than this share of keys differ.
+HASH_FULL_FETCH_RATIO = 0.1
+
+
+def _paired_kinds(src_conn, source_db, source_table, src_cols, tgt_conn, target_db, target_table, tgt_cols):
+    """
+    Hash kinds (db_connector.column_kinds) of the position-aligned matching columns, agreed across both
+    tables: a column whose sampled kinds differ, or that is all NULL in either sample, hashes as text on
+    both sides. Returns (src_kinds, tgt_kinds, differing, error_msg); differing lists the target columns
+    whose sampled kinds differ.
+    """
+    src_k, err = column_kinds(src_conn, source_db, source_table, src_cols)
+    if err:
+        return None, None, None, f"Sample source rows: {err}"
+    tgt_k, err = column_kinds(tgt_conn, target_db, target_table, tgt_cols)
+    if err:
+        return None, None, None, f"Sample target rows: {err}"
+    src_kinds, tgt_kinds, differing = {}, {}, []
+    for s, t in zip(src_cols, tgt_cols):
+        ks, kt = src_k.get(s), tgt_k.get(t)
+        src_kinds[s] = tgt_kinds[t] = ks if ks == kt and ks is not None else "text"
+        if ks != kt and ks is not None and kt is not None:
+            differing.append(t)
+    return src_kinds, tgt_kinds, differing, None
+
+
+def _fetch_hash_diff(
+    src_conn, source_db, source_table, tgt_conn, target_db, target_table, src_cols, tgt_cols, join_cols,
+    full_fetch_ratio=HASH_FULL_FETCH_RATIO,
+):
+    """
+    Hash rows inside each database, then fetch full rows only for keys whose hashes differ, or all rows
+    when more than full_fetch_ratio of the keys differ (one scan beats many keyed batches then).
+    Numbers and timestamps are hashed in one text form on both sides (see _paired_kinds), so tables
+    moved between databases or column types hash alike. src_cols/tgt_cols are the position-aligned
+    matching columns. Returns (src_df, tgt_df, stats, error_msg); both frames use target column names.
+    """
+    tgt_lower = {c.lower(): c for c in tgt_cols}
+    to_tgt = dict(zip(src_cols, tgt_cols))
+    to_src = dict(zip(tgt_cols, src_cols))
+    key_tgt = [tgt_lower[c.lower()] for c in join_cols if c.lower() in tgt_lower] or tgt_cols[:3]
+    key_src = [to_src[c] for c in key_tgt]
+    src_kinds, tgt_kinds, _, err = _paired_kinds(
+        src_conn, source_db, source_table, src_cols, tgt_conn, target_db, target_table, tgt_cols,
+    )
+    if err:
+        return None, None, {}, err
+    src_h, err = fetch_row_hashes(src_conn, source_db, source_table, key_src, src_cols, src_kinds)
+    if err:
+        return None, None, {}, f"Hash source rows: {err}"
+    tgt_h, err = fetch_row_hashes(tgt_conn, target_db, target_table, key_tgt, tgt_cols, tgt_kinds)
+    if err:
+        return None, None, {}, f"Hash target rows: {err}"
+    src_h = src_h.rename(columns=to_tgt)
+    for frame in (src_h, tgt_h):
+        frame.columns = ["row_hash" if str(c).lower() == "row_hash" else c for c in frame.columns]
+    for k in key_tgt:
+        src_h[k], tgt_h[k] = normalize_pair(src_h[k], tgt_h[k])
+    merged = src_h.merge(tgt_h, on=key_tgt, how="outer", suffixes=("_source", "_target"))
+    diff_keys = merged.loc[merged["row_hash_source"].ne(merged["row_hash_target"]), key_tgt].drop_duplicates()
+    keys = list(diff_keys.itertuples(index=False, name=None))
+    total = max(len(src_h), len(tgt_h))
+    stats = {"source_rows": len(src_h), "target_rows": len(tgt_h), "diff_keys": len(keys)}
+    stats["full_fetch"] = len(keys) > max(full_fetch_ratio * total, KEY_BATCH_SIZE)
+    del src_h, tgt_h, merged, diff_keys
+    if stats["full_fetch"]:
+        src_df, err = fetch_table_data(src_conn, source_db, source_table, src_cols, limit=None)
+    else:
+        src_df, err = fetch_rows_by_keys(src_conn, source_db, source_table, src_cols, key_src, keys, KEY_BATCH_SIZE)
+    if err:
+        return None, None, stats, f"Fetch source data: {err}"
+    if stats["full_fetch"]:
+        tgt_df, err = fetch_table_data(tgt_conn, target_db, target_table, tgt_cols, limit=None)
+    else:
+        tgt_df, err = fetch_rows_by_keys(tgt_conn, target_db, target_table, tgt_cols, key_tgt, keys, KEY_BATCH_SIZE)
+    if err:
+        return None, None, stats, f"Fetch target data: {err}"
+    return src_df.rename(columns=to_tgt), tgt_df, stats, None
+
+
+def _differing_buckets(src_sums, tgt_sums):
+    """Buckets whose row count or checksum differ, and {bucket: (src_count, src_sum, tgt_count, tgt_sum)}."""
+    merged = src_sums.merge(tgt_sums, on="bucket", how="outer", suffixes=("_source", "_target"))
+    signatures = {}
+    differing = []
+    for b, sc, ss, tc, ts in merged[["bucket", "row_count_source", "checksum_source", "row_count_target", "checksum_target"]].itertuples(index=False, name=None):
+        sig = tuple(None if pd.isna(v) else int(v) for v in (sc, ss, tc, ts))
+        signatures[int(b)] = sig
+        if sig[0] != sig[2] or sig[1] != sig[3]:
+            differing.append(int(b))
+    return sorted(differing), signatures
+
+
+def _bucketed_diff(pool, config, src_conn, source_db, source_table, tgt_conn, target_db, target_table, src_cols, tgt_cols, join_cols, options):
+    """
+    Split the key space into buckets (the key modulo N, see bucket_expr, or ranges of a numeric/date key), compare
+    per-bucket row counts and checksums computed in each database, then fetch and compare only the
+    buckets that differ, up to options["bucket_workers"] at a time. Memory is bounded by one bucket per
+    worker. Buckets finished by an earlier run whose checksums are unchanged come from
+    options["bucket_checkpoints"] (a dict, updated as buckets finish), so an interrupted run resumes.
+    Returns (result, error_msg); result has the compare_frames keys plus bucket_stats.
+    """
+    tgt_lower = {c.lower(): c for c in tgt_cols}
+    to_tgt = dict(zip(src_cols, tgt_cols))
+    to_src = dict(zip(tgt_cols, src_cols))
+    key_tgt = [tgt_lower[c.lower()] for c in join_cols if c.lower() in tgt_lower] or tgt_cols[:3]
+    key_src = [to_src[c] for c in key_tgt]
+    n = max(int(options.get("buckets", 64)), 1)
+    strategy = options.get("bucket_strategy", "Hash")
+    tolerance = options.get("tolerance", 0.0)
+    trim_strings = options.get("trim_strings", False)
+    src_kinds, tgt_kinds, differing_kinds, err = _paired_kinds(
+        src_conn, source_db, source_table, src_cols, tgt_conn, target_db, target_table, tgt_cols,
+    )
+    if err:
+        return None, err
+    bounds = None
+    if strategy == "Range":
+        bounds, err = key_range_bounds(src_conn, source_db, source_table, key_src[0], n)
+        if err:
+            return None, f"Bucket ranges: {err}"
+    else:
+        # Each side buckets its own rows; keys of different types would land in different buckets.
+        mixed = [c for c in key_tgt if c in differing_kinds]
+        if mixed:
+            return None, (
+                f"Hash buckets need the same key type on both sides; {', '.join(mixed)} differs. "
+                "Use Range buckets or another compare mode."
+            )
+    src_bucket = bucket_expr(source_db, key_src, n, bounds, src_kinds)
+    tgt_bucket = bucket_expr(target_db, key_tgt, n, bounds, tgt_kinds)
+    src_sums, err = fetch_bucket_checksums(src_conn, source_db, source_table, key_src, src_cols, src_bucket, src_kinds)
+    if err:
+        return None, f"Source bucket checksums: {err}"
+    tgt_sums, err = fetch_bucket_checksums(tgt_conn, target_db, target_table, key_tgt, tgt_cols, tgt_bucket, tgt_kinds)
+    if err:
+        return None, f"Target bucket checksums: {err}"
+    differing, signatures = _differing_buckets(src_sums, tgt_sums)
+
+    layout = (source_db, source_table, target_db, target_table, strategy, n, tuple(key_tgt), tuple(tgt_cols), tuple(map(str, bounds or [])))
+    checkpoints = options.get("bucket_checkpoints")
+    checkpoint = checkpoints.setdefault(layout, {}) if checkpoints is not None else {}
+    resumed = [b for b in differing if b in checkpoint and checkpoint[b]["signature"] == signatures[b]]
+    todo = [b for b in differing if b not in resumed]
+
+    def compare_bucket(b, pair):
+        s_conn, t_conn = pair
+        src_df, err = fetch_bucket_rows(s_conn, source_db, source_table, src_cols, src_bucket, b)
+        if err:
+            return b, None, f"Bucket {b} source: {err}"
+        tgt_df, err = fetch_bucket_rows(t_conn, target_db, target_table, tgt_cols, tgt_bucket, b)
+        if err:
+            return b, None, f"Bucket {b} target: {err}"
+        cmp = compare_frames(
+            src_df.rename(columns=to_tgt), tgt_df, tgt_cols, key_tgt,
+            tolerance=tolerance, trim_strings=trim_strings, rng=np.random.default_rng(),
+        )
+        del src_df, tgt_df
+        return b, {
+            "signature": signatures[b],
+            "join_cols_used": cmp["join_cols_used"],
+            **{k: cmp[k] for k in MISMATCH_STATS},
+            "mismatch_df": cmp["mismatch_df"],
+            "joined_df": cmp["joined_df"],
+        }, None
+
+    # The row's own connections serve the first worker; extra workers take extra pairs from the pool.
+    pairs = queue.Queue()
+    pairs.put((src_conn, tgt_conn))
+    extra = []
+    for _ in range(min(max(int(options.get("bucket_workers", 1)), 1), len(todo)) - 1):
+        s_conn, err = pool.acquire(source_db, config)
+        if err:
+            break
+        t_conn, err = pool.acquire(target_db, config)
+        if err:
+            pool.release(s_conn)
+            break
+        extra.append((s_conn, t_conn))
+        pairs.put((s_conn, t_conn))
+
+    def run(b):
+        pair = pairs.get()
+        try:
+            return compare_bucket(b, pair)
+        except Exception as ex:
+            for conn in pair:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            return b, None, f"Bucket {b}: {ex}"
+        finally:
+            pairs.put(pair)
+
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=len(extra) + 1) as executor:
+            for b, res, err in executor.map(run, todo):
+                if err:
+                    errors.append(err)
+                else:
+                    checkpoint[b] = res
+    finally:
+        for s_conn, t_conn in extra:
+            pool.release(s_conn)
+            pool.release(t_conn)
+
+    acc = MismatchAccumulator([c for c in tgt_cols if c not in key_tgt])
+    for b in differing:
+        res = checkpoint.get(b)
+        if res is not None and res["signature"] == signatures[b]:
+            acc.add(res)
+    matching_rows = sum(sig[0] or 0 for b, sig in signatures.items() if b not in differing)
+    return {
+        **acc.result(),
+        "join_cols_used": key_tgt,
+        "bucket_stats": {
+            "strategy": strategy,
+            "buckets": len(signatures),
+            "matching_buckets": len(signatures) - len(differing),
+            "rows_in_matching_buckets": matching_rows,
+            "differing_buckets": len(differing),
+            "compared_buckets": len(todo) - len(errors),
+            "resumed_buckets": len(resumed),
+            "errors": errors,
+        },
+    }, None
+
+
+def _incremental_diff(config, src_conn, source_db, source_table, tgt_conn, target_db, target_table, src_cols, tgt_cols, join_cols, options):
+    """
+    Compare only rows whose watermark column (options["watermark_column"], e.g. updated_at or load_id)
+    is past the value stored by the previous run, on either side, plus keys that mismatched last time.
+    The first run for a table pair compares everything. State lives in options["state_store"]
+    (recon_state.ReconStateStore). Returns (result, error_msg); result has the compare_frames keys
+    plus incremental_stats.
+    """
+    store = options.get("state_store")
+    if store is None:
+        return None, "Incremental recon needs the recon state store."
+    tgt_lower = {c.lower(): c for c in tgt_cols}
+    to_tgt = dict(zip(src_cols, tgt_cols))
+    to_src = dict(zip(tgt_cols, src_cols))
+    wm_tgt = tgt_lower.get(str(options.get("watermark_column", "")).strip().lower())
+    if wm_tgt is None:
+        return None, f"Watermark column '{options.get('watermark_column', '')}' is not in both tables."
+    wm_src = to_src[wm_tgt]
+    key_tgt = [tgt_lower[c.lower()] for c in join_cols if c.lower() in tgt_lower] or [c for c in tgt_cols if c != wm_tgt][:3]
+    key_src = [to_src[c] for c in key_tgt]
+    pair = store.pair_key(source_db, source_table, target_db, target_table, config)
+    previous = store.get_watermark(pair, wm_tgt)
+    tolerance = options.get("tolerance", 0.0)
+    trim_strings = options.get("trim_strings", False)
+    try:
+        src_hi = column_max(src_conn, source_db, source_table, wm_src)
+        tgt_hi = column_max(tgt_conn, target_db, target_table, wm_tgt)
+        source_rows = count_table_rows(src_conn, source_db, source_table)
+        target_rows = count_table_rows(tgt_conn, target_db, target_table)
+    except Exception as ex:
+        return None, f"Watermark: {ex}"
+
+    if previous is None:
+        src_df, err = fetch_table_data(src_conn, source_db, source_table, src_cols, limit=None)
+        if err:
+            return None, f"Fetch source data: {err}"
+        tgt_df, err = fetch_table_data(tgt_conn, target_db, target_table, tgt_cols, limit=None)
+        if err:
+            return None, f"Fetch target data: {err}"
+        checked = None
+        changed = reopened = 0
+    else:
+        src_keys, err = fetch_keys_since(src_conn, source_db, source_table, key_src, wm_src, previous)
+        if err:
+            return None, f"Changed source keys: {err}"
+        tgt_keys, err = fetch_keys_since(tgt_conn, target_db, target_table, key_tgt, wm_tgt, previous)
+        if err:
+            return None, f"Changed target keys: {err}"
+        open_keys = store.mismatch_keys(pair)
+        by_json = {}
+        for k in list(src_keys) + list(tgt_keys) + open_keys:
+            by_json.setdefault(key_json(k), k)
+        checked = list(by_json.values())
+        changed = len({key_json(k) for k in list(src_keys) + list(tgt_keys)})
+        reopened = len(open_keys)
+        src_df, err = fetch_rows_by_keys(src_conn, source_db, source_table, src_cols, key_src, checked)
+        if err:
+            return None, f"Fetch source data: {err}"
+        tgt_df, err = fetch_rows_by_keys(tgt_conn, target_db, target_table, tgt_cols, key_tgt, checked)
+        if err:
+            return None, f"Fetch target data: {err}"
+
+    cmp = compare_frames(
+        src_df.rename(columns=to_tgt), tgt_df, tgt_cols, key_tgt,
+        tolerance=tolerance, trim_strings=trim_strings, collect_keys=True, rng=np.random.default_rng(),
+    )
+    del src_df, tgt_df
+    if checked is None:
+        store.replace_mismatch_keys(pair, cmp["mismatch_keys"])
+    else:
+        store.update_mismatch_keys(pair, checked, cmp["mismatch_keys"])
+    # The lower of the two maxima: rows the lagging side has not loaded yet are looked at again next run.
+    highs = [v for v in (src_hi, tgt_hi) if v is not None]
+    new_mark = min(highs) if len(highs) == 2 else previous
+    store.set_watermark(pair, wm_tgt, new_mark)
+    stats = {
+        "watermark_column": wm_tgt,
+        "previous_watermark": previous,
+        "new_watermark": new_mark,
+        "full_run": previous is None,
+        "changed_keys": changed,
+        "rechecked_keys": reopened,
+        "open_mismatch_keys": len(store.mismatch_keys(pair)),
+        "source_rows": source_rows,
+        "target_rows": target_rows,
+    }
+    cmp["incremental_stats"] = stats
+    return cmp, None
+
+
+def _profile_diff(src_conn, source_db, source_table, tgt_conn, target_db, target_table, src_cols, tgt_cols, options):
+    """
+    Aggregate both tables in their databases and compare the profiles; no rows are fetched.
+    Returns (profile_df, summary, error_msg).
+    """
+    src_prof, err = profile_table(src_conn, source_db, source_table, src_cols)
+    if err:
+        return None, None, f"Profile source table: {err}"
+    tgt_prof, err = profile_table(tgt_conn, target_db, target_table, tgt_cols)
+    if err:
+        return None, None, f"Profile target table: {err}"
+    profile_df, summary = compare_profiles(
+        src_prof, tgt_prof, dict(zip(src_cols, tgt_cols)),
+        tolerance=options.get("tolerance", 0.0),
+        trim_strings=options.get("trim_strings", False),
+    )
+    return profile_df, summary, None
+
+
+def run_recon_single(source_db, source_table, target_db, target_table, config, pool, options, schema_cache=None):
+    """
+    Run source/target comparison for one row. Returns result dict or error string.
+    options carries join_cols, compare_mode, tolerance and trim_strings (plus buckets, bucket_strategy,
+    bucket_workers and bucket_checkpoints for Bucketed mode; watermark_column and state_store for
+    Incremental mode; out_of_core, spill_dir and memory_limit for Full mode on DuckDB; dtype_backend
+    for Full mode in memory), so this can run on worker threads.
+    pool is anything with acquire(db_type, config) -> (conn, err) and release(conn). schema_cache
+    (db_connector.SchemaCache) skips column discovery for tables seen within its TTL.
+    """
+    result = _recon_pair(source_db, source_table, target_db, target_table, config, pool, options, schema_cache)
+    if "error" in result and schema_cache is not None:
+        # The tables may have changed since their columns were cached; read them again on the next run.
+        schema_cache.invalidate(source_db, config, source_table)
+        schema_cache.invalidate(target_db, config, target_table)
+    return result
+
+
+def _recon_pair(source_db, source_table, target_db, target_table, config, pool, options, schema_cache):
+    join_cols = options.get("join_cols", [])
+    compare_mode = options.get("compare_mode", "Full")
+    src_conn, err = pool.acquire(source_db, config)
+    if err:
+        return {"error": f"Source DB: {err}"}
+    tgt_conn, err = pool.acquire(target_db, config)
+    if err:
+        pool.release(src_conn)
+        return {"error": f"Target DB: {err}"}
+    try:
+        src_cols, err = get_table_columns(src_conn, source_db, source_table, schema_cache, config)
+        if err:
+            return {"error": f"Source table columns: {err}"}
+        tgt_cols, err = get_table_columns(tgt_conn, target_db, target_table, schema_cache, config)
+        if err:
+            return {"error": f"Target table columns: {err}"}
+        tgt_lower = {c.lower(): c for c in tgt_cols}
+        matching = []
+        not_in_target = []
+        for c in src_cols:
+            if c.lower() in tgt_lower:
+                matching.append(tgt_lower[c.lower()])
+            else:
+                not_in_target.append(c)
+        src_df, tgt_df = pd.DataFrame(), pd.DataFrame()
+        mismatch_head = pd.DataFrame()
+        joined_head = pd.DataFrame()
+        join_cols_used = []
+        hash_stats = None
+        mismatch_stats = None
+        profile_df = None
+        profile_stats = None
+        bucket_stats = None
+        incremental_stats = None
+        merge_stats = None
+        if matching:
+            matching_src_cols = [c for c in src_cols if c.lower() in tgt_lower]
+            if compare_mode == "Incremental":
+                res, err = _incremental_diff(
+                    config, src_conn, source_db, source_table, tgt_conn, target_db, target_table,
+                    matching_src_cols, matching, join_cols, options,
+                )
+                if err:
+                    return {"error": err}
+                join_cols_used = res["join_cols_used"]
+                mismatch_head = res["mismatch_df"]
+                joined_head = res["joined_df"]
+                mismatch_stats = {k: res[k] for k in MISMATCH_STATS}
+                incremental_stats = res["incremental_stats"]
+            elif compare_mode == "Bucketed":
+                res, err = _bucketed_diff(
+                    pool, config, src_conn, source_db, source_table, tgt_conn, target_db, target_table,
+                    matching_src_cols, matching, join_cols, options,
+                )
+                if err:
+                    return {"error": err}
+                join_cols_used = res["join_cols_used"]
+                mismatch_head = res["mismatch_df"]
+                joined_head = res["joined_df"]
+                mismatch_stats = {k: res[k] for k in MISMATCH_STATS}
+                bucket_stats = res["bucket_stats"]
+            elif compare_mode == "Profile":
+                profile_df, profile_stats, err = _profile_diff(
+                    src_conn, source_db, source_table, tgt_conn, target_db, target_table,
+                    matching_src_cols, matching, options,
+                )
+                if err:
+                    return {"error": err}
+            elif compare_mode == "Hash":
+                src_df, tgt_df, hash_stats, err = _fetch_hash_diff(
+                    src_conn, source_db, source_table, tgt_conn, target_db, target_table,
+                    matching_src_cols, matching, join_cols,
+                )
+                if err:
+                    return {"error": err}
+            elif compare_mode == "Merge":
+                res, err = compare_tables_sorted(
+                    src_conn, source_db, source_table, matching_src_cols, tgt_conn, target_db, target_table, matching,
+                    join_cols, tolerance=options.get("tolerance", 0.0), trim_strings=options.get("trim_strings", False),
+                )
+                if err:
+                    return {"error": err}
+                src_df, tgt_df = res["source_head"], res["target_head"]
+                join_cols_used = res["join_cols_used"]
+                mismatch_head = res["mismatch_df"]
+                joined_head = res["joined_df"]
+                mismatch_stats = {k: res[k] for k in MISMATCH_STATS}
+                merge_stats = res["merge_stats"]
+            elif options.get("out_of_core"):
+                res, err = compare_tables_out_of_core(
+                    src_conn, source_db, source_table, matching_src_cols, tgt_conn, target_db, target_table, matching,
+                    join_cols, tolerance=options.get("tolerance", 0.0), trim_strings=options.get("trim_strings", False),
+                    spill_dir=options.get("spill_dir"), memory_limit=options.get("memory_limit", "2GB"),
+                )
+                if err:
+                    return {"error": err}
+                src_df, tgt_df = res["source_head"], res["target_head"]
+                join_cols_used = res["join_cols_used"]
+                mismatch_head = res["mismatch_df"]
+                joined_head = res["joined_df"]
+                mismatch_stats = {k: res[k] for k in MISMATCH_STATS}
+            else:
+                src_df, err = fetch_table_data(
+                    src_conn, source_db, source_table, matching_src_cols, limit=None, dtype_backend=options.get("dtype_backend"),
+                )
+                if err:
+                    return {"error": f"Fetch source data: {err}"}
+                src_df = src_df if src_df is not None else pd.DataFrame()
+                tgt_df, err = fetch_table_data(
+                    tgt_conn, target_db, target_table, matching, limit=None, dtype_backend=options.get("dtype_backend"),
+                )
+                if err:
+                    return {"error": f"Fetch target data: {err}"}
+                tgt_df = tgt_df if tgt_df is not None else pd.DataFrame()
+            if mismatch_stats is None and (not src_df.empty or not tgt_df.empty):
+                cmp = compare_frames(
+                    src_df, tgt_df, matching, join_cols,
+                    tolerance=options.get("tolerance", 0.0),
+                    trim_strings=options.get("trim_strings", False),
+                    rng=np.random.default_rng(),
+                )
+                join_cols_used = cmp["join_cols_used"]
+                mismatch_head = cmp["mismatch_df"]
+                joined_head = cmp["joined_df"]
+                mismatch_stats = {k: cmp[k] for k in MISMATCH_STATS}
+        return {
+            "source_db": source_db, "source_table": source_table,
+            "target_db": target_db, "target_table": target_table,
+            "matching_columns": matching, "columns_not_in_target": not_in_target,
+            "source_df": src_df.head(10), "target_df": tgt_df.head(10),
+            "mismatch_df": mismatch_head,
+            "joined_df": joined_head,
+            "join_cols_used": join_cols_used,
+            "compare_mode": compare_mode,
+            "hash_stats": hash_stats,
+            "mismatch_stats": mismatch_stats,
+            "profile_df": profile_df,
+            "profile_stats": profile_stats,
+            "bucket_stats": bucket_stats,
+            "incremental_stats": incremental_stats,
+            "merge_stats": merge_stats,
+        }
+    finally:
+        pool.release(src_conn)
+        pool.release(tgt_conn)
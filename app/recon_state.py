@@ -0,0 +1,253 @@
+"""
+Recon state store - per table pair bucket results, watermarks and open mismatch keys in a local SQLite file,
+so later recon runs only re-examine what changed.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from datetime import date, datetime
+from decimal import Decimal
+from numbers import Number
+
+import numpy as np
+import pandas as pd
+
+from db_connector import ConnectionPool
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bucket_results (
+    pair_key TEXT NOT NULL,
+    layout_key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    result TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (pair_key, layout_key, bucket)
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    pair_key TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (pair_key, column_name)
+);
+CREATE TABLE IF NOT EXISTS mismatch_keys (
+    pair_key TEXT NOT NULL,
+    key_json TEXT NOT NULL,
+    kinds TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (pair_key, key_json)
+);
+"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _plain(val):
+    """JSON-safe Python value for a key or watermark (numpy scalars unwrapped, timestamps as ISO text)."""
+    if isinstance(val, np.generic):
+        val = val.item()
+    if isinstance(val, (datetime, date)):
+        return pd.Timestamp(val).isoformat()
+    if isinstance(val, float):
+        if np.isnan(val):
+            return None
+        if val.is_integer():
+            return int(val)  # keys widened to float during normalization compare equal to the int form
+    if val is None or isinstance(val, (bool, int, float, str)):
+        return val
+    return str(val)
+
+
+def key_json(key):
+    """Canonical JSON text of a key tuple."""
+    return json.dumps([_plain(v) for v in key], separators=(",", ":"))
+
+
+def _kind(val):
+    """Stored kind of a key or watermark value: "timestamp", "number" or "text"."""
+    if isinstance(val, np.generic):
+        val = val.item()
+    if isinstance(val, (datetime, date)):
+        return "timestamp"
+    if isinstance(val, Number) and not isinstance(val, bool):
+        return "number"
+    return "text"
+
+
+def _restore(value, kind):
+    """Python value of a stored key part or watermark: Timestamp for timestamps, int or Decimal for numbers in text."""
+    if value is None:
+        return None
+    if kind == "timestamp":
+        return pd.Timestamp(value)
+    if kind == "number" and isinstance(value, str):
+        return int(value) if value.lstrip("-").isdigit() else Decimal(value)
+    return value
+
+
+class _BucketCheckpoint(MutableMapping):
+    """{bucket: result} for one pair and bucket layout, persisted as each bucket finishes. Samples are not kept."""
+
+    def __init__(self, store, pair_key, layout_key):
+        self._store = store
+        self._pair = pair_key
+        self._layout = layout_key
+
+    def __getitem__(self, bucket):
+        row = self._store._one(
+            "SELECT signature, result FROM bucket_results WHERE pair_key = ? AND layout_key = ? AND bucket = ?",
+            (self._pair, self._layout, int(bucket)),
+        )
+        if row is None:
+            raise KeyError(bucket)
+        res = json.loads(row[1])
+        res["signature"] = tuple(json.loads(row[0]))
+        res["mismatch_df"] = pd.DataFrame()
+        res["joined_df"] = pd.DataFrame()
+        return res
+
+    def __setitem__(self, bucket, res):
+        stored = {k: v for k, v in res.items() if k not in ("signature", "mismatch_df", "joined_df")}
+        self._store._execute(
+            "INSERT OR REPLACE INTO bucket_results VALUES (?, ?, ?, ?, ?, ?)",
+            (self._pair, self._layout, int(bucket), json.dumps(list(res["signature"])), json.dumps(stored, default=str), _now()),
+        )
+
+    def __delitem__(self, bucket):
+        self._store._execute(
+            "DELETE FROM bucket_results WHERE pair_key = ? AND layout_key = ? AND bucket = ?",
+            (self._pair, self._layout, int(bucket)),
+        )
+
+    def __iter__(self):
+        rows = self._store._all(
+            "SELECT bucket FROM bucket_results WHERE pair_key = ? AND layout_key = ?", (self._pair, self._layout),
+        )
+        return iter([r[0] for r in rows])
+
+    def __len__(self):
+        return self._store._one(
+            "SELECT COUNT(*) FROM bucket_results WHERE pair_key = ? AND layout_key = ?", (self._pair, self._layout),
+        )[0]
+
+
+class BucketCheckpoints:
+    """Drop-in for the bucket_checkpoints dict of Bucketed recon: setdefault(layout, {}) returns a persisted checkpoint."""
+
+    def __init__(self, store, config):
+        self._store = store
+        self._config = config
+
+    def setdefault(self, layout, default=None):
+        pair = self._store.pair_key(layout[0], layout[1], layout[2], layout[3], self._config)
+        layout_key = hashlib.sha256(json.dumps(list(layout), default=str).encode("utf-8")).hexdigest()
+        return _BucketCheckpoint(self._store, pair, layout_key)
+
+
+class ReconStateStore:
+    """
+    SQLite file holding recon state per (source, target) table pair: bucket results with the checksums
+    they were computed from, watermark values and keys that mismatched last time.
+    Safe to share across threads and sessions.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        if "kinds" not in {r[1] for r in self._conn.execute("PRAGMA table_info(mismatch_keys)")}:
+            # State file from before key kinds were stored; its keys come back as stored.
+            self._conn.execute("ALTER TABLE mismatch_keys ADD COLUMN kinds TEXT NOT NULL DEFAULT '[]'")
+        self._conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _executemany(self, sql, rows):
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def _one(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _all(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def pair_key(source_db, source_table, target_db, target_table, config):
+        """Key of a table pair, including which source/target connection configs it was run against."""
+        raw = "|".join([
+            ConnectionPool.pool_key(source_db, config), source_table.strip(),
+            ConnectionPool.pool_key(target_db, config), target_table.strip(),
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def bucket_checkpoints(self, config):
+        """Persisted replacement for the session bucket_checkpoints dict of Bucketed recon."""
+        return BucketCheckpoints(self, config)
+
+    # Watermarks
+
+    def get_watermark(self, pair_key, column):
+        """Last stored watermark value for column (int, float, Timestamp or str), or None."""
+        row = self._one("SELECT value, kind FROM watermarks WHERE pair_key = ? AND column_name = ?", (pair_key, column))
+        if row is None:
+            return None
+        return _restore(*row)
+
+    def set_watermark(self, pair_key, column, value):
+        if value is None:
+            return
+        if isinstance(value, np.generic):
+            value = value.item()
+        kind = _kind(value)
+        stored = pd.Timestamp(value).isoformat() if kind == "timestamp" else str(value)
+        self._execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?, ?)", (pair_key, column, stored, kind, _now()))
+
+    # Mismatch keys
+
+    def mismatch_keys(self, pair_key):
+        """
+        Keys that mismatched in earlier runs and have not been seen matching since, as tuples of the
+        types they were stored from (Timestamp, int or Decimal, text), ready to bind.
+        """
+        rows = self._all("SELECT key_json, kinds FROM mismatch_keys WHERE pair_key = ?", (pair_key,))
+        keys = []
+        for key, kinds in rows:
+            values, kinds = json.loads(key), json.loads(kinds)
+            keys.append(tuple(_restore(v, k) for v, k in zip(values, kinds or [None] * len(values))))
+        return keys
+
+    def update_mismatch_keys(self, pair_key, checked, mismatched):
+        """Drop checked keys that now match, add or refresh the ones that mismatch."""
+        now = _now()
+        mismatched_json = {key_json(k): json.dumps([_kind(v) for v in k]) for k in mismatched}
+        resolved = [(pair_key, key_json(k)) for k in checked if key_json(k) not in mismatched_json]
+        self._executemany("DELETE FROM mismatch_keys WHERE pair_key = ? AND key_json = ?", resolved)
+        self._executemany(
+            "INSERT INTO mismatch_keys (pair_key, key_json, kinds, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (pair_key, key_json) DO UPDATE SET last_seen = excluded.last_seen",
+            [(pair_key, k, kinds, now, now) for k, kinds in mismatched_json.items()],
+        )
+
+    def replace_mismatch_keys(self, pair_key, mismatched):
+        """Forget all stored keys for the pair and store mismatched (after a full compare)."""
+        self._execute("DELETE FROM mismatch_keys WHERE pair_key = ?", (pair_key,))
+        self.update_mismatch_keys(pair_key, [], mismatched)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
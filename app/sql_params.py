@@ -0,0 +1,207 @@
+"""
+Bind parameters - generated SQL carries its values as bind parameters in the driver's paramstyle instead
+of inlined literals, and cursors are kept open per connection and statement, so a statement run again
+with new values is not parsed again (Oracle shared pool, SQL Server and Netezza plan caches).
+"""
+import re
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from numbers import Number
+
+import numpy as np
+import pandas as pd
+
+_MARK = re.compile("\x00(\\d+)\x00")
+
+# Placeholder for the i-th bind value per DB-API paramstyle.
+_PLACEHOLDERS = {
+    "qmark": lambda i: "?",
+    "numeric": lambda i: f":{i + 1}",
+    "named": lambda i: f":p{i}",
+    "format": lambda i: "%s",
+    "pyformat": lambda i: f"%(p{i})s",
+    "dollar": lambda i: f"${i + 1}",  # not a DB-API style; libpq placeholders, used by ADBC PostgreSQL
+}
+_NAMED = ("named", "pyformat")
+
+# Paramstyle of the usual driver per database, for connections whose module does not declare one.
+_DEFAULT_PARAMSTYLE = {
+    "Oracle": "named",
+    "SQL Server": "qmark",
+    "Netezza": "qmark",
+    "Snowflake": "pyformat",
+    "PostgreSQL": "pyformat",
+    "MySQL": "pyformat",
+}
+
+
+def sql_literal(val):
+    """Render a Python value as a SQL literal. Returns None for NULL/NaN."""
+    if val is None:
+        return None
+    try:
+        if pd.isna(val):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if isinstance(val, bool):
+        return "1" if val else "0"
+    if isinstance(val, (datetime, date)):
+        return "'" + str(val) + "'"
+    if isinstance(val, (Number, Decimal)):
+        return str(val)
+    return "'" + str(val).replace("'", "''") + "'"
+
+
+def bind_value(val):
+    """Plain Python value for a driver bind: numpy scalars unwrapped, timestamps as datetime, NaN/NaT as None."""
+    if isinstance(val, np.datetime64):
+        val = pd.Timestamp(val)
+    if isinstance(val, pd.Timestamp):
+        return None if pd.isna(val) else val.to_pydatetime()
+    if isinstance(val, np.generic):
+        val = val.item()
+    try:
+        if pd.isna(val):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return val
+
+
+def padded(items, cap=None):
+    """
+    items with the last one repeated up to the next power of two (at most cap), so IN lists and OR
+    chains of varying length produce a handful of distinct statements instead of one per length.
+    """
+    n = 1
+    while n < len(items):
+        n *= 2
+    if cap is not None:
+        n = min(n, max(cap, len(items)))
+    return list(items) + [items[-1]] * (n - len(items)) if items else []
+
+
+class Statement:
+    """Generated SQL with bind markers and their values. str() shows the SQL with the values inlined."""
+
+    __slots__ = ("text", "values")
+
+    def __init__(self, text, values=()):
+        self.text = text
+        self.values = tuple(values)
+
+    def render(self, paramstyle):
+        """(sql, params) for cursor.execute in the given DB-API paramstyle; params is None without binds."""
+        if not self.values:
+            return self.text, None
+        text = self.text.replace("%", "%%") if paramstyle in ("format", "pyformat") else self.text
+        placeholder = _PLACEHOLDERS[paramstyle]
+        if paramstyle in _NAMED:
+            return _MARK.sub(lambda m: placeholder(int(m.group(1))), text), {f"p{i}": v for i, v in enumerate(self.values)}
+        order = []
+
+        def positional(m):
+            order.append(self.values[int(m.group(1))])
+            return placeholder(len(order) - 1)
+        return _MARK.sub(positional, text), order
+
+    def __str__(self):
+        return _MARK.sub(lambda m: sql_literal(self.values[int(m.group(1))]) or "NULL", self.text)
+
+    def __repr__(self):
+        return f"Statement({str(self)!r})"
+
+
+class Binds:
+    """Collects bind values while SQL text is composed: add(value) returns the marker to put in the text."""
+
+    def __init__(self):
+        self.values = []
+
+    def add(self, value):
+        self.values.append(bind_value(value))
+        return f"\x00{len(self.values) - 1}\x00"
+
+    def statement(self, sql):
+        return Statement(sql, self.values)
+
+
+_paramstyles = {}
+
+
+def paramstyle(conn, db_type):
+    """DB-API paramstyle of the driver module conn comes from, else the usual one for db_type."""
+    cls = type(conn)
+    style = _paramstyles.get(cls)
+    if style is None:
+        parts = cls.__module__.split(".")
+        for i in range(len(parts), 0, -1):
+            style = getattr(sys.modules.get(".".join(parts[:i])), "paramstyle", None)
+            if style in _PLACEHOLDERS:
+                break
+        else:
+            style = None
+        if style is not None:
+            _paramstyles[cls] = style
+    return style or _DEFAULT_PARAMSTYLE.get(db_type, "qmark")
+
+
+class CursorCache:
+    """
+    Open cursors per connection keyed by SQL text. Running a statement again on the cursor that
+    prepared it lets the driver skip the prepare (pyodbc, oracledb, nzpy). A cursor is checked out
+    while in use, so concurrent runs of one statement get their own. Cached cursors hold their
+    connection, so the id() keys cannot be reused while an entry exists.
+    """
+
+    def __init__(self, per_connection=16, connections=64):
+        self.per_connection = per_connection
+        self.connections = connections
+        self._lock = threading.Lock()
+        self._cursors = OrderedDict()
+
+    def checkout(self, conn, sql):
+        """A cached cursor that last ran sql on conn, or None."""
+        with self._lock:
+            cur = self._cursors.get(id(conn), {}).pop(sql, None)
+        if cur is not None and getattr(cur, "connection", conn) is not conn:
+            _close_cursor(cur)
+            return None
+        return cur
+
+    def checkin(self, conn, sql, cur):
+        """Keep cur for the next run of sql on conn; the least recently used cursors are closed."""
+        evicted = []
+        with self._lock:
+            cursors = self._cursors.setdefault(id(conn), OrderedDict())
+            self._cursors.move_to_end(id(conn))
+            if sql in cursors:
+                evicted.append(cursors.pop(sql))
+            cursors[sql] = cur
+            while len(cursors) > self.per_connection:
+                evicted.append(cursors.popitem(last=False)[1])
+            while len(self._cursors) > self.connections:
+                evicted.extend(self._cursors.popitem(last=False)[1].values())
+        for c in evicted:
+            _close_cursor(c)
+
+    def forget(self, conn):
+        """Close and drop every cached cursor of conn (call before closing it)."""
+        with self._lock:
+            cursors = self._cursors.pop(id(conn), {})
+        for c in cursors.values():
+            _close_cursor(c)
+
+
+def _close_cursor(cur):
+    try:
+        cur.close()
+    except Exception:
+        pass
+
+
+CURSORS = CursorCache()
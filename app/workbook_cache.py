@@ -0,0 +1,187 @@
+"""
+Workbook cache - parsed Excel sheets keyed by file content (or path, mtime and size), shared across sessions.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (parquet engine for the spill directory)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DEFAULT_MAX_MB = 512
+
+
+def content_key(data):
+    """Cache key for workbook bytes (uploads, SharePoint downloads)."""
+    return "sha256:" + hashlib.sha256(data).hexdigest()
+
+
+def path_key(path):
+    """Cache key for a workbook on disk: resolved path, mtime and size, so an edited file is a new key."""
+    p = Path(path)
+    st = p.stat()
+    raw = f"{p.resolve()}|{st.st_mtime_ns}|{st.st_size}"
+    return "path:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _frame_bytes(df):
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
+
+
+class WorkbookCache:
+    """
+    Size-bounded LRU of parsed sheets. Entries are (workbook key, sheet name) -> DataFrame, so sheets
+    are cached one at a time as they are parsed; the sheet order of each workbook is kept separately.
+    With spill_dir set, sheets are also written there as Parquet and read back after eviction or a
+    restart. Returned frames are shared: treat them as read-only.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir and PARQUET_AVAILABLE else None
+        self._sheets = OrderedDict()
+        self._names = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    # Spill directory
+
+    def _spill_path(self, key):
+        return self.spill_dir / key.replace(":", "_") if self.spill_dir else None
+
+    def _read_manifest(self, key):
+        d = self._spill_path(key)
+        if d is None or not (d / "manifest.json").exists():
+            return None
+        try:
+            return json.loads((d / "manifest.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, key, manifest):
+        (self._spill_path(key) / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    def _spill_names(self, key, names):
+        if self.spill_dir is None or self._read_manifest(key) is not None:
+            return
+        try:
+            with self._spill_lock:
+                self._spill_path(key).mkdir(parents=True, exist_ok=True)
+                self._write_manifest(key, {"sheets": names, "files": {}})
+        except OSError:
+            pass
+
+    def _spill_sheet(self, key, sheet, df):
+        """Write a sheet if it survives a Parquet round trip unchanged; otherwise it stays memory-only."""
+        manifest = self._read_manifest(key)
+        if manifest is None or sheet in manifest["files"] or sheet not in manifest["sheets"]:
+            return
+        f = self._spill_path(key) / f"{manifest['sheets'].index(sheet)}.parquet"
+        try:
+            df.to_parquet(f)
+            if not pd.read_parquet(f).equals(df):
+                f.unlink(missing_ok=True)
+                return
+            with self._spill_lock:
+                manifest = self._read_manifest(key)
+                manifest["files"][sheet] = f.name
+                self._write_manifest(key, manifest)
+        except Exception:
+            pass
+
+    def _unspill(self, key, sheet):
+        manifest = self._read_manifest(key)
+        if not manifest or sheet not in manifest.get("files", {}):
+            return None
+        try:
+            return pd.read_parquet(self._spill_path(key) / manifest["files"][sheet])
+        except Exception:
+            return None
+
+    # Memory LRU
+
+    def _put(self, key, sheet, df):
+        nbytes = _frame_bytes(df)
+        old = self._sheets.pop((key, sheet), None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._sheets[(key, sheet)] = (df, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes and len(self._sheets) > 1:
+            _, (_, evicted) = self._sheets.popitem(last=False)
+            self._bytes -= evicted
+
+    def sheet_names(self, key):
+        """Sheet names of a cached workbook in workbook order, or None."""
+        with self._lock:
+            if key in self._names:
+                return list(self._names[key])
+        manifest = self._read_manifest(key)
+        return list(manifest["sheets"]) if manifest else None
+
+    def get_sheet(self, key, sheet):
+        """Cached sheet or None. Spilled sheets are promoted back into memory."""
+        with self._lock:
+            hit = self._sheets.get((key, sheet))
+            if hit is not None:
+                self._sheets.move_to_end((key, sheet))
+                return hit[0]
+        df = self._unspill(key, sheet)
+        if df is not None:
+            with self._lock:
+                self._put(key, sheet, df)
+        return df
+
+    def get_workbook(self, key):
+        """All sheets of a cached workbook as {sheet: DataFrame}, or None if any sheet is missing."""
+        names = self.sheet_names(key)
+        if names is None:
+            return None
+        sheets = {}
+        for name in names:
+            df = self.get_sheet(key, name)
+            if df is None:
+                return None
+            sheets[name] = df
+        return sheets
+
+    def put_sheet_names(self, key, names):
+        """Record a workbook's sheet order (cheap listing, before any sheet is parsed)."""
+        with self._lock:
+            self._names[key] = list(names)
+        self._spill_names(key, list(names))
+
+    def put_sheet(self, key, sheet, df):
+        """Cache one parsed sheet (and spill it when a spill directory is configured)."""
+        with self._lock:
+            self._put(key, sheet, df)
+        self._spill_sheet(key, sheet, df)
+
+    def clear(self):
+        with self._lock:
+            self._sheets.clear()
+            self._names.clear()
+            self._bytes = 0
+
+
+def cache_from_config(config):
+    """WorkbookCache from a config "workbook_cache" section ({"max_mb", "spill_dir"}); defaults when absent."""
+    cfg = (config or {}).get("workbook_cache", {})
+    spill_dir = cfg.get("spill_dir")
+    if spill_dir:
+        spill_dir = os.path.expandvars(os.path.expanduser(spill_dir))
+    return WorkbookCache(max_bytes=int(cfg.get("max_mb", DEFAULT_MAX_MB)) * 1024 * 1024, spill_dir=spill_dir)
@@ -0,0 +1,90 @@
+"""
+Workbook loader - lists sheet names cheaply and parses each sheet only when it is first used.
+"""
+import io
+import threading
+from collections.abc import Mapping
+
+import pandas as pd
+
+from workbook_cache import WorkbookCache
+
+try:
+    import python_calamine  # noqa: F401  (Rust reader, used through pandas engine="calamine")
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+
+def excel_engine():
+    """Fastest available read_excel engine; None lets pandas pick (read-only openpyxl for .xlsx)."""
+    return "calamine" if CALAMINE_AVAILABLE else None
+
+
+class LazyWorkbook(Mapping):
+    """
+    Read-only {sheet name: DataFrame} over an Excel file (path or bytes). Sheet names come from the
+    workbook index without reading any cells; a sheet is parsed on first access and kept in the
+    shared WorkbookCache under key, so other sessions loading the same file reuse it.
+    """
+
+    def __init__(self, source, key, cache=None):
+        self.key = key
+        self._source = source
+        self._cache = cache if cache is not None else WorkbookCache()
+        self._excel = None
+        self._lock = threading.Lock()
+
+    def _excel_file(self):
+        if self._excel is None:
+            src = io.BytesIO(self._source) if isinstance(self._source, (bytes, bytearray)) else self._source
+            engine = excel_engine()
+            try:
+                self._excel = pd.ExcelFile(src, engine=engine)
+            except Exception:
+                if engine is None:
+                    raise
+                if isinstance(src, io.BytesIO):
+                    src.seek(0)
+                self._excel = pd.ExcelFile(src)
+        return self._excel
+
+    @property
+    def sheet_names(self):
+        names = self._cache.sheet_names(self.key)
+        if names is None:
+            with self._lock:
+                names = list(self._excel_file().sheet_names)
+            self._cache.put_sheet_names(self.key, names)
+        return names
+
+    def __getitem__(self, sheet):
+        if sheet not in self.sheet_names:
+            raise KeyError(sheet)
+        df = self._cache.get_sheet(self.key, sheet)
+        if df is None:
+            with self._lock:
+                df = self._cache.get_sheet(self.key, sheet)
+                if df is None:
+                    df = self._excel_file().parse(sheet)
+                    self._cache.put_sheet(self.key, sheet, df)
+        return df
+
+    def __iter__(self):
+        return iter(self.sheet_names)
+
+    def __len__(self):
+        return len(self.sheet_names)
+
+    def close(self):
+        if self._excel is not None:
+            self._excel.close()
+            self._excel = None
+
+
+def open_workbook(source, key, cache=None):
+    """LazyWorkbook for a path or bytes. Reads only the sheet index up front, so bad files fail here."""
+    wb = LazyWorkbook(source, key, cache)
+    if not wb.sheet_names:
+        raise ValueError("Workbook has no sheets")
+    return wb
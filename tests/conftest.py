@@ -0,0 +1,18 @@
+"""
+Shared fixtures. The app modules import each other by bare name, so app/ goes on sys.path.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from tests.helpers import make_sqlite  # noqa: E402
+
+
+@pytest.fixture
+def sqlite_conn():
+    conn = make_sqlite()
+    yield conn
+    conn.close()
@@ -0,0 +1,39 @@
+"""
+Test helpers: tables live in in-memory SQLite databases spoken to as the Snowflake dialect, with MD5
+and TO_NUMBER registered the way recon_bench.py does.
+"""
+import hashlib
+import sqlite3
+
+DB_TYPE = "Snowflake"
+
+
+def _md5(value):
+    return None if value is None else hashlib.md5(str(value).encode("utf-8")).hexdigest()
+
+
+def make_sqlite(detect_types=0):
+    conn = sqlite3.connect(":memory:", check_same_thread=False, detect_types=detect_types)
+    conn.create_function("MD5", 1, _md5, deterministic=True)
+    conn.create_function("TO_NUMBER", 2, lambda text, fmt: None if text is None else int(text, 16), deterministic=True)
+    return conn
+
+
+def load(conn, table, columns, rows):
+    """Create table with "name TYPE" columns and insert rows."""
+    conn.execute(f'CREATE TABLE "{table}" ({", ".join(columns)})')
+    conn.executemany(f'INSERT INTO "{table}" VALUES ({", ".join("?" * len(columns))})', rows)
+    conn.commit()
+
+
+class SinglePool:
+    """Pool stand-in handing out one connection, like recon_bench._SinglePool."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self, db_type, config):
+        return self.conn, None
+
+    def release(self, conn, discard=False):
+        pass
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from dmc_history import DmcHistoryStore
+
+
+def _result(counts, estimated=None, error=None, table_errors=None):
+    df = pd.DataFrame({"Grouping": ["G"] * len(counts), "tablename": list(counts), "count": list(counts.values())})
+    if estimated is not None:
+        df["estimated"] = [t in estimated for t in counts]
+    return {"sql": "SELECT 1", "df": None if error else df, "error": error, "table_errors": table_errors or {}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DmcHistoryStore(tmp_path / "history.db")
+    yield s
+    s.close()
+
+
+def test_record_and_reload_run(store):
+    run = store.record_run({
+        "H1": _result({"a": 10, "b": 20}, estimated={"b"}, table_errors={"main.c": "boom"}),
+        "H2": _result({}, error="Timed out"),
+    }, label="first")
+    assert store.runs()[0] == {"run_id": run, "run_at": store.runs()[0]["run_at"], "label": "first", "hops": 2, "tables": 2}
+    results = store.hop_results(run)
+    assert list(results) == ["H1", "H2"]
+    assert list(results["H1"]["df"]["count"]) == [10, 20]
+    assert list(results["H1"]["df"]["estimated"]) == [False, True]
+    assert results["H1"]["table_errors"] == {"main.c": "boom"}
+    assert results["H2"]["df"] is None and results["H2"]["error"] == "Timed out"
+
+
+def test_delta_vs_previous_uses_latest_run_that_counted_the_table(store):
+    r1 = store.record_run({"H1": _result({"a": 100, "b": 50})})
+    store.record_run({"H1": _result({"a": 110})})
+    r3 = store.record_run({"H1": _result({"a": 121, "b": 0, "new": 5})})
+    delta = store.delta_vs_previous(r3).set_index("tablename")
+    assert delta.at["a", "previous_count"] == 110 and delta.at["a", "delta"] == 11 and delta.at["a", "pct_change"] == 10.0
+    assert delta.at["b", "previous_count"] == 50 and delta.at["b", "delta"] == -50
+    assert pd.isna(delta.at["new", "previous_count"])
+    base = store.delta_vs_previous(r3, base_run_id=r1).set_index("tablename")
+    assert base.at["a", "delta"] == 21
+
+
+def test_same_table_under_two_groupings_keeps_both_counts(store):
+    def result(rows):
+        df = pd.DataFrame(rows, columns=["Grouping", "tablename", "count"])
+        return {"sql": "SELECT 1", "df": df, "error": None, "table_errors": {}}
+
+    store.record_run({"H1": result([("CASH", "shared", 10), ("CARDS", "shared", 20)])})
+    run = store.record_run({"H1": result([("CASH", "shared", 11), ("CARDS", "shared", 20)])})
+    assert list(store.run_counts(run)["count"]) == [11, 20]
+    delta = store.delta_vs_previous(run).set_index("Grouping")
+    assert list(delta.loc[["CASH", "CARDS"], "previous_count"]) == [10, 20]
+    assert list(delta.loc[["CASH", "CARDS"], "delta"]) == [1, 0]
+
+
+def test_delta_across_hops_by_grouping(store):
+    def hop(rows):
+        df = pd.DataFrame(rows, columns=["Grouping", "tablename", "count"])
+        return {"sql": "SELECT 1", "df": df, "error": None, "table_errors": {}}
+
+    # Shaped like dmc_template.xlsx: each hop names its tables differently and Grouping links them.
+    run = store.record_run({
+        "NZ Export": hop([
+            ("CASH FLOW", "FCB_FIU_AMLSAS_EXP_CASH_FLOW", 30), ("CARDS", "FCB_FIU_AMLSAS_EXP_CARDS", 7),
+            ("CASA", "FCB_FIU_AMLSAS_EXP_CASA", 4),
+        ]),
+        "EDW Stage": hop([
+            ("CASH FLOW", "STG_FSC_CASH_FLOW_FCB", 30), ("CARDS", "STG_CARDS_PAYMENT_TXNS", 6),
+            ("CASA", "STG_CASA_ACCOUNTS", None),
+        ]),
+        "AMLSAS Stage": hop([
+            ("CASH FLOW", "FCB_FIU_AMLSAS_STG_CASH_FLOW", 20), ("CASH FLOW", "FCB_FIU_AMLSAS_AUDIT_CASH_FLOW", 10),
+            ("FOTP", "FCB_FIU_AMLSAS_AUDIT_FOTP", 3),
+        ]),
+    })
+    across = store.delta_across_hops(run).set_index("Grouping")
+    assert list(across.index) == ["CASH FLOW", "CARDS", "CASA"]
+    assert list(across.columns[:3]) == ["NZ Export", "EDW Stage", "AMLSAS Stage"]
+    assert list(across.loc["CASH FLOW", ["NZ Export", "EDW Stage", "AMLSAS Stage"]]) == [30, 30, 30]
+    assert across.loc["CARDS", "spread"] == 1 and not across.loc["CARDS", "match"]
+    assert pd.isna(across.loc["CASA", "EDW Stage"])  # STG_CASA_ACCOUNTS was not counted
+    assert pd.isna(across.loc["CASA", "spread"]) and not across.loc["CASA", "match"]
+    assert across.loc["CASH FLOW", "match"]
+
+
+def test_purge_drops_old_runs(store):
+    old = store.record_run({"H1": _result({"a": 1})})
+    store._conn.execute("UPDATE runs SET run_at = '2000-01-01T00:00:00' WHERE run_id = ?", (old,))
+    new = store.record_run({"H1": _result({"a": 2})})
+    store.purge(keep_days=30)
+    assert [r["run_id"] for r in store.runs()] == [new]
+    assert store.run_counts(old).empty
+    assert pd.isna(store.delta_vs_previous(new).at[0, "previous_count"])
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+
+import pandas as pd
+
+from db_connector import fetch_catalog_row_counts
+from dmc_runner import _count_batches, _run_hop, dmc_tables
+from tests.helpers import DB_TYPE, load
+
+
+class FilePool:
+    """One SQLite connection per acquire on a shared file, counting the statements run."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.acquired = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, db_type, config):
+        with self._lock:
+            self.acquired += 1
+        return sqlite3.connect(self.path, check_same_thread=False), None
+
+    def release(self, conn, discard=False):
+        conn.close()
+
+
+def _pool(tmp_path, tables):
+    path = tmp_path / "dmc.db"
+    conn = sqlite3.connect(path)
+    for name, rows in tables.items():
+        conn.execute(f'CREATE TABLE "{name}" (a INTEGER)')
+        conn.executemany(f'INSERT INTO "{name}" VALUES (?)', [(i,) for i in range(rows)])
+    conn.commit()
+    conn.close()
+    return FilePool(path)
+
+
+def _entries(names):
+    return [{"schema": "main", "table": n, "filter": None, "exact": False} for n in names]
+
+
+def _counts(frames):
+    df = pd.concat(frames, ignore_index=True)
+    return dict(zip(df.iloc[:, 0], df.iloc[:, 1]))
+
+
+def test_count_batches_counts_every_batch(tmp_path):
+    pool = _pool(tmp_path, {f"t{i}": i for i in range(6)})
+    entries = _entries([f"t{i}" for i in range(6)])
+    frames, errors = _count_batches(pool, DB_TYPE, {}, [entries[:4], entries[4:]], 2, {"statements": {}})
+    assert errors == {}
+    assert _counts(frames) == {f"t{i}": i for i in range(6)}
+    assert pool.acquired == 2
+
+
+def test_failed_batch_is_split_until_the_bad_table_fails_alone(tmp_path):
+    pool = _pool(tmp_path, {f"t{i}": i for i in range(7)})
+    entries = _entries(["t0", "t1", "t2", "missing", "t3", "t4", "t5", "t6"])
+    frames, errors = _count_batches(pool, DB_TYPE, {}, [entries], 4, {"statements": {}})
+    assert list(errors) == ["main.missing"]
+    assert "missing" in errors["main.missing"]
+    assert _counts(frames) == {f"t{i}": i for i in range(7)}
+    # 8 tables -> 1 + 2 + 2 + 2 statements: the bad half is split down to one table, the good halves run once.
+    assert pool.acquired == 7
+
+
+def test_cancelled_hop_does_not_retry(tmp_path):
+    pool = _pool(tmp_path, {"t0": 1})
+    frames, errors = _count_batches(pool, DB_TYPE, {}, [_entries(["t0", "missing"])], 2, {"statements": {}, "timed_out": True})
+    assert frames == []
+    assert set(errors) == {"main.t0", "main.missing"}
+    assert pool.acquired == 0
+
+
+def test_run_hop_reports_table_errors_and_keeps_workbook_order(tmp_path):
+    pool = _pool(tmp_path, {"b": 2, "a": 1, "c": 3})
+    sheet = pd.DataFrame({
+        "Hop Name": ["H1"] * 4, "Schema Name": ["main"] * 4, "Table Name": ["c", "missing", "a", "b"],
+        "Grouping": ["G"] * 4,
+    })
+    tables, grouping, err = dmc_tables(sheet)
+    assert err is None
+    res = _run_hop(pool, "H1", "", {"database_type": DB_TYPE}, grouping, {"statements": {}}, tables["H1"], batch_size=2, parallel_batches=2)
+    assert res["error"] is None
+    assert list(res["df"]["tablename"]) == ["c", "a", "b"]
+    assert list(res["df"]["count"]) == [3, 1, 2]
+    assert list(res["table_errors"]) == ["main.missing"]
+
+
+def test_catalog_counts_without_statistics_time_honour_max_age(sqlite_conn):
+    load(sqlite_conn, "_V_TABLE", ["SCHEMA TEXT", "TABLENAME TEXT", "RELTUPLES INTEGER", "OBJTYPE TEXT"], [
+        ("ADMIN", "A", 10, "TABLE"), ("ADMIN", "B", 20, "TABLE"),
+    ])
+    tables = [("ADMIN", "A"), ("ADMIN", "B")]
+    counts, err = fetch_catalog_row_counts(sqlite_conn, "Netezza", tables)
+    assert err is None and counts == {("ADMIN", "A"): (10, True), ("ADMIN", "B"): (20, True)}
+    # Netezza has no statistics time, so an age limit leaves every table to COUNT(*).
+    counts, err = fetch_catalog_row_counts(sqlite_conn, "Netezza", tables, max_age_days=7)
+    assert err is None and counts == {}
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from jobs import ACTIVE, JobRunner
+
+
+@pytest.fixture
+def runner(tmp_path):
+    return JobRunner(tmp_path / "jobs.db", tmp_path / "results", max_workers=2)
+
+
+def _wait(runner, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = runner.get(job_id)
+        if job["status"] not in ACTIVE:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {runner.get(job_id)['status']}")
+
+
+def test_submit_runs_job_and_keeps_result(runner):
+    def work(job):
+        job.progress(0.5, "half way")
+        return {"rows": [1, 2, 3]}
+
+    job_id = runner.submit("Recon", "a -> b", work)
+    job = _wait(runner, job_id)
+    assert job["status"] == "done" and job["progress"] == 1.0 and job["error"] is None
+    assert job["kind"] == "Recon" and job["label"] == "a -> b"
+    assert runner.result(job_id) == {"rows": [1, 2, 3]}
+    assert [j["job_id"] for j in runner.recent("Recon")] == [job_id]
+    assert runner.recent("DMC") == []
+
+
+def test_failed_job_records_error(runner):
+    def work(job):
+        raise ValueError("no such table")
+
+    job = _wait(runner, runner.submit("DMC", "hops", work))
+    assert job["status"] == "failed" and job["error"] == "no such table"
+    assert runner.result(job["job_id"]) is None
+
+
+def test_cancel_stops_job_between_units_of_work(runner):
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+            time.sleep(0.01)
+
+    job_id = runner.submit("Orchestrator", "sheet", work)
+    assert started.wait(10)
+    assert runner.cancel(job_id)
+    job = _wait(runner, job_id)
+    assert job["status"] == "cancelled" and job["message"] == "Cancelled"
+    assert runner.result(job_id) is None
+    assert not runner.cancel(job_id)
+
+
+def test_restart_marks_running_jobs_interrupted(runner, tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def work(job):
+        started.set()
+        release.wait(10)
+
+    job_id = runner.submit("Recon", "slow", work)
+    assert started.wait(10)
+    restarted = JobRunner(tmp_path / "jobs.db", tmp_path / "results")
+    job = restarted.get(job_id)
+    assert job["status"] == "interrupted" and job["finished_at"] is not None
+    assert "stopped" in job["error"]
+    assert not restarted.cancel(job_id)
+    release.set()
+    _wait(runner, job_id)
+
+
+def test_purge_drops_old_jobs_and_results(runner):
+    job_id = runner.submit("DMC", "old", lambda job: "counts")
+    _wait(runner, job_id)
+    runner._execute("UPDATE jobs SET finished_at = '2000-01-01T00:00:00' WHERE job_id = ?", (job_id,))
+    runner.purge(keep_days=7)
+    assert runner.get(job_id) is None
+    assert runner.result(job_id) is None
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from recon_compare import compare_frames
+from recon_runner import _bucketed_diff, _differing_buckets
+from recon_state import ReconStateStore
+from tests.helpers import DB_TYPE, SinglePool, load
+
+COLS = ["id", "v"]
+TOTALS = ("mismatched_rows", "rows_compared", "source_only_rows", "target_only_rows")
+
+
+def _run(conn, **options):
+    return _bucketed_diff(
+        SinglePool(conn), {}, conn, DB_TYPE, "src", conn, DB_TYPE, "tgt", COLS, COLS, ["id"],
+        {"buckets": 8, "bucket_workers": 1, **options},
+    )
+
+
+def _frames(conn):
+    return (pd.read_sql('SELECT * FROM "src"', conn), pd.read_sql('SELECT * FROM "tgt"', conn))
+
+
+def test_differing_buckets():
+    src = pd.DataFrame({"bucket": [0, 1, 2], "row_count": [5, 5, 5], "checksum": [10, 20, 30]})
+    tgt = pd.DataFrame({"bucket": [0, 1, 3], "row_count": [5, 4, 1], "checksum": [10, 20, 7]})
+    differing, signatures = _differing_buckets(src, tgt)
+    assert differing == [1, 2, 3]
+    assert signatures[0] == (5, 10, 5, 10)
+    assert signatures[2] == (5, 30, None, None)
+
+
+def test_integer_and_real_keys_share_buckets(sqlite_conn):
+    rows = [(i, f"v{i}") for i in range(-20, 80)]
+    load(sqlite_conn, "src", ["id INTEGER", "v TEXT"], rows)
+    load(sqlite_conn, "tgt", ["id REAL", "v TEXT"], rows)
+    res, err = _run(sqlite_conn)
+    assert err is None
+    assert res["bucket_stats"]["differing_buckets"] == 0
+    assert res["bucket_stats"]["rows_in_matching_buckets"] == 100
+    assert res["bucket_stats"]["buckets"] <= 8
+
+
+@pytest.mark.parametrize("strategy", ["Hash", "Range"])
+def test_bucketed_totals_match_full_compare(sqlite_conn, strategy):
+    load(sqlite_conn, "src", ["id INTEGER", "v TEXT"], [(i, f"v{i}") for i in range(100)])
+    load(sqlite_conn, "tgt", ["id REAL", "v TEXT"], [(i, "x" if i % 17 == 0 else f"v{i}") for i in range(5, 105)])
+    res, err = _run(sqlite_conn, bucket_strategy=strategy)
+    assert err is None
+    expected = compare_frames(*_frames(sqlite_conn), COLS, ["id"])
+    # Rows of buckets whose checksums match are counted, not compared.
+    res["rows_compared"] += res["bucket_stats"]["rows_in_matching_buckets"]
+    assert {k: res[k] for k in TOTALS} == {k: expected[k] for k in TOTALS}
+
+
+def test_hash_buckets_refuse_keys_of_different_types(sqlite_conn):
+    load(sqlite_conn, "src", ["id INTEGER", "v TEXT"], [(i, "a") for i in range(5)])
+    load(sqlite_conn, "tgt", ["id TEXT", "v TEXT"], [(str(i), "a") for i in range(5)])
+    res, err = _run(sqlite_conn)
+    assert res is None
+    assert "id" in err and "Range" in err
+
+
+def test_checkpoints_resume_finished_buckets(sqlite_conn, tmp_path):
+    load(sqlite_conn, "src", ["id INTEGER", "v TEXT"], [(i, f"v{i}") for i in range(40)])
+    load(sqlite_conn, "tgt", ["id INTEGER", "v TEXT"], [(i, "x" if i % 5 == 0 else f"v{i}") for i in range(40)])
+    store = ReconStateStore(tmp_path / "state.db")
+    try:
+        first, err = _run(sqlite_conn, bucket_checkpoints=store.bucket_checkpoints({}))
+        assert err is None
+        assert first["bucket_stats"]["resumed_buckets"] == 0
+        second, err = _run(sqlite_conn, bucket_checkpoints=store.bucket_checkpoints({}))
+        assert err is None
+        assert second["bucket_stats"]["compared_buckets"] == 0
+        assert second["bucket_stats"]["resumed_buckets"] == first["bucket_stats"]["differing_buckets"] > 0
+        assert {k: second[k] for k in TOTALS} == {k: first[k] for k in TOTALS}
+        assert first["mismatched_rows"] == 8
+
+        sqlite_conn.execute('UPDATE "tgt" SET v = \'y\' WHERE id = 1')
+        third, err = _run(sqlite_conn, bucket_checkpoints=store.bucket_checkpoints({}))
+        assert err is None
+        assert third["bucket_stats"]["compared_buckets"] >= 1
+        assert third["mismatched_rows"] == 9
+    finally:
+        store.close()
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from recon_compare import MismatchAccumulator, compare_frames, normalize_pair
+
+COLS = ["k", "v"]
+
+
+def _pair(n, every):
+    src = pd.DataFrame({"k": range(n), "v": range(n)})
+    tgt = pd.DataFrame({"k": range(n), "v": [i + (i % every == 0) for i in range(n)]})
+    return src, tgt
+
+
+def test_compare_frames_totals():
+    src, tgt = _pair(20, 5)
+    tgt = pd.concat([tgt.iloc[1:], pd.DataFrame({"k": [99], "v": [0]})], ignore_index=True)
+    res = compare_frames(src, tgt, COLS, ["k"], sample_size=3)
+    assert res["source_only_rows"] == 1 and res["target_only_rows"] == 1
+    assert res["rows_compared"] == 21
+    assert res["mismatched_rows"] == 5  # keys 5, 10, 15 plus the two one-sided rows
+    assert len(res["mismatch_df"]) == 3
+
+
+def test_normalize_pair_aligns_int_and_float_keys():
+    s, t = normalize_pair(pd.Series([1, 2]), pd.Series([1.0, 2.0]))
+    assert list(s) == list(t)
+    s, t = normalize_pair(pd.Series(["1", "2"]), pd.Series([1, 2]))
+    assert list(s) == list(t) == ["1", "2"]
+
+
+def test_accumulator_totals_equal_one_compare():
+    src, tgt = _pair(100, 7)
+    acc = MismatchAccumulator(["v"], sample_size=5, seed=1)
+    for start in range(0, 100, 30):
+        acc.compare(src.iloc[start:start + 30], tgt.iloc[start:start + 30], COLS, ["k"])
+    whole = compare_frames(src, tgt, COLS, ["k"])
+    res = acc.result()
+    for key in ("mismatched_rows", "rows_compared", "source_only_rows", "target_only_rows", "mismatch_counts"):
+        assert res[key] == whole[key]
+    assert res["join_cols_used"] == ["k"]
+    assert len(res["mismatch_df"]) == 5
+    assert set(res["mismatch_df"]["k"]) <= {k for k in range(100) if k % 7 == 0}
+    assert len(res["joined_df"]) == 5
+
+
+def test_accumulator_counts_pieces_without_sample():
+    acc = MismatchAccumulator(["v"], sample_size=3)
+    acc.add({"mismatched_rows": 4, "rows_compared": 10, "mismatch_counts": {"v": 4}, "mismatch_df": pd.DataFrame()})
+    res = acc.result()
+    assert res["mismatched_rows"] == 4 and res["mismatch_counts"] == {"v": 4}
+    assert res["mismatch_df"].empty
+
+
+def test_accumulator_sample_is_uniform_across_pieces():
+    # A small piece and a large piece: each mismatched row should be sampled about equally often.
+    rng = np.random.default_rng(0)
+    hits = np.zeros(100)
+    for seed in range(800):
+        acc = MismatchAccumulator(["v"], sample_size=10, seed=seed)
+        for keys in (np.arange(10), rng.choice(np.arange(10, 100), 10, replace=False)):
+            # Each piece reports a uniform sample of its mismatched rows, as compare_frames does with rng.
+            acc.add({"mismatched_rows": 10 if keys[0] < 10 else 90, "mismatch_df": pd.DataFrame({"k": keys})})
+        hits[acc.result()["mismatch_df"]["k"].to_numpy()] += 1
+    # Expected 80 hits per row; the small piece must not be over-represented.
+    assert abs(hits[:10].mean() - 80) < 12
+    assert abs(hits[10:].mean() - 80) < 6
@@ -0,0 +1,70 @@
+from db_connector import SchemaCache, column_kinds, fetch_row_hashes
+from recon_compare import compare_frames
+from recon_runner import _fetch_hash_diff, run_recon_single
+from tests.helpers import DB_TYPE, SinglePool, load
+
+COLS = ["id", "amt", "name"]
+
+
+def _pair(conn, src_types, tgt_types, rows, tgt_rows=None):
+    load(conn, "src", [f"{c} {t}" for c, t in zip(COLS, src_types)], rows)
+    load(conn, "tgt", [f"{c} {t}" for c, t in zip(COLS, tgt_types)], rows if tgt_rows is None else tgt_rows)
+
+
+def test_column_kinds_from_sample(sqlite_conn):
+    load(sqlite_conn, "t", ["i INTEGER", "f REAL", "s TEXT", "n TEXT"], [(1, 1.5, "a", None), (2, None, "b", None)])
+    kinds, err = column_kinds(sqlite_conn, DB_TYPE, "t", ["i", "f", "s", "n"])
+    assert err is None
+    assert kinds == {"i": "numeric", "f": "numeric", "s": "text", "n": None}
+
+
+def test_numbers_hash_alike_across_column_types(sqlite_conn):
+    load(sqlite_conn, "t", ["i INTEGER", "f REAL"], [(1, 1.0), (-3, -3.0), (None, None)])
+    kinds = {"i": "numeric", "f": "numeric"}
+    i, _ = fetch_row_hashes(sqlite_conn, DB_TYPE, "t", ["i"], ["i"], kinds)
+    f, _ = fetch_row_hashes(sqlite_conn, DB_TYPE, "t", ["i"], ["f"], kinds)
+    assert list(i["row_hash"]) == list(f["row_hash"])
+    plain_i, _ = fetch_row_hashes(sqlite_conn, DB_TYPE, "t", ["i"], ["i"])
+    plain_f, _ = fetch_row_hashes(sqlite_conn, DB_TYPE, "t", ["i"], ["f"])
+    assert plain_i.at[0, "row_hash"] != plain_f.at[0, "row_hash"]
+
+
+def test_identical_rows_in_different_column_types_have_no_diff_keys(sqlite_conn):
+    rows = [(i, i * 3, f"n{i}") for i in range(50)]
+    _pair(sqlite_conn, ["INTEGER", "INTEGER", "TEXT"], ["REAL", "REAL", "TEXT"], rows)
+    src, tgt, stats, err = _fetch_hash_diff(sqlite_conn, DB_TYPE, "src", sqlite_conn, DB_TYPE, "tgt", COLS, COLS, ["id"])
+    assert err is None
+    assert stats == {"source_rows": 50, "target_rows": 50, "diff_keys": 0, "full_fetch": False}
+    assert src.empty and tgt.empty
+
+
+def test_only_differing_keys_are_fetched(sqlite_conn):
+    rows = [(i, i * 3, f"n{i}") for i in range(50)]
+    changed = [(i, a + (0.5 if i == 7 else 0), n) for i, a, n in rows]
+    _pair(sqlite_conn, ["INTEGER", "INTEGER", "TEXT"], ["REAL", "REAL", "TEXT"], rows, changed)
+    src, tgt, stats, err = _fetch_hash_diff(sqlite_conn, DB_TYPE, "src", sqlite_conn, DB_TYPE, "tgt", COLS, COLS, ["ID"])
+    assert err is None
+    assert stats["diff_keys"] == 1 and not stats["full_fetch"]
+    assert list(src["id"]) == [7] and list(tgt["id"]) == [7]
+    assert compare_frames(src, tgt, COLS, ["id"])["mismatched_rows"] == 1
+
+
+def test_many_differing_keys_fetch_all_rows(sqlite_conn):
+    rows = [(i, i, "x") for i in range(20)]
+    _pair(sqlite_conn, ["INTEGER", "INTEGER", "TEXT"], ["INTEGER", "INTEGER", "TEXT"], rows, [(i, i, "y") for i in range(20)])
+    src, tgt, stats, err = _fetch_hash_diff(
+        sqlite_conn, DB_TYPE, "src", sqlite_conn, DB_TYPE, "tgt", COLS, COLS, ["id"], full_fetch_ratio=0.0,
+    )
+    assert err is None
+    assert stats["diff_keys"] == 20
+    assert len(src) == len(tgt) == 20
+
+
+def test_failed_run_drops_cached_columns(sqlite_conn):
+    load(sqlite_conn, "tgt", ["id INTEGER", "amt INTEGER", "name TEXT"], [(1, 2, "a")])
+    cache = SchemaCache()
+    cache.put(DB_TYPE, {}, "src", COLS)  # cached before the table was dropped
+    cache.put(DB_TYPE, {}, "tgt", COLS)
+    r = run_recon_single(DB_TYPE, "src", DB_TYPE, "tgt", {}, SinglePool(sqlite_conn), {"compare_mode": "Hash"}, cache)
+    assert "error" in r
+    assert cache.get(DB_TYPE, {}, "src") is None and cache.get(DB_TYPE, {}, "tgt") is None
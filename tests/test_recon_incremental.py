@@ -0,0 +1,61 @@
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from recon_runner import _incremental_diff
+from recon_state import ReconStateStore
+from tests.helpers import DB_TYPE, load, make_sqlite
+
+COLS = ["ts", "wm", "val"]
+
+
+@pytest.fixture
+def conn():
+    # Declared TIMESTAMP columns come back as datetime, the way database drivers return them.
+    c = make_sqlite(detect_types=sqlite3.PARSE_DECLTYPES)
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ReconStateStore(tmp_path / "state.db")
+    yield s
+    s.close()
+
+
+def _run(conn, store):
+    options = {"state_store": store, "watermark_column": "wm", "join_cols": ["ts"]}
+    res, err = _incremental_diff({}, conn, DB_TYPE, "src", conn, DB_TYPE, "tgt", COLS, COLS, ["ts"], options)
+    assert err is None
+    return res
+
+
+def test_open_timestamp_keys_are_rechecked(conn, store):
+    t1, t2 = datetime(2024, 1, 1), datetime(2024, 1, 2, 12, 30)
+    load(conn, "src", ["ts TIMESTAMP", "wm INTEGER", "val TEXT"], [(t1, 1, "a"), (t2, 1, "b")])
+    load(conn, "tgt", ["ts TIMESTAMP", "wm INTEGER", "val TEXT"], [(t1, 1, "a"), (t2, 1, "x")])
+    first = _run(conn, store)
+    assert first["incremental_stats"]["full_run"] and first["mismatched_rows"] == 1
+    pair = store.pair_key(DB_TYPE, "src", DB_TYPE, "tgt", {})
+    assert store.mismatch_keys(pair) == [(pd.Timestamp(t2),)]
+
+    # Nothing is past the watermark, so only the open key is fetched again, bound as a timestamp.
+    second = _run(conn, store)
+    stats = second["incremental_stats"]
+    assert not stats["full_run"] and stats["changed_keys"] == 0 and stats["rechecked_keys"] == 1
+    assert second["rows_compared"] == 1 and second["mismatched_rows"] == 1
+    assert stats["open_mismatch_keys"] == 1
+
+    conn.execute("UPDATE tgt SET val = 'b' WHERE val = 'x'")
+    third = _run(conn, store)
+    assert third["mismatched_rows"] == 0 and third["incremental_stats"]["open_mismatch_keys"] == 0
+
+
+def test_stored_keys_keep_their_type(store):
+    keys = [(7, "a"), (Decimal("12.50"), "b"), (pd.Timestamp("2024-03-01 08:00"), "c")]
+    store.update_mismatch_keys("p", [], keys)
+    assert sorted(store.mismatch_keys("p"), key=lambda k: k[1]) == keys
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from tests.helpers import DB_TYPE, load
+from recon_compare import MismatchAccumulator, compare_frames
+from recon_merge import KeyOrderError, compare_tables_sorted, merge_windows
+
+TOTALS = ("mismatched_rows", "rows_compared", "source_only_rows", "target_only_rows")
+
+SRC = pd.DataFrame({"k": [1, 1, 1, 2, 2, 3, 3, 3, 3, 4, 6], "v": list(range(11))})
+TGT = pd.DataFrame({"k": [1, 1, 2, 2, 2, 3, 3, 4, 4, 5, 6], "v": [0, 1, 3, 4, 9, 5, 6, 9, 8, 9, 10]})
+
+
+def _chunks(df, n):
+    for start in range(0, len(df), n):
+        yield df.iloc[start:start + n]
+
+
+def _totals(result):
+    return {k: result[k] for k in TOTALS}
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 4, 5, 100])
+def test_merge_windows_matches_full_compare_for_any_chunk_size(chunksize):
+    acc = MismatchAccumulator(["v"])
+    for src_win, tgt_win in merge_windows(_chunks(SRC, chunksize), _chunks(TGT, chunksize), ["k"], chunksize):
+        acc.compare(src_win, tgt_win, ["k", "v"], ["k"])
+    assert _totals(acc.result()) == _totals(compare_frames(SRC, TGT, ["k", "v"], ["k"]))
+
+
+def test_merge_windows_keep_each_key_in_one_window():
+    seen = set()
+    for src_win, tgt_win in merge_windows(_chunks(SRC, 2), _chunks(TGT, 3), ["k"], 2):
+        keys = set(src_win["k"]) | set(tgt_win["k"])
+        assert not keys & seen
+        seen |= keys
+    assert seen == {1, 2, 3, 4, 5, 6}
+
+
+def test_merge_windows_rejects_unsorted_input():
+    unsorted = pd.DataFrame({"k": [1, 3, 2], "v": [0, 0, 0]})
+    with pytest.raises(KeyOrderError):
+        list(merge_windows(_chunks(unsorted, 10), _chunks(TGT, 10), ["k"], 10))
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 50000])
+def test_compare_tables_sorted_matches_full_compare(sqlite_conn, chunksize):
+    load(sqlite_conn, "src", ["k INTEGER", "v INTEGER"], list(SRC.itertuples(index=False, name=None)) + [(None, 7)])
+    load(sqlite_conn, "tgt", ["k INTEGER", "v INTEGER"], list(TGT.itertuples(index=False, name=None)))
+    res, err = compare_tables_sorted(
+        sqlite_conn, DB_TYPE, "src", ["k", "v"], sqlite_conn, DB_TYPE, "tgt", ["k", "v"], ["k"], chunksize=chunksize,
+    )
+    assert err is None
+    src = pd.concat([SRC, pd.DataFrame({"k": [None], "v": [7]})], ignore_index=True)
+    expected = _totals(compare_frames(src.dropna(), TGT, ["k", "v"], ["k"]))
+    expected["rows_compared"] += 1
+    expected["source_only_rows"] += 1
+    expected["mismatched_rows"] += 1
+    assert _totals(res) == expected
+    assert res["merge_stats"]["null_key_rows"] == 1
+
+
+def test_compare_tables_sorted_matches_join_columns_case_insensitively(sqlite_conn):
+    load(sqlite_conn, "src", ["ID INTEGER", "a INTEGER", "b INTEGER", "v INTEGER"], [(i, 0, 0, i) for i in range(5)])
+    load(sqlite_conn, "tgt", ["ID INTEGER", "a INTEGER", "b INTEGER", "v INTEGER"], [(i, 0, 0, i + (i == 2)) for i in range(5)])
+    cols = ["ID", "a", "b", "v"]
+    res, err = compare_tables_sorted(sqlite_conn, DB_TYPE, "src", cols, sqlite_conn, DB_TYPE, "tgt", cols, ["id"], chunksize=2)
+    assert err is None
+    assert res["join_cols_used"] == ["ID"]
+    assert _totals(res) == {"mismatched_rows": 1, "rows_compared": 5, "source_only_rows": 0, "target_only_rows": 0}
@@ -0,0 +1,36 @@
+import pytest
+
+from tests.helpers import DB_TYPE, load
+
+pytest.importorskip("duckdb")
+
+from recon_ooc import compare_tables_out_of_core  # noqa: E402
+
+COLS = ["ID", "a", "b", "v"]
+
+
+@pytest.fixture
+def tables(sqlite_conn):
+    load(sqlite_conn, "src", ["ID INTEGER", "a INTEGER", "b INTEGER", "v TEXT"], [(i, 0, 0, f"v{i}") for i in range(6)])
+    load(sqlite_conn, "tgt", ["ID INTEGER", "a INTEGER", "b INTEGER", "v TEXT"],
+         [(i, 0, 0, "changed" if i == 3 else f"v{i}") for i in range(1, 7)])
+    return sqlite_conn
+
+
+def test_out_of_core_totals(tables, tmp_path):
+    res, err = compare_tables_out_of_core(
+        tables, DB_TYPE, "src", COLS, tables, DB_TYPE, "tgt", COLS, ["ID"], spill_dir=str(tmp_path), chunksize=2,
+    )
+    assert err is None
+    assert (res["rows_compared"], res["source_only_rows"], res["target_only_rows"]) == (7, 1, 1)
+    assert res["mismatch_counts"]["v"] == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_out_of_core_matches_join_columns_case_insensitively(tables, tmp_path):
+    res, err = compare_tables_out_of_core(
+        tables, DB_TYPE, "src", COLS, tables, DB_TYPE, "tgt", COLS, ["id"], spill_dir=str(tmp_path),
+    )
+    assert err is None
+    assert res["join_cols_used"] == ["ID"]
+    assert res["source_only_rows"] == 1 and res["target_only_rows"] == 1
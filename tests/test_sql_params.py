@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from db_connector import read_query_chunked, run_query
+from sql_params import CURSORS, Binds, CursorCache, Statement, bind_value, padded, paramstyle
+from tests.helpers import DB_TYPE, load
+
+
+def _statement():
+    binds = Binds()
+    return binds.statement(f"SELECT * FROM t WHERE a = {binds.add(1)} AND b LIKE {binds.add('x%')} AND c = {binds.add(1)}")
+
+
+@pytest.mark.parametrize("style, sql, params", [
+    ("qmark", "SELECT * FROM t WHERE a = ? AND b LIKE ? AND c = ?", [1, "x%", 1]),
+    ("numeric", "SELECT * FROM t WHERE a = :1 AND b LIKE :2 AND c = :3", [1, "x%", 1]),
+    ("named", "SELECT * FROM t WHERE a = :p0 AND b LIKE :p1 AND c = :p2", {"p0": 1, "p1": "x%", "p2": 1}),
+    ("format", "SELECT * FROM t WHERE a = %s AND b LIKE %s AND c = %s", [1, "x%", 1]),
+    ("pyformat", "SELECT * FROM t WHERE a = %(p0)s AND b LIKE %(p1)s AND c = %(p2)s", {"p0": 1, "p1": "x%", "p2": 1}),
+    ("dollar", "SELECT * FROM t WHERE a = $1 AND b LIKE $2 AND c = $3", [1, "x%", 1]),
+])
+def test_render_per_paramstyle(style, sql, params):
+    assert _statement().render(style) == (sql, params)
+
+
+def test_render_escapes_percent_for_format_styles():
+    binds = Binds()
+    stmt = binds.statement(f"SELECT '100%' FROM t WHERE a = {binds.add(1)}")
+    assert stmt.render("pyformat")[0] == "SELECT '100%%' FROM t WHERE a = %(p0)s"
+    assert stmt.render("qmark")[0] == "SELECT '100%' FROM t WHERE a = ?"
+    assert Statement("SELECT '100%'").render("pyformat") == ("SELECT '100%'", None)
+
+
+def test_str_inlines_values():
+    binds = Binds()
+    name = binds.add("O'Neil")
+    stmt = binds.statement(f"WHERE a = {name} AND b = {binds.add(None)}")
+    assert str(stmt) == "WHERE a = 'O''Neil' AND b = NULL"
+
+
+def test_bind_value_unwraps_numpy_and_pandas():
+    assert bind_value(np.int64(3)) == 3 and type(bind_value(np.int64(3))) is int
+    assert bind_value(pd.Timestamp("2024-01-02 03:04:05")) == datetime(2024, 1, 2, 3, 4, 5)
+    assert bind_value(np.nan) is None
+    assert bind_value(pd.NaT) is None
+
+
+@pytest.mark.parametrize("n, cap, length", [(0, None, 0), (1, None, 1), (3, None, 4), (5, None, 8), (8, None, 8), (5, 6, 6), (9, 6, 9)])
+def test_padded_lengths(n, cap, length):
+    items = list(range(n))
+    out = padded(items, cap)
+    assert len(out) == length
+    assert out[:n] == items and set(out[n:]) <= {n - 1}
+
+
+def test_paramstyle_of_driver_module(sqlite_conn):
+    assert paramstyle(sqlite_conn, "Oracle") == "qmark"
+    assert paramstyle(object(), "Oracle") == "named"
+
+
+def test_bound_statement_reuses_its_cursor(sqlite_conn):
+    load(sqlite_conn, "t", ["a INTEGER"], [(1,), (2,), (3,)])
+    binds = Binds()
+    stmt = binds.statement(f'SELECT a FROM "t" WHERE a >= {binds.add(2)}')
+    assert list(run_query(sqlite_conn, DB_TYPE, stmt)["a"]) == [2, 3]
+    assert list(read_query_chunked(sqlite_conn, DB_TYPE, stmt)["a"]) == [2, 3]
+    sql = stmt.render("qmark")[0]
+    cur = CURSORS.checkout(sqlite_conn, sql)
+    assert cur is not None
+    CURSORS.checkin(sqlite_conn, sql, cur)
+    assert list(read_query_chunked(sqlite_conn, DB_TYPE, Statement(stmt.text, [3]))["a"]) == [3]
+    assert CURSORS.checkout(sqlite_conn, sql) is cur
+    CURSORS.forget(sqlite_conn)
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.connection = conn
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_cursor_cache_checkout_checkin_and_eviction():
+    cache = CursorCache(per_connection=2, connections=1)
+    a, b = object(), object()
+    c1, c2, c3 = _Cursor(a), _Cursor(a), _Cursor(a)
+    assert cache.checkout(a, "q1") is None
+    cache.checkin(a, "q1", c1)
+    assert cache.checkout(a, "q1") is c1
+    assert cache.checkout(a, "q1") is None  # checked out: a concurrent run gets its own cursor
+    cache.checkin(a, "q1", c1)
+    cache.checkin(a, "q2", c2)
+    cache.checkin(a, "q3", c3)
+    assert c1.closed and not c2.closed  # least recently used statement evicted
+    cache.checkin(b, "q1", _Cursor(b))
+    assert c2.closed and c3.closed  # least recently used connection evicted
+    cache.forget(b)
+    assert cache.checkout(b, "q1") is None
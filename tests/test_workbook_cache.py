@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from workbook_cache import WorkbookCache, _frame_bytes, content_key, path_key
+
+
+def _sheet(n):
+    return pd.DataFrame({"a": range(n), "b": [f"x{i}" for i in range(n)]})
+
+
+def _cache_for(*frames, **kwargs):
+    """Cache with room for exactly the given frames."""
+    return WorkbookCache(max_bytes=sum(_frame_bytes(f) for f in frames), **kwargs)
+
+
+def test_keys():
+    assert content_key(b"abc") == content_key(b"abc") != content_key(b"abd")
+
+
+def test_path_key_changes_when_file_changes(tmp_path):
+    f = tmp_path / "book.xlsx"
+    f.write_bytes(b"one")
+    first = path_key(f)
+    assert path_key(f) == first
+    f.write_bytes(b"longer")
+    assert path_key(f) != first
+
+
+def test_least_recently_used_sheet_is_evicted():
+    s1, s2, s3 = _sheet(100), _sheet(100), _sheet(100)
+    cache = _cache_for(s1, s2)
+    cache.put_sheet("wb", "s1", s1)
+    cache.put_sheet("wb", "s2", s2)
+    assert cache.get_sheet("wb", "s1") is s1  # s1 becomes most recently used
+    cache.put_sheet("wb", "s3", s3)
+    assert cache.get_sheet("wb", "s2") is None
+    assert cache.get_sheet("wb", "s1") is s1 and cache.get_sheet("wb", "s3") is s3
+
+
+def test_replacing_a_sheet_does_not_double_count():
+    s1 = _sheet(100)
+    cache = _cache_for(s1, s1)
+    for _ in range(5):
+        cache.put_sheet("wb", "s1", s1)
+    cache.put_sheet("wb", "s2", _sheet(100))
+    assert cache.get_sheet("wb", "s1") is s1
+
+
+def test_oversized_sheet_is_still_kept_alone():
+    cache = WorkbookCache(max_bytes=1)
+    big = _sheet(1000)
+    cache.put_sheet("wb", "big", big)
+    assert cache.get_sheet("wb", "big") is big
+
+
+def test_workbook_needs_every_sheet():
+    cache = WorkbookCache()
+    cache.put_sheet_names("wb", ["first", "second"])
+    cache.put_sheet("wb", "second", _sheet(2))
+    assert cache.sheet_names("wb") == ["first", "second"]
+    assert cache.get_workbook("wb") is None
+    cache.put_sheet("wb", "first", _sheet(1))
+    assert list(cache.get_workbook("wb")) == ["first", "second"]
+    cache.clear()
+    assert cache.sheet_names("wb") is None and cache.get_sheet("wb", "first") is None
+
+
+def test_spilled_sheets_survive_eviction_and_restart(tmp_path):
+    pytest.importorskip("pyarrow")
+    s1, s2 = _sheet(100), _sheet(100)
+    cache = _cache_for(s1, spill_dir=tmp_path)
+    cache.put_sheet_names("wb", ["s1", "s2"])
+    cache.put_sheet("wb", "s1", s1)
+    cache.put_sheet("wb", "s2", s2)  # evicts s1 from memory
+    assert cache.get_sheet("wb", "s1").equals(s1)
+
+    restarted = WorkbookCache(spill_dir=tmp_path)
+    assert restarted.sheet_names("wb") == ["s1", "s2"]
+    assert restarted.get_workbook("wb")["s2"].equals(s2)